@@ -1,21 +1,150 @@
 import os
+import re
+import sys
+import asyncio
+import argparse
+import contextlib
+from collections import deque
 from dotenv import load_dotenv
 import litellm
+from openai import OpenAI
 
 load_dotenv()
 API_KEY = os.getenv("OPENAI_API_KEY")
 MODEL = os.getenv("OPENAI_MODEL", "tts-1")
+VOICE = "alloy"
+CHUNK_SIZE = 4096  # 한 번에 파일/stdout으로 내보낼 오디오 바이트 수
 
-# 텍스트를 음성으로 변환
-response = litellm.text_to_speech(
-    model=MODEL,
-    api_key=API_KEY,
-    input="안녕하세요, LiteLLM Text-to-Speech 예제입니다.",
-    voice="alloy"
-)
+# 문장 끝(마침표, 물음표, 느낌표) 또는 줄바꿈을 기준으로 나레이션을 자릅니다. (제목/목록 한 줄도 한 문장)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])[ \t]+|[ \t]*\n\s*")
+CODE_FENCE = re.compile(r"```.*?```", re.DOTALL)
+# 줄 앞의 제목(#), 인용(>), 목록(-, *, +, 1.) 기호는 뒤에 공백이 있을 때만 지웁니다. ("2024년", "1.5" 유지)
+BLOCK_MARKS = re.compile(r"^[ \t]*(?:#{1,6}|>|[-*+]|\d+[.)])[ \t]+", re.MULTILINE)
+# 강조/코드 기호: `, *, 그리고 단어 경계에 붙은 _ 만 지웁니다. (snake_case 유지)
+INLINE_MARKS = re.compile(r"[`*]|(?<!\w)_+|_+(?!\w)")
+STUB_AUDIO = b"ID3" + b"\x00" * 29
 
-# 음성 파일로 저장
-with open("output.mp3", "wb") as f:
-    f.write(response)
 
-print("음성 파일이 output.mp3로 저장되었습니다.") 
\ No newline at end of file
+def stub_speech(model, api_key, input, voice):
+    """네트워크 없이 동작을 확인하기 위한 로컬 스텁 (고정 오디오 바이트 반환)"""
+    return STUB_AUDIO
+
+
+class StubStreamResponse:
+    """with_streaming_response 응답처럼 iter_bytes()로 오디오 조각을 돌려주는 로컬 스텁"""
+
+    def __init__(self, audio=STUB_AUDIO):
+        self.audio = audio
+
+    def iter_bytes(self, chunk_size=CHUNK_SIZE):
+        for start in range(0, len(self.audio), chunk_size):
+            yield self.audio[start:start + chunk_size]
+
+
+def stub_speech_stream(text):
+    return contextlib.nullcontext(StubStreamResponse())
+
+
+def openai_speech_stream(text):
+    """공급자(OpenAI)의 스트리밍 응답을 엽니다. 오디오 조각은 서버가 보내는 대로 iter_bytes()로 받습니다.
+
+    litellm.speech는 응답 본문을 다 받은 뒤에 돌려주므로, 스트리밍에는 OpenAI SDK를 직접 씁니다.
+    """
+    client = OpenAI(api_key=API_KEY)
+    return client.audio.speech.with_streaming_response.create(
+        model=MODEL.removeprefix("openai/"), voice=VOICE, input=text
+    )
+
+
+def iter_audio_chunks(response, chunk_size=CHUNK_SIZE):
+    """TTS 응답을 chunk_size 단위로 잘라서 순서대로 돌려줍니다."""
+    # litellm 응답은 bytes 이거나 iter_bytes()를 제공하는 바이너리 응답입니다.
+    if hasattr(response, "iter_bytes"):
+        yield from response.iter_bytes(chunk_size)
+        return
+    view = memoryview(response)
+    for start in range(0, len(view), chunk_size):
+        yield view[start:start + chunk_size]
+
+
+def stream_speech(text, out, open_stream=openai_speech_stream, chunk_size=CHUNK_SIZE):
+    """텍스트 하나를 스트리밍으로 합성하고, 오디오 조각이 도착하는 대로 out에 기록합니다."""
+    written = 0
+    with open_stream(text) as response:
+        for chunk in response.iter_bytes(chunk_size):
+            out.write(chunk)
+            out.flush()
+            written += len(chunk)
+    return written
+
+
+def split_sentences(markdown):
+    """docs 페이지(마크다운)를 읽어줄 문장 단위로 나눕니다. 코드 블록은 건너뜁니다."""
+    text = INLINE_MARKS.sub("", BLOCK_MARKS.sub("", CODE_FENCE.sub("", markdown)))
+    return [s.strip() for s in SENTENCE_SPLIT.split(text) if s and s.strip()]
+
+
+async def stream_page(markdown, out, concurrency=4, synthesize=litellm.speech):
+    """페이지를 문장별로 동시에 합성하되, 결과는 원래 순서대로 이어 붙여 기록합니다.
+
+    동시에 진행되는 합성은 최대 concurrency개이므로 메모리 사용량도 그만큼으로 제한됩니다.
+    """
+    def synthesize_bytes(sentence):
+        response = synthesize(model=MODEL, api_key=API_KEY, input=sentence, voice=VOICE)
+        return b"".join(iter_audio_chunks(response))
+
+    in_flight = deque()
+    written = 0
+    for sentence in split_sentences(markdown):
+        in_flight.append(asyncio.create_task(asyncio.to_thread(synthesize_bytes, sentence)))
+        if len(in_flight) >= concurrency:
+            written += _write_audio(await in_flight.popleft(), out)
+    while in_flight:
+        written += _write_audio(await in_flight.popleft(), out)
+    return written
+
+
+def _write_audio(audio, out):
+    out.write(audio)
+    out.flush()
+    return len(audio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteLLM Text-to-Speech 예제")
+    parser.add_argument("--stream", action="store_true", help="공급자의 스트리밍 응답을 받아 오디오 조각이 도착하는 대로 기록")
+    parser.add_argument("--page", type=str, help="문장 단위로 읽어줄 docs 페이지 (예: docs/mcp-concept.md)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시에 합성할 문장 수")
+    parser.add_argument("--out", type=str, default="output.mp3", help="저장할 파일 ('-'이면 stdout)")
+    parser.add_argument("--stub", action="store_true", help="API 대신 고정 바이트를 돌려주는 로컬 스텁 사용")
+    args = parser.parse_args()
+
+    synthesize = stub_speech if args.stub else litellm.speech
+    open_stream = stub_speech_stream if args.stub else openai_speech_stream
+    text = "안녕하세요, LiteLLM Text-to-Speech 예제입니다."
+
+    if not (args.stream or args.page):
+        # 텍스트를 음성으로 변환 후 한 번에 저장
+        response = synthesize(model=MODEL, api_key=API_KEY, input=text, voice=VOICE)
+        with open(args.out, "wb") as f:
+            for chunk in iter_audio_chunks(response):
+                f.write(chunk)
+        print(f"음성 파일이 {args.out}로 저장되었습니다.")
+        return
+
+    out = sys.stdout.buffer if args.out == "-" else open(args.out, "wb")
+    try:
+        if args.page:
+            with open(args.page, "r", encoding="utf-8") as f:
+                written = asyncio.run(stream_page(f.read(), out, args.concurrency, synthesize))
+        else:
+            written = stream_speech(text, out, open_stream)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    mode = "문장 단위로 기록" if args.page else "스트리밍"
+    print(f"{written} 바이트의 음성을 {args.out}에 {mode}했습니다.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
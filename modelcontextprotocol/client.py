@@ -3,11 +3,13 @@ from typing import Optional
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
 
 from anthropic import Anthropic
 from dotenv import load_dotenv
 
+from modelcontext_codec import stdio_transport
+from modelcontext_conversation import ConversationState, content_text
+
 load_dotenv()  # load environment variables from .env
 
 class MCPClient:
@@ -16,6 +18,8 @@ class MCPClient:
         self.session: Optional[ClientSession] = None
         self.exit_stack = AsyncExitStack()
         self.anthropic = Anthropic()
+        # Token-budgeted history shared across queries in this session
+        self.conversation = ConversationState()
 
     async def connect_to_server(self, server_script_path: str):
         """Connect to an MCP server
@@ -35,8 +39,9 @@ class MCPClient:
             env=None
         )
         
-        stdio_transport = await self.exit_stack.enter_async_context(stdio_client(server_params))
-        self.stdio, self.write = stdio_transport
+        # 기본은 SDK stdio 전송, MCP_FAST_CODEC=1 이면 큰 툴 결과의 복사를 줄이는 빠른 전송
+        transport = await self.exit_stack.enter_async_context(stdio_transport(server_params))
+        self.stdio, self.write = transport
         self.session = await self.exit_stack.enter_async_context(ClientSession(self.stdio, self.write))
         
         await self.session.initialize()
@@ -48,12 +53,10 @@ class MCPClient:
 
     async def process_query(self, query: str) -> str:
         """Process a query using Claude and available tools"""
-        messages = [
-            {
-                "role": "user",
-                "content": query
-            }
-        ]
+        self.conversation.add({
+            "role": "user",
+            "content": query
+        })
 
         response = await self.session.list_tools()
         available_tools = [{ 
@@ -66,7 +69,7 @@ class MCPClient:
         response = self.anthropic.messages.create(
             model="claude-3-5-sonnet-20241022",
             max_tokens=1000,
-            messages=messages,
+            messages=self.conversation.window(),
             tools=available_tools
         )
 
@@ -77,6 +80,11 @@ class MCPClient:
         for content in response.content:
             if content.type == 'text':
                 final_text.append(content.text)
+                # Every assistant message goes into the persistent history, with or without tool calls
+                self.conversation.add({
+                    "role": "assistant",
+                    "content": content.text
+                })
             elif content.type == 'tool_use':
                 tool_name = content.name
                 tool_args = content.input
@@ -86,25 +94,24 @@ class MCPClient:
                 tool_results.append({"call": tool_name, "result": result})
                 final_text.append(f"[Calling tool {tool_name} with args {tool_args}]")
 
-                # Continue conversation with tool results
-                if hasattr(content, 'text') and content.text:
-                    messages.append({
-                      "role": "assistant",
-                      "content": content.text
-                    })
-                messages.append({
+                # Continue conversation with tool results (the text of the result blocks, not their repr)
+                self.conversation.add({
                     "role": "user", 
-                    "content": result.content
-                })
+                    "content": content_text(result.content)
+                }, tool_name=tool_name)
 
                 # Get next response from Claude
                 response = self.anthropic.messages.create(
                     model="claude-3-5-sonnet-20241022",
                     max_tokens=1000,
-                    messages=messages,
+                    messages=self.conversation.window(),
                 )
 
                 final_text.append(response.content[0].text)
+                self.conversation.add({
+                    "role": "assistant",
+                    "content": response.content[0].text
+                })
 
         return "\n".join(final_text)
 
@@ -0,0 +1,246 @@
+# 이 파일은 MCP stdio 전송(transport)의 빠른 JSON 코덱과 프레이밍 경로를 보여줍니다.
+# SDK 기본 stdio 전송은 stdout 청크를 문자열로 디코드한 뒤 (buffer + chunk).split("\n")으로 줄을 나눕니다.
+# 그래서 큰 툴 결과(파일 내용 등, 수 MB)는 청크가 올 때마다 버퍼 전체가 다시 복사되고(O(n²)),
+# 쓸 때도 str 생성 -> "\n" 붙이기 -> encode로 여러 번 복사됩니다.
+# 여기서는 bytes를 재사용 버퍼(bytearray)에 모으고 새로 들어온 부분에서만 줄바꿈을 찾으며,
+# JSON-RPC 메시지는 pydantic-core로 bytes에서 바로 파싱/직렬화합니다.
+#
+# 기본값은 SDK 전송이고, MCP_FAST_CODEC=1 일 때만 빠른 전송을 씁니다.
+#
+# 클라이언트: async with stdio_transport(params) as (read, write): ...
+# 서버:      await serve_stdio(FastMCP 또는 lowlevel Server)
+# 벤치마크:  python modelcontext_codec.py --bench  (실제 서버 프로세스를 띄워 SDK stdio_client와 빠른 전송의 call_tool 왕복 시간 비교)
+
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+
+FAST_CODEC = os.getenv("MCP_FAST_CODEC", "0") == "1"
+READ_CHUNK = 64 * 1024  # 이보다 큰 메시지는 줄바꿈을 따로 써서 전체 복사를 피함
+SHUTDOWN_TIMEOUT = 2.0  # stdin을 닫은 뒤 서버가 스스로 끝나기를 기다리는 시간(초), 지나면 terminate
+
+
+class FrameDecoder:
+    """줄 단위(JSON-RPC over stdio) 프레임 분리기
+
+    받은 청크는 하나의 bytearray에 이어 붙이고, 줄바꿈은 새로 들어온 부분에서만 찾습니다.
+    완성된 프레임을 떼어낸 뒤 남은(미완성) 부분만 앞으로 당기므로, 큰 메시지도 선형 시간에 처리됩니다.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._scan = 0  # 여기 전까지는 줄바꿈이 없음을 이미 확인함
+
+    def feed(self, chunk) -> list:
+        buffer = self._buffer
+        buffer += chunk
+        frames = []
+        start = 0
+        end = buffer.find(b"\n", self._scan)
+        while end != -1:
+            if end > start:  # 빈 줄은 무시
+                frames.append(buffer[start:end])
+            start = end + 1
+            end = buffer.find(b"\n", start)
+        if start:
+            del buffer[:start]
+        self._scan = len(buffer)
+        return frames
+
+
+def encode_frame(message) -> tuple:
+    """JSON-RPC 메시지 -> 전송할 bytes 조각들. str을 거치지 않고 pydantic-core가 bytes를 바로 만듭니다."""
+    data = type(message).__pydantic_serializer__.to_json(message, by_alias=True, exclude_none=True)
+    if len(data) < READ_CHUNK:
+        return (data + b"\n",)
+    return (data, b"\n")
+
+
+def _message_types():
+    from mcp import types
+    from mcp.shared.message import SessionMessage
+    return types.JSONRPCMessage, SessionMessage
+
+
+async def _pump_frames(chunks, read_stream_writer):
+    """바이트 청크들을 JSON-RPC 메시지로 바꿔 read stream에 넣습니다."""
+    import anyio
+    import anyio.lowlevel
+
+    JSONRPCMessage, SessionMessage = _message_types()
+    decoder = FrameDecoder()
+    try:
+        async with read_stream_writer:
+            async for chunk in chunks:
+                for frame in decoder.feed(chunk):
+                    try:
+                        message = JSONRPCMessage.model_validate_json(frame)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+                    await read_stream_writer.send(SessionMessage(message))
+    except anyio.ClosedResourceError:
+        await anyio.lowlevel.checkpoint()
+
+
+@asynccontextmanager
+async def fast_stdio_client(server, errlog=sys.stderr):
+    """mcp.client.stdio.stdio_client와 같은 (read, write) 스트림을 주는 빠른 클라이언트 전송"""
+    import anyio
+    import anyio.lowlevel
+    from mcp.client.stdio import get_default_environment
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    env = {**get_default_environment(), **server.env} if server.env is not None else get_default_environment()
+    process = await anyio.open_process([server.command, *server.args], env=env, stderr=errlog, cwd=server.cwd)
+
+    async def stdin_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    for part in encode_frame(session_message.message):
+                        await process.stdin.send(part)
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg, process:
+        tg.start_soon(_pump_frames, process.stdout, read_stream_writer)
+        tg.start_soon(stdin_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            # stdin을 닫아 서버가 정리하고 끝날 기회를 준 뒤, 그래도 살아 있으면 terminate
+            await process.stdin.aclose()
+            with anyio.move_on_after(SHUTDOWN_TIMEOUT):
+                await process.wait()
+            if process.returncode is None:
+                process.terminate()
+            await read_stream.aclose()
+            await write_stream.aclose()
+
+
+def stdio_transport(server):
+    """빠른 코덱을 쓸 수 있으면 fast_stdio_client, 아니면 SDK 기본 stdio_client
+    (Windows는 실행 파일 해석/종료 방식이 달라 SDK 기본 전송을 그대로 씁니다)"""
+    if FAST_CODEC and sys.platform != "win32":
+        return fast_stdio_client(server)
+    from mcp.client.stdio import stdio_client
+    return stdio_client(server)
+
+
+@asynccontextmanager
+async def fast_stdio_server():
+    """mcp.server.stdio.stdio_server와 같은 (read, write) 스트림을 주는 빠른 서버 전송"""
+    import anyio
+    import anyio.lowlevel
+
+    # 표준 입출력은 닫지 않도록 context manager 없이 감쌈
+    stdin = anyio.wrap_file(sys.stdin.buffer)
+    stdout = anyio.wrap_file(sys.stdout.buffer)
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+
+    async def stdin_chunks():
+        while chunk := await stdin.read1(READ_CHUNK):
+            yield chunk
+
+    async def stdout_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    for part in encode_frame(session_message.message):
+                        await stdout.write(part)
+                    await stdout.flush()
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(_pump_frames, stdin_chunks(), read_stream_writer)
+        tg.start_soon(stdout_writer)
+        yield read_stream, write_stream
+
+
+async def serve_stdio(server):
+    """FastMCP 또는 lowlevel Server를 빠른 stdio 전송으로 실행합니다."""
+    lowlevel = getattr(server, "_mcp_server", server)
+    if not FAST_CODEC:
+        from mcp.server.stdio import stdio_server as transport
+    else:
+        transport = fast_stdio_server
+    async with transport() as (read_stream, write_stream):
+        await lowlevel.run(read_stream, write_stream, lowlevel.create_initialization_options())
+
+
+# ---- 벤치마크: 실제 서버 프로세스와 MCP 세션으로 call_tool 왕복 ----
+
+BENCH_SIZES = [("1KB", 1024, 200), ("1MB", 1024 ** 2, 10), ("50MB", 50 * 1024 ** 2, 1)]
+
+
+def _payload(size):
+    # 파일 내용을 돌려주는 툴 결과 형태 (영문 + 한글 + 줄바꿈/따옴표 escape 포함)
+    unit = 'line "quoted"\n한글 내용 '
+    return (unit * (size // len(unit.encode("utf-8")) + 1))[:size]
+
+
+def _serve_bench():
+    """--serve: payload 툴 하나만 있는 lowlevel 서버 (전송은 MCP_FAST_CODEC을 따름)"""
+    import anyio
+    from mcp import types
+    from mcp.server.lowlevel import Server
+
+    server = Server("codec-bench")
+
+    @server.list_tools()
+    async def list_tools():
+        return [types.Tool(name="payload", description="size 글자의 텍스트를 돌려줍니다.",
+                           inputSchema={"type": "object", "properties": {"size": {"type": "integer"}}})]
+
+    @server.call_tool()
+    async def call_tool(name, arguments):
+        return [types.TextContent(type="text", text=_payload(arguments["size"]))]
+
+    anyio.run(serve_stdio, server)
+
+
+async def _bench_transport(fast):
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    env = {"MCP_FAST_CODEC": "1" if fast else "0"}
+    if "PYTHONPATH" in os.environ:
+        env["PYTHONPATH"] = os.environ["PYTHONPATH"]
+    params = StdioServerParameters(command=sys.executable, args=[os.path.abspath(__file__), "--serve"], env=env)
+    transport = fast_stdio_client(params) if fast else stdio_client(params)
+    timings = {}
+    async with transport as (read, write), ClientSession(read, write) as session:
+        await session.initialize()
+        for label, size, repeat in BENCH_SIZES:
+            result = await session.call_tool("payload", {"size": size})  # 워밍업 + 결과 확인
+            assert result.content[0].text == _payload(size)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                await session.call_tool("payload", {"size": size})
+            timings[label] = (time.perf_counter() - start) / repeat * 1000
+    return timings
+
+
+def bench():
+    import anyio
+
+    print(f"청크 {READ_CHUNK // 1024}KB (서버와 클라이언트가 같은 전송 사용)")
+    sdk = anyio.run(_bench_transport, False)
+    fast = anyio.run(_bench_transport, True)
+    for label, _, _ in BENCH_SIZES:
+        print(f"{label:>5}: SDK stdio_client {sdk[label]:9.3f}ms  빠른 전송 {fast[label]:9.3f}ms  "
+              f"x{sdk[label] / fast[label]:.2f}")
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        _serve_bench()
+    elif "--bench" in sys.argv:
+        bench()
+    else:
+        print("사용법: python modelcontext_codec.py --bench")
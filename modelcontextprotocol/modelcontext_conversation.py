@@ -0,0 +1,134 @@
+# 이 파일은 긴 MCP 대화에서 메시지 히스토리를 관리하는 개념을 보여줍니다.
+# 툴 결과를 messages에 계속 쌓아 매 호출마다 전부 다시 보내면, 턴이 늘수록 지연 시간과 비용이 선형으로 커집니다.
+# ConversationState는 토큰 예산 안에서 창(window)을 유지합니다: 같은 툴 결과는 해시로 한 번만 보내고,
+# 오래된 툴 결과는 요약으로 줄이거나 버립니다. 압축은 한 번 적용되면 그대로 유지되어, 앞부분(prefix)이
+# 턴마다 바뀌지 않으므로 프롬프트 캐시에 유리합니다.
+# 원문을 요약하거나 버릴 때 그 원문을 가리키는 중복 참조가 있으면, 가장 마지막 참조가 원문을 넘겨받습니다.
+
+import hashlib
+import json
+
+
+def estimate_tokens(message):
+    """대략적인 토큰 수 (문자 4개 ≈ 1토큰)"""
+    return len(json.dumps(message, ensure_ascii=False, default=str)) // 4 + 4
+
+
+def content_text(content):
+    """메시지 content의 텍스트: 문자열은 그대로, 블록 목록은 각 블록의 text를 이어 붙임"""
+    if isinstance(content, str):
+        return content
+    parts = []
+    for block in content:
+        text = block.get("text") if isinstance(block, dict) else getattr(block, "text", None)
+        parts.append(text if text is not None else f"[{getattr(block, 'type', type(block).__name__)}]")
+    return "\n".join(parts)
+
+
+class ConversationState:
+    def __init__(self, max_tokens=8000, keep_recent=6, summary_chars=200, count_tokens=estimate_tokens):
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent  # 최근 메시지 몇 개는 압축하지 않음
+        self.summary_chars = summary_chars
+        self.count_tokens = count_tokens
+        self.messages = []
+        self._tool_names = []  # messages와 같은 위치의 툴 이름 (툴 결과가 아니면 None)
+        self._compacted = []
+        self._digests = []  # 원문을 가진 툴 결과의 해시 (중복이거나 툴 결과가 아니면 None)
+        self._refs = []  # 중복 참조 메시지가 가리키는 해시 (참조가 아니면 None)
+        self._seen_results = {}  # 툴 결과 해시 -> 처음 나온 툴 이름
+
+    def add(self, message, tool_name=None):
+        """메시지를 추가합니다. tool_name을 주면 툴 결과로 취급해 중복 제거/압축 대상이 됩니다."""
+        digest = ref = None
+        if tool_name is not None:
+            digest = hashlib.sha256(content_text(message["content"]).encode("utf-8")).hexdigest()
+            if digest in self._seen_results:
+                message = {**message, "content": self._reference(tool_name, digest)}
+                digest, ref = None, digest
+            else:
+                self._seen_results[digest] = tool_name
+        self._digests.append(digest)
+        self._refs.append(ref)
+        self.messages.append(message)
+        self._tool_names.append(tool_name)
+        # 중복 참조 메시지는 이미 충분히 짧으므로 압축 대상에서 제외
+        self._compacted.append(ref is not None)
+
+    def _reference(self, tool_name, digest):
+        return f"[{tool_name} 결과는 앞선 {self._seen_results[digest]} 결과와 같습니다]"
+
+    def _summary(self, index, text):
+        summary = text[:self.summary_chars] + ("…" if len(text) > self.summary_chars else "")
+        return {**self.messages[index], "content": f"[{self._tool_names[index]} 결과 요약] {summary}"}
+
+    def _release(self, index):
+        """
+        index의 원문을 요약하거나 버리기 전에 호출: 그 원문을 가리키는 마지막 참조가 원문을 넘겨받고,
+        그 사이의 참조는 요약으로 바뀝니다. 참조가 없으면 이후 같은 결과는 다시 원문으로 보냅니다.
+        바뀐 토큰 수를 돌려줍니다.
+        """
+        digest = self._digests[index]
+        if digest is None:
+            return 0
+        text = content_text(self.messages[index]["content"])
+        refs = [i for i in range(index + 1, len(self.messages)) if self._refs[i] == digest]
+        self._digests[index] = None
+        if not refs:
+            self._seen_results.pop(digest, None)
+            return 0
+        delta = 0
+        *earlier, holder = refs
+        for i in earlier:
+            before = self.count_tokens(self.messages[i])
+            self.messages[i] = self._summary(i, text)
+            self._refs[i] = None
+            delta += self.count_tokens(self.messages[i]) - before
+        before = self.count_tokens(self.messages[holder])
+        self.messages[holder] = {**self.messages[holder], "content": self.messages[index]["content"]}
+        self._digests[holder], self._refs[holder], self._compacted[holder] = digest, None, False
+        self._seen_results[digest] = self._tool_names[holder]
+        return delta + self.count_tokens(self.messages[holder]) - before
+
+    def _total_tokens(self):
+        return sum(self.count_tokens(m) for m in self.messages)
+
+    def _turn_end(self):
+        """messages[1]부터 시작하는 가장 오래된 턴의 끝: 같은 역할의 메시지가 다시 나오기 전까지 (user/assistant 짝 단위)"""
+        role = self.messages[1]["role"]
+        end = 2
+        while end < len(self.messages) and self.messages[end]["role"] != role:
+            end += 1
+        return end
+
+    def window(self):
+        """예산을 넘으면 오래된 툴 결과부터 요약하고, 그래도 넘으면 오래된 메시지를 버린 뒤 메시지 목록을 돌려줍니다."""
+        total = self._total_tokens()
+        if total <= self.max_tokens:
+            return list(self.messages)
+
+        # 한 번에 예산의 75%까지 줄여 두어, 압축이 매 턴 일어나지 않게 함 (prefix 안정성)
+        target = self.max_tokens * 3 // 4
+        compactable = len(self.messages) - self.keep_recent
+        for index in range(max(compactable, 0)):
+            if total <= target:
+                break
+            if self._tool_names[index] is None or self._compacted[index]:
+                continue
+            text = content_text(self.messages[index]["content"])
+            total += self._release(index)
+            before = self.count_tokens(self.messages[index])
+            self.messages[index] = self._summary(index, text)
+            self._compacted[index] = True
+            total += self.count_tokens(self.messages[index]) - before
+
+        # 첫 메시지(사용자의 최초 요청)는 남기고, 그 다음으로 오래된 턴부터 통째로 버려 역할 순서를 유지
+        while total > target and len(self.messages) > 1:
+            end = self._turn_end()
+            if len(self.messages) - (end - 1) < self.keep_recent + 1:
+                break
+            for index in range(1, end):
+                total += self._release(index)
+            total -= sum(self.count_tokens(m) for m in self.messages[1:end])
+            del self.messages[1:end], self._tool_names[1:end], self._compacted[1:end], self._digests[1:end], self._refs[1:end]
+        return list(self.messages)
@@ -0,0 +1,267 @@
+# 이 파일은 MCP 서버 부하 테스트 도구입니다.
+# 클라이언트 N개가 ClientSession을 열고(stdio 또는 HTTP), list_tools / call_tool 요청을 정해진 비율(mix)로
+# 목표 속도(req/s)에 맞춰 보냅니다. 요청별 지연 시간 분포(p50/p95/p99), 오류, 서버 CPU/메모리를 기록해
+# "호스트 하나에 서버 프로세스를 몇 개 띄워야 하는지" 가늠할 수 있는 리포트를 만듭니다.
+#
+# 예시:
+#   python modelcontext_loadtest.py --server modelcontext_server.py --clients 4 --rate 200 --duration 30
+#   python modelcontext_loadtest.py --server modelcontext_tools.py --tool add --args '{"a": 1, "b": 2}'
+#   python modelcontext_loadtest.py --url http://localhost:8000/mcp --server-pid 1234 --clients 16 --rate 500
+#
+# stdio는 세션마다 서버 프로세스가 하나씩 뜨므로 --clients가 곧 서버 프로세스 수이고,
+# HTTP는 서버 하나에 세션 N개가 붙습니다.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import AsyncExitStack
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+# 지연 시간 히스토그램 구간 상한(ms)
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf")]
+SAMPLE_INTERVAL = 0.5  # 서버 CPU/메모리 측정 주기(초)
+
+
+def parse_mix(text):
+    """'list_tools:1,call_tool:9' -> {"list_tools": 1.0, "call_tool": 9.0}"""
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition(":")
+        if op not in ("list_tools", "call_tool"):
+            raise ValueError(f"알 수 없는 요청 종류: {op}")
+        mix[op] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class LatencyStats:
+    """요청 종류별 지연 시간(ms)과 오류 수"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+
+    def record(self, op, latency_ms, error=None):
+        self.latencies[op].append(latency_ms)
+        if error:
+            self.errors[op][error] += 1
+
+    def report(self):
+        ops = {}
+        for op, values in self.latencies.items():
+            values = sorted(values)
+            histogram = [0] * len(HISTOGRAM_BOUNDS_MS)
+            for value in values:
+                histogram[bisect_left(HISTOGRAM_BOUNDS_MS, value)] += 1
+            ops[op] = {
+                "count": len(values),
+                "errors": sum(self.errors[op].values()),
+                "error_types": dict(self.errors[op]),
+                "p50_ms": round(percentile(values, 0.50), 3),
+                "p95_ms": round(percentile(values, 0.95), 3),
+                "p99_ms": round(percentile(values, 0.99), 3),
+                "max_ms": round(values[-1], 3),
+                "histogram_ms": {
+                    f"<={bound:g}" if bound != float("inf") else "inf": count
+                    for bound, count in zip(HISTOGRAM_BOUNDS_MS, histogram)
+                }
+            }
+        return ops
+
+
+class ServerMonitor:
+    """서버 프로세스의 CPU 사용률과 RSS를 주기적으로 측정합니다. (psutil이 없으면 측정하지 않음)"""
+
+    def __init__(self, pids):
+        self.samples = []  # (전체 CPU %, 전체 RSS 바이트, 최대 단일 프로세스 CPU %)
+        self.processes = []
+        try:
+            import psutil
+        except ImportError:
+            print("   psutil 미설치: 서버 CPU/메모리는 측정하지 않습니다.")
+            return
+        for pid in pids:
+            try:
+                process = psutil.Process(pid)
+                process.cpu_percent(None)  # 첫 호출은 기준점
+                self.processes.append(process)
+            except psutil.Error:
+                pass
+
+    async def run(self):
+        while self.processes:
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            cpu, rss = [], 0
+            for process in self.processes:
+                try:
+                    cpu.append(process.cpu_percent(None))
+                    rss += process.memory_info().rss
+                except Exception:
+                    continue
+            self.samples.append((sum(cpu), rss, max(cpu, default=0.0)))
+
+    def report(self):
+        if not self.samples:
+            return None
+        return {
+            "processes": len(self.processes),
+            "cpu_percent_avg": round(sum(s[0] for s in self.samples) / len(self.samples), 1),
+            "cpu_percent_max": round(max(s[0] for s in self.samples), 1),
+            "cpu_percent_per_process_max": round(max(s[2] for s in self.samples), 1),
+            "rss_mb_max": round(max(s[1] for s in self.samples) / 2**20, 1),
+            "rss_mb_per_process": round(max(s[1] for s in self.samples) / 2**20 / max(len(self.processes), 1), 1)
+        }
+
+
+async def open_session(stack, args):
+    if args.url:
+        from mcp.client.streamable_http import streamablehttp_client
+        read, write, _ = await stack.enter_async_context(streamablehttp_client(args.url))
+    else:
+        # SDK는 기본 환경 변수만 넘기므로, 서버가 같은 패키지를 쓰도록 PYTHONPATH를 전달
+        env = {"PYTHONPATH": os.environ["PYTHONPATH"]} if "PYTHONPATH" in os.environ else None
+        params = StdioServerParameters(command=sys.executable, args=[args.server], env=env)
+        read, write = await stack.enter_async_context(stdio_client(params))
+    session = await stack.enter_async_context(ClientSession(read, write))
+    await session.initialize()
+    return session
+
+
+def server_pids(args):
+    if args.url:
+        return args.server_pid
+    # stdio 서버는 이 프로세스의 자식 프로세스
+    try:
+        import psutil
+    except ImportError:
+        return []
+    return [child.pid for child in psutil.Process().children(recursive=True)]
+
+
+async def send(session, op, tool, tool_args, scheduled, stats, semaphore):
+    async with semaphore:
+        error = None
+        try:
+            if op == "list_tools":
+                await session.list_tools()
+            else:
+                result = await session.call_tool(tool, tool_args)
+                if getattr(result, "isError", False):
+                    error = "tool_error"
+        except Exception as e:
+            error = type(e).__name__
+    # 예정 시각부터 측정: 서버가 밀려 요청이 늦게 나간 시간도 지연에 포함 (coordinated omission 방지)
+    stats.record(op, (time.perf_counter() - scheduled) * 1000, error)
+
+
+async def drive(sessions, args, stats):
+    """열린 루프(open loop): 응답을 기다리지 않고 목표 속도대로 요청을 예약합니다."""
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    ops = rng.choices(list(mix), weights=list(mix.values()), k=int(args.rate * args.duration))
+    tool_args = json.loads(args.args)
+    semaphore = asyncio.Semaphore(args.max_in_flight)
+    pending = set()
+    start = time.perf_counter()
+    for index, op in enumerate(ops):
+        scheduled = start + index / args.rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(send(
+            sessions[index % len(sessions)], op, args.tool, tool_args, scheduled, stats, semaphore
+        ))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    await asyncio.gather(*pending)
+    return len(ops), time.perf_counter() - start
+
+
+def sizing(achieved_rps, server, clients, url):
+    """측정값으로 프로세스당 처리량과 호스트당 필요한 서버 프로세스 수를 추정합니다."""
+    if not server or not server["cpu_percent_avg"]:
+        return None
+    # 서버 CPU%는 프로세스 합계이므로, 코어 하나(= 단일 스레드 Python 서버 하나)를 꽉 채웠을 때의 처리량으로 환산
+    rps_per_busy_process = achieved_rps / (server["cpu_percent_avg"] / 100)
+    cpu_count = os.cpu_count() or 1
+    return {
+        "measured_processes": 1 if url else clients,
+        "rps_per_busy_process": round(rps_per_busy_process, 1),
+        "processes_per_host_by_cpu": cpu_count,
+        "rss_mb_per_process": server["rss_mb_per_process"],
+        "max_rps_per_host_estimate": round(rps_per_busy_process * cpu_count, 1),
+        "note": "CPU 코어 수만큼 서버 프로세스를 띄운다고 가정 (메모리는 rss_mb_per_process x 프로세스 수)"
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="MCP 서버 부하 테스트")
+    parser.add_argument("--server", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "modelcontext_server.py"),
+                        help="stdio로 띄울 서버 스크립트 (기본: 같은 폴더의 modelcontext_server.py)")
+    parser.add_argument("--url", help="HTTP(streamable-http) 서버 주소. 주면 stdio 대신 사용")
+    parser.add_argument("--server-pid", type=int, nargs="*", default=[], help="HTTP 서버 PID (CPU/메모리 측정용)")
+    parser.add_argument("--clients", type=int, default=4, help="동시에 여는 ClientSession 수")
+    parser.add_argument("--rate", type=float, default=100.0, help="전체 목표 요청 속도 (req/s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간(초)")
+    parser.add_argument("--mix", default="list_tools:1,call_tool:9", help="요청 비율")
+    parser.add_argument("--tool", default="hello")
+    parser.add_argument("--args", default='{"name": "홍길동"}', help="call_tool 인자 (JSON)")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="동시에 처리 중인 최대 요청 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="리포트를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    async with AsyncExitStack() as stack:
+        # anyio 컨텍스트(stdio_client, ClientSession)는 들어간 태스크에서 나와야 하므로
+        # gather로 동시에 열지 않고 AsyncExitStack을 가진 이 태스크에서 차례로 엶
+        sessions = [await open_session(stack, args) for _ in range(args.clients)]
+        monitor = ServerMonitor(server_pids(args))
+        monitor_task = asyncio.create_task(monitor.run())
+        stats = LatencyStats()
+        try:
+            sent, elapsed = await drive(sessions, args, stats)
+        finally:
+            monitor_task.cancel()
+
+    achieved_rps = sent / elapsed
+    server = monitor.report()
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "requests": sent,
+        "elapsed_s": round(elapsed, 3),
+        "achieved_rps": round(achieved_rps, 1),
+        "ops": stats.report(),
+        "server": server,
+        "sizing": sizing(achieved_rps, server, args.clients, args.url)
+    }
+
+    print(f"요청 {sent}개 / {elapsed:.1f}s = {achieved_rps:.1f} req/s (목표 {args.rate:g})")
+    for op, result in report["ops"].items():
+        print(f"  {op:<10} p50 {result['p50_ms']:.2f}ms  p95 {result['p95_ms']:.2f}ms  "
+              f"p99 {result['p99_ms']:.2f}ms  오류 {result['errors']}")
+    if server:
+        print(f"  서버 {server['processes']}개: CPU 평균 {server['cpu_percent_avg']}% / 최대 {server['cpu_percent_max']}%, "
+              f"RSS 최대 {server['rss_mb_max']}MB")
+    if report["sizing"]:
+        print(f"  추정: 프로세스당 약 {report['sizing']['rps_per_busy_process']} req/s, "
+              f"호스트당 약 {report['sizing']['max_rps_per_host_estimate']} req/s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -14,4 +14,13 @@ messages.append({
 })
 
 # 이후 LLM은 이 메시지 히스토리를 바탕으로 추가 답변을 생성할 수 있습니다.
-# MCP 클라이언트/서버는 이런 메시지 구조를 표준화해 다양한 LLM/툴 연동을 쉽게 만듭니다. 
\ No newline at end of file
+# MCP 클라이언트/서버는 이런 메시지 구조를 표준화해 다양한 LLM/툴 연동을 쉽게 만듭니다. 
+
+# 대화가 길어지면 히스토리 전체를 매번 보내는 대신 토큰 예산 안의 창(window)만 보냅니다.
+# (modelcontext_conversation.py의 ConversationState: 중복 툴 결과 제거, 오래된 툴 결과 요약/삭제)
+from modelcontext_conversation import ConversationState
+
+conversation = ConversationState(max_tokens=8000)
+for message in messages:
+    conversation.add(message, tool_name=message.get("name") if message["role"] == "tool" else None)
+print(conversation.window())
@@ -0,0 +1,228 @@
+# 이 파일은 큰 파일을 다루는 MCP 리소스의 개념을 보여줍니다. (FileResource 확장)
+# 큰 로그나 생성된 문서를 통째로 모델 컨텍스트에 넣는 대신, 필요한 바이트/줄 범위만 읽어 전달합니다.
+# 범위는 리소스 URI의 쿼리로 지정합니다: file:///.../app.log?lines=100-200, file:///.../app.log?bytes=0-4096
+# 내용 해시로 만든 ETag로 "바뀌었는지"를 확인하고(?if_none_match=<etag>), resources/subscribe로 구독한
+# 클라이언트에게는 notifications/resources/updated를 보내 바뀐 리소스만 다시 가져오게 합니다.
+# 바이트 범위는 UTF-8 글자 경계에 맞춰 읽으므로 한글 같은 멀티바이트 글자가 잘리지 않고,
+# 서버는 지정한 루트 폴더 밖의 파일은 읽지 않습니다.
+#
+#   python modelcontext_resource_range.py docs   (stdio 서버)
+
+import asyncio
+import hashlib
+import mmap
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from mcp import types
+from mcp.server.lowlevel import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from mcp.server.stdio import stdio_server
+from pydantic import AnyUrl
+
+from modelcontext_resource import FileResource
+
+# 파일 시스템 수정 시각 해상도의 상한 (FAT는 2초, 대부분은 그보다 훨씬 작음)
+MTIME_GRANULARITY_NS = 2_000_000_000
+WATCH_INTERVAL = 1.0  # 구독한 리소스의 변경을 확인하는 주기(초)
+
+
+class RangeFileResource(FileResource):
+    """메모리 매핑으로 바이트/줄 범위를 읽고, 내용 해시 기반 ETag와 변경 감시(watch)를 제공하는 리소스"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._signature = None  # (수정 시각, 크기): 바뀌었을 때만 ETag와 줄 인덱스를 다시 계산
+        self._racy = False  # 해시한 때가 수정 시각과 너무 가까워 signature를 믿을 수 없음
+        self._etag = None
+        self._line_offsets = None
+
+    def _refresh(self):
+        st = os.stat(self.path)
+        signature = (st.st_mtime_ns, st.st_size)
+        if signature == self._signature and not self._racy:
+            return
+        # 수정 시각 해상도 안에서 같은 크기로 다시 쓰면 (수정 시각, 크기)가 그대로이므로,
+        # 해시한 때가 수정 시각에서 해상도만큼 지나지 않았으면 다음 확인 때도 다시 해시함
+        hashed_at = time.time_ns()
+        mapped = self._mapped()
+        if mapped is None:
+            etag = hashlib.sha256(b"").hexdigest()[:32]
+        else:
+            with mapped:
+                etag = hashlib.sha256(mapped).hexdigest()[:32]
+        if etag != self._etag:
+            self._line_offsets = None
+        self._signature = signature
+        self._racy = hashed_at - st.st_mtime_ns < MTIME_GRANULARITY_NS
+        self._etag = etag
+
+    def _mapped(self):
+        # 빈 파일은 mmap 할 수 없으므로 None
+        if os.path.getsize(self.path) == 0:
+            return None
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def etag(self):
+        self._refresh()
+        return self._etag
+
+    def read_bytes(self, start=0, end=None):
+        """[start, end) 바이트 범위만 읽습니다. 파일 전체를 메모리에 올리지 않습니다."""
+        mapped = self._mapped()
+        if mapped is None:
+            return b""
+        with mapped:
+            return mapped[start:end]
+
+    def read_text(self, start=0, end=None):
+        """[start, end) 바이트 범위를 UTF-8 글자 경계에 맞춰 읽고 (실제 시작, 실제 끝, 텍스트)를 돌려줍니다.
+
+        경계가 글자 중간이면 start와 end 모두 다음 글자의 시작으로 옮깁니다.
+        그래서 이어지는 범위를 차례로 읽어도 글자가 잘리거나 두 번 나오지 않습니다.
+        """
+        mapped = self._mapped()
+        if mapped is None:
+            return 0, 0, ""
+        with mapped:
+            size = len(mapped)
+            start = _char_boundary(mapped, min(start, size))
+            end = size if end is None else max(start, _char_boundary(mapped, min(end, size)))
+            return start, end, mapped[start:end].decode("utf-8", errors="replace")
+
+    def read_lines(self, start=0, end=None):
+        """[start, end) 줄 범위만 읽습니다. 줄 시작 위치 인덱스는 파일이 바뀔 때만 다시 만듭니다."""
+        self._refresh()
+        mapped = self._mapped()
+        if mapped is None:
+            return ""
+        with mapped:
+            if self._line_offsets is None:
+                offsets = [0]
+                position = mapped.find(b"\n")
+                while position != -1:
+                    offsets.append(position + 1)
+                    position = mapped.find(b"\n", position + 1)
+                self._line_offsets = offsets
+            offsets = self._line_offsets
+            byte_start = offsets[min(start, len(offsets) - 1)]
+            byte_end = offsets[end] if end is not None and end < len(offsets) else len(mapped)
+            return mapped[byte_start:byte_end].decode("utf-8", errors="replace")
+
+    def iter_chunks(self, chunk_size=64 * 1024):
+        """파일을 chunk_size 바이트씩 순서대로 돌려줍니다."""
+        size = os.path.getsize(self.path)
+        for start in range(0, size, chunk_size):
+            yield self.read_bytes(start, start + chunk_size)
+
+    async def watch(self, interval=WATCH_INTERVAL):
+        """ETag가 바뀔 때마다(다른 프로세스가 파일을 바꾼 경우 포함) 새 ETag를 돌려줍니다."""
+        last = await asyncio.to_thread(self.etag)
+        while True:
+            await asyncio.sleep(interval)
+            etag = await asyncio.to_thread(self.etag)
+            if etag != last:
+                last = etag
+                yield etag
+
+
+def _char_boundary(data, position):
+    """position이 UTF-8 글자 중간(이어지는 바이트 0b10xxxxxx)이면 다음 글자의 시작 위치"""
+    for _ in range(3):  # 이어지는 바이트는 최대 3개
+        if position >= len(data) or data[position] & 0xC0 != 0x80:
+            break
+        position += 1
+    return position
+
+
+def _parse_range(value):
+    """"start-end" (end 생략 가능) -> (start, end)"""
+    start, _, end = value.partition("-")
+    return int(start or 0), int(end) if end else None
+
+
+def build_server(root=".", interval=WATCH_INTERVAL):
+    """root 아래 파일을 범위 단위로 읽을 수 있는 file:// 리소스로 제공하는 lowlevel MCP 서버"""
+    root = os.path.realpath(root)
+    server = Server("range-resources")
+    resources = {}  # 경로별 리소스를 재사용해 ETag/줄 인덱스 캐시를 유지
+    subscribers = {}  # 경로 -> {세션: 구독한 URI}
+    watchers = {}  # 경로 -> 변경 감시 태스크 (구독자가 있는 동안만)
+
+    def resolve(uri):
+        # 심볼릭 링크와 ".."을 풀어 본 실제 경로가 root 아래일 때만 허용
+        parts = urlsplit(str(uri))
+        if parts.scheme != "file":
+            raise ValueError(f"file:// 리소스만 지원합니다: {uri}")
+        path = os.path.realpath(unquote(parts.path))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"{uri}는 리소스 루트 밖에 있습니다.")
+        return path, parse_qs(parts.query)
+
+    def resource(path):
+        return resources.setdefault(path, RangeFileResource(path))
+
+    @server.list_resources()
+    async def list_resources():
+        return [
+            types.Resource(uri=AnyUrl(Path(directory, name).as_uri()), name=os.path.relpath(os.path.join(directory, name), root),
+                           mimeType="text/plain")
+            for directory, _, names in os.walk(root) for name in sorted(names)
+        ]
+
+    @server.read_resource()
+    async def read_resource(uri):
+        path, query = resolve(uri)
+        item = resource(path)
+        etag = await asyncio.to_thread(item.etag)
+        if query.get("if_none_match", [None])[0] == etag:
+            return [ReadResourceContents(f"not modified (etag={etag})", "text/plain")]
+        if "bytes" in query:
+            start, end, content = await asyncio.to_thread(item.read_text, *_parse_range(query["bytes"][0]))
+            return [ReadResourceContents(f"etag={etag} bytes={start}-{end}\n{content}", "text/plain")]
+        start, end = _parse_range(query["lines"][0]) if "lines" in query else (0, None)
+        content = await asyncio.to_thread(item.read_lines, start, end)
+        return [ReadResourceContents(f"etag={etag}\n{content}", "text/plain")]
+
+    async def notify(path):
+        async for _ in resource(path).watch(interval):
+            for session, uri in list(subscribers.get(path, {}).items()):
+                try:
+                    await session.send_resource_updated(uri)
+                except Exception:
+                    # 연결이 끊긴 세션은 구독에서 제거
+                    subscribers[path].pop(session, None)
+
+    @server.subscribe_resource()
+    async def subscribe_resource(uri):
+        path, _ = resolve(uri)
+        subscribers.setdefault(path, {})[server.request_context.session] = uri
+        if path not in watchers:
+            watchers[path] = asyncio.create_task(notify(path))
+
+    @server.unsubscribe_resource()
+    async def unsubscribe_resource(uri):
+        path, _ = resolve(uri)
+        sessions = subscribers.get(path, {})
+        sessions.pop(server.request_context.session, None)
+        if not sessions and path in watchers:
+            watchers.pop(path).cancel()
+
+    return server
+
+
+async def serve_stdio(root=".", interval=WATCH_INTERVAL):
+    server = build_server(root, interval)
+    options = server.create_initialization_options()
+    # lowlevel 서버는 구독 핸들러가 있어도 subscribe 기능을 알리지 않으므로 직접 켬
+    options.capabilities.resources.subscribe = True
+    async with stdio_server() as (read, write):
+        await server.run(read, write, options)
+
+
+if __name__ == "__main__":
+    asyncio.run(serve_stdio(sys.argv[1] if len(sys.argv) > 1 else "."))
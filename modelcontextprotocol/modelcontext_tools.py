@@ -2,18 +2,18 @@
 # 툴은 LLM이 외부 기능(API, 파일, DB 등)을 안전하게 호출할 수 있도록 표준화된 인터페이스를 제공합니다.
 # MCP 서버에 툴을 등록하면, 클라이언트가 툴 목록을 조회하고, 원하는 툴을 호출할 수 있습니다.
 
-from mcp.server import Tool, ToolCallResult
+from mcp.server.fastmcp import FastMCP
 
-class AddTool(Tool):
-    name = "add"
-    description = "두 숫자를 더합니다."
-    input_schema = {
-        "type": "object",
-        "properties": {"a": {"type": "number"}, "b": {"type": "number"}},
-        "required": ["a", "b"]
-    }
-    async def call(self, args):
-        result = args["a"] + args["b"]
-        return ToolCallResult(content=str(result))
+mcp = FastMCP("add")
 
-# 서버에서 tools = [AddTool()] 형태로 등록하면 클라이언트가 "add" 툴을 사용할 수 있습니다. 
\ No newline at end of file
+@mcp.tool()
+def add(a: float, b: float) -> str:
+    """두 숫자를 더합니다."""
+    result = a + b
+    return str(result)
+
+# @mcp.tool()로 등록하면 타입 힌트에서 input schema가 만들어지고, 클라이언트가 "add" 툴을 사용할 수 있습니다.
+
+if __name__ == "__main__":
+    # add 툴만 등록한 서버로 실행 (modelcontext_loadtest.py --server modelcontext_tools.py --tool add)
+    mcp.run()
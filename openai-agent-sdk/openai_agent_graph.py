@@ -1,6 +1,8 @@
 from agents import Agent, function_tool
 from agents.extensions.visualization import draw_graph
 
+from openai_triage_router import PreRouterModel
+
 @function_tool
 def get_weather(city: str) -> str:
     return f"The weather in {city} is sunny."
@@ -20,6 +22,11 @@ triage_agent = Agent(
     instructions="Handoff to the appropriate agent based on the language of the request.",
     handoffs=[spanish_agent, english_agent],
     tools=[get_weather],
+    # 언어가 분명하고 날씨 툴이 필요 없어 보이는 요청만 로컬 분류기로 바로 handoff하고, 나머지는 LLM이 고름
+    model=PreRouterModel(
+        routes={"es": spanish_agent.name, "en": english_agent.name},
+        tool_patterns={"get_weather": r"weather|forecast|temperature|rain|tiempo|clima|lluvia|temperatura"},
+    ),
 )
 
 draw_graph(triage_agent, filename="agent_graph")
\ No newline at end of file
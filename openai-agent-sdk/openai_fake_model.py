@@ -0,0 +1,43 @@
+# 이 파일은 API 호출 없이 답하는 로컬 모델(벤치마크용)의 공통 부분을 모아 둔 것입니다.
+# - LocalModel을 상속해 get_response만 만들면, stream_response는 같은 응답을
+#   response.completed 이벤트 하나로 보내 주므로 Runner.run_streamed에서도 쓸 수 있습니다.
+# - message_response(text)는 텍스트 답변 하나만 담긴 ModelResponse를 만듭니다.
+
+import time
+
+from agents import Model, ModelResponse, Usage
+from openai.types.responses import Response, ResponseCompletedEvent, ResponseOutputMessage, ResponseOutputText
+
+
+def message_response(text, id="fake"):
+    """assistant 텍스트 메시지 하나만 담긴 응답"""
+    message = ResponseOutputMessage(
+        id=id,
+        type="message",
+        role="assistant",
+        status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+    return ModelResponse(output=[message], usage=Usage(), response_id=None)
+
+
+class LocalModel(Model):
+    """get_response만 구현하면 되는 로컬 모델의 기반 클래스"""
+
+    async def stream_response(self, system_instructions, input, model_settings, *args, **kwargs):
+        # 같은 지연 뒤에 완성된 응답 하나를 response.completed 이벤트로 보냄
+        response = await self.get_response(system_instructions, input, model_settings, *args, **kwargs)
+        yield ResponseCompletedEvent(
+            type="response.completed",
+            sequence_number=0,
+            response=Response(
+                id=response.response_id or "fake",
+                created_at=time.time(),
+                model=type(self).__name__,
+                object="response",
+                output=response.output,
+                tool_choice="auto",
+                tools=[],
+                parallel_tool_calls=bool(model_settings.parallel_tool_calls),
+            ),
+        )
@@ -0,0 +1,180 @@
+# 이 파일은 LitellmModel 같은 모델 여러 개를 묶어, 느린 꼬리(tail) 요청을 헤지(hedge)하는 모델 래퍼를 보여줍니다.
+# - 모델(엔드포인트)마다 최근 응답 시간을 기록해 p95를 구합니다.
+# - 첫 요청이 p95만큼 지나도 끝나지 않으면, 다음 모델에 같은 요청을 한 번 더 보내고(헤지)
+#   먼저 도착한 답을 쓰고 나머지는 취소합니다.
+# - 연속으로 실패한 엔드포인트는 잠시 순번에서 빠졌다가, 쿨다운이 지나면 다시 시도됩니다.
+#
+#   python openai_hedged_model.py --bench   (API 호출 없이 가짜 모델로 p50/p99 비교)
+
+import asyncio
+import random
+import sys
+import time
+from collections import deque
+
+from agents import Model
+from openai_fake_model import LocalModel, message_response
+
+LATENCY_WINDOW = 200  # 모델별로 기억하는 최근 응답 시간 수
+MIN_SAMPLES = 20  # 이보다 적게 기록됐으면 DEFAULT_HEDGE_DELAY를 사용
+DEFAULT_HEDGE_DELAY = 2.0  # 초
+MIN_HEDGE_DELAY = 0.05  # 헤지가 너무 자주 나가지 않도록 하는 최소 대기(초)
+FAILURE_THRESHOLD = 3  # 연속 실패가 이만큼 쌓이면 순번에서 제외
+COOLDOWN = 5.0  # 제외 시간(초), 다시 실패하면 두 배씩 (최대 MAX_COOLDOWN)
+MAX_COOLDOWN = 60.0
+
+
+class Endpoint:
+    """모델 하나의 최근 응답 시간과 상태"""
+
+    def __init__(self, name, model):
+        self.name = name
+        self.model = model
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.failures = 0
+        self.cooldown = COOLDOWN
+        self.unhealthy_until = 0.0
+
+    def healthy(self, now):
+        return now >= self.unhealthy_until
+
+    def percentile(self, fraction):
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    def record_success(self, elapsed):
+        self.latencies.append(elapsed)
+        self.failures = 0
+        self.cooldown = COOLDOWN
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= FAILURE_THRESHOLD:
+            self.unhealthy_until = time.monotonic() + self.cooldown
+            self.cooldown = min(self.cooldown * 2, MAX_COOLDOWN)
+            self.failures = 0
+
+
+class HedgedModel(Model):
+    """주 모델이 느리면 p95 시점에 보조 모델로 헤지 요청을 보내는 Model
+
+    models는 {"이름": Model} 순서대로 우선순위를 가집니다. (첫 번째가 주 모델)
+    """
+
+    def __init__(self, models, hedge_percentile=0.95):
+        self.endpoints = [Endpoint(name, model) for name, model in models.items()]
+        self.hedge_percentile = hedge_percentile
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _rotation(self):
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if e.healthy(now)]
+        # 모두 제외된 상태면 가장 먼저 복구될 엔드포인트부터 시도
+        return healthy or sorted(self.endpoints, key=lambda e: e.unhealthy_until)
+
+    def _hedge_delay(self, endpoint):
+        delay = endpoint.percentile(self.hedge_percentile)
+        return max(delay if delay is not None else DEFAULT_HEDGE_DELAY, MIN_HEDGE_DELAY)
+
+    async def _call(self, endpoint, args, kwargs, hedge_delay=None):
+        start = time.monotonic()
+        try:
+            result = await endpoint.model.get_response(*args, **kwargs)
+        except asyncio.CancelledError:
+            # 헤지 대기 시간이 지나 헤지에 진 주 요청만 적어도 이만큼 걸렸다는 기록을 남겨 p95가 낮게 치우치지 않게 함
+            # (먼저 끝난 요청 때문에 일찍 취소된 보조 요청의 짧은 시간은 기록하지 않음)
+            elapsed = time.monotonic() - start
+            if hedge_delay is not None and elapsed >= hedge_delay:
+                endpoint.latencies.append(elapsed)
+            raise
+        except Exception:
+            endpoint.record_failure()
+            raise
+        endpoint.record_success(time.monotonic() - start)
+        return result
+
+    async def get_response(self, *args, **kwargs):
+        rotation = self._rotation()
+        primary = rotation[0]
+        hedge_delay = self._hedge_delay(primary)
+        pending = {asyncio.create_task(self._call(primary, args, kwargs, hedge_delay)): primary}
+        backups = iter(rotation[1:])
+        error = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            while True:
+                for task in done:
+                    endpoint = pending.pop(task)
+                    if task.exception() is None:
+                        if endpoint is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                # 주 요청이 느리거나(타임아웃) 보낸 요청이 모두 실패하면 다음 엔드포인트로 한 번 더 보냄
+                # (보조 엔드포인트는 실제로 보낼 때만 꺼냄)
+                if not done or not pending:
+                    backup = next(backups, None)
+                    if backup is not None:
+                        self.hedges += 1
+                        pending[asyncio.create_task(self._call(backup, args, kwargs))] = backup
+                if not pending:
+                    raise error
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stream_response(self, *args, **kwargs):
+        # 스트림은 중간에 다른 모델로 바꿀 수 없으므로 헤지 없이 가장 우선인 정상 엔드포인트로 보냄
+        return self._rotation()[0].model.stream_response(*args, **kwargs)
+
+
+class TailLatencyModel(LocalModel):
+    """API 호출 없이, 대부분 빠르지만 가끔 아주 느린 응답을 흉내 내는 로컬 모델 (벤치마크용)"""
+
+    def __init__(self, name, fast=0.05, slow=1.0, slow_ratio=0.03, seed=0):
+        self.name = name
+        self.fast = fast
+        self.slow = slow
+        self.slow_ratio = slow_ratio
+        self.rng = random.Random(seed)
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        slow = self.rng.random() < self.slow_ratio
+        await asyncio.sleep(self.slow if slow else self.rng.uniform(0.5, 1.5) * self.fast)
+        return message_response(f"[{self.name}] {input}", id=self.name)
+
+
+async def benchmark(requests=400, concurrency=8):
+    """단일 모델 vs 헤지 모델의 p50/p99 응답 시간 비교"""
+    async def measure(model):
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+
+        async def one(i):
+            async with semaphore:
+                start = time.perf_counter()
+                await model.get_response("system", f"요청 {i}", None, [], None, [], None)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        latencies.sort()
+        return latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+    single = TailLatencyModel("primary", seed=1)
+    hedged = HedgedModel({
+        "primary": TailLatencyModel("primary", seed=1),
+        "secondary": TailLatencyModel("secondary", seed=2),
+    })
+    for label, model in (("단일 모델", single), ("헤지 모델", hedged)):
+        p50, p99 = await measure(model)
+        print(f"{label}: p50 {p50 * 1000:.0f}ms, p99 {p99 * 1000:.0f}ms")
+    print(f"헤지 요청 {hedged.hedges}회 (보조 모델이 이긴 횟수 {hedged.hedge_wins}회)")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        asyncio.run(benchmark())
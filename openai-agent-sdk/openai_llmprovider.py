@@ -7,17 +7,27 @@ import os
 from agents import Agent, Runner, function_tool, set_tracing_disabled
 from agents.extensions.models.litellm_model import LitellmModel
 
+from openai_hedged_model import HedgedModel
+
 @function_tool
 def get_weather(city: str):
     print(f"[debug] getting weather for {city}")
     return f"The weather in {city} is sunny."
 
 
-async def main(model: str, api_key: str):
+async def main(model: str, api_key: str, fallback_model: str | None = None, fallback_api_key: str | None = None):
+    llm = LitellmModel(model=model, api_key=api_key)
+    if fallback_model:
+        # 주 모델이 p95보다 오래 걸리면 보조 모델로 헤지 요청, 먼저 온 답을 사용
+        llm = HedgedModel({
+            model: llm,
+            fallback_model: LitellmModel(model=fallback_model, api_key=fallback_api_key or api_key),
+        })
+
     agent = Agent(
         name="Assistant",
         instructions="You only respond in haikus.",
-        model=LitellmModel(model=model, api_key=api_key),
+        model=llm,
         tools=[get_weather],
     )
 
@@ -36,6 +46,7 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--model", type=str, required=False)
+    parser.add_argument("--fallback-model", type=str, required=False, help="느린 응답을 헤지할 보조 모델")
     args = parser.parse_args()
 
     model = args.model or os.environ.get("OPENAI_MODEL")
@@ -46,4 +57,5 @@ if __name__ == "__main__":
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set in environment variables or .env file.")
 
-    asyncio.run(main(model, api_key))
\ No newline at end of file
+    fallback_model = args.fallback_model or os.environ.get("FALLBACK_MODEL")
+    asyncio.run(main(model, api_key, fallback_model, os.environ.get("FALLBACK_API_KEY")))
\ No newline at end of file
@@ -0,0 +1,24 @@
+# npx / 네트워크 없이 쓸 수 있는 로컬 파일 시스템 MCP 서버 (openai_mcp_pool.py 예제/테스트용)
+import os
+import sys
+from mcp.server.fastmcp import FastMCP
+
+ROOT = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+mcp = FastMCP("local-filesystem")
+
+
+@mcp.tool()
+def list_directory(path: str = ".") -> list[str]:
+    """ROOT 아래 폴더의 파일 목록을 반환합니다."""
+    return sorted(os.listdir(os.path.join(ROOT, path)))
+
+
+@mcp.tool()
+def read_file(path: str) -> str:
+    """ROOT 아래 파일 내용을 반환합니다."""
+    with open(os.path.join(ROOT, path), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -0,0 +1,226 @@
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from agents import Agent, ModelResponse, Runner, Usage, set_tracing_disabled
+from agents.mcp import MCPServerStdio
+from openai.types.responses import ResponseFunctionToolCall
+from openai_fake_model import LocalModel, message_response
+
+
+class MCPServerPool:
+    """미리 띄워 둔 MCP stdio 서버를 agent 실행마다 빌려주고 돌려받는 풀
+
+    - 서버 시작(패키지 해석 + 프로세스 생성)은 풀에 서버가 부족할 때만 일어납니다.
+    - list_tools 결과는 서버마다 캐시됩니다 (cache_tools_list=True).
+    - 빌려줄 때 ping으로 상태를 확인하고, 응답 없는 서버는 버리고 새로 띄웁니다.
+    - min_size를 넘는 서버는 idle_timeout초 동안 쓰이지 않으면 정리됩니다.
+    """
+
+    def __init__(self, params, min_size=1, max_size=4, idle_timeout=300.0, health_timeout=5.0):
+        self.params = params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_timeout = health_timeout
+        self._idle = deque()  # (server, 마지막 사용 시각)
+        self._owners = {}  # server -> (종료 이벤트, 소유 task): 서버를 연결한 task가 직접 정리하도록
+        self._tasks = {}  # 띄우는 중인 서버까지 포함한 모든 소유 task -> 종료 이벤트
+        self._size = 0  # 띄웠거나 띄우는 중인 서버 수
+        self._available = asyncio.Condition()
+        self._reaper = None
+        self._closed = False
+
+    async def start(self):
+        self._size += self.min_size
+        results = await asyncio.gather(*(self._spawn() for _ in range(self.min_size)), return_exceptions=True)
+        servers = [result for result in results if not isinstance(result, BaseException)]
+        if len(servers) < len(results):
+            # 하나라도 실패하면 이미 띄운 서버를 정리하고 첫 실패를 알림
+            tasks = [self._owners[server][1] for server in servers]
+            for server in servers:
+                self._discard(server)
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise next(result for result in results if isinstance(result, BaseException))
+        self._idle.extend((server, time.monotonic()) for server in servers)
+        self._reaper = asyncio.create_task(self._reap_idle())
+
+    async def _spawn(self):
+        """서버 하나를 띄웁니다. 호출 전에 self._size에 자리를 잡아 두어야 합니다."""
+        ready = asyncio.get_running_loop().create_future()
+        stop = asyncio.Event()
+
+        async def own():
+            # MCP 연결은 연결을 연 task에서 닫아야 하므로, 서버마다 소유 task를 둡니다.
+            server = MCPServerStdio(params=self.params, cache_tools_list=True)
+            try:
+                await server.connect()
+                await server.list_tools()  # 툴 목록을 미리 캐시
+            except Exception as e:
+                await server.cleanup()  # 연결 도중 실패해도 이미 띄운 프로세스는 정리
+                if not ready.done():
+                    ready.set_exception(e)
+                return
+            if ready.done():
+                # 기다리던 쪽이 취소되고 없음: 주인 없는 서버를 남기지 않고 바로 정리
+                await server.cleanup()
+                return
+            ready.set_result(server)
+            await stop.wait()
+            await server.cleanup()
+
+        task = asyncio.create_task(own())
+        self._tasks[task] = stop
+        task.add_done_callback(lambda done: self._tasks.pop(done, None))
+        try:
+            server = await ready
+            if self._closed:
+                raise RuntimeError("MCP 서버 풀이 닫혔습니다.")
+        except BaseException:
+            # 실패하거나 취소되면(CancelledError 포함) 나중에 준비되는 서버도 정리하고 자리를 돌려줌
+            stop.set()
+            async with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+        self._owners[server] = (stop, task)
+        return server
+
+    def _discard(self, server):
+        stop, _ = self._owners.pop(server)
+        stop.set()
+        self._size -= 1
+
+    async def _healthy(self, server):
+        try:
+            await asyncio.wait_for(server.session.send_ping(), self.health_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def _acquire(self):
+        while True:
+            async with self._available:
+                if not self._idle and self._size >= self.max_size:
+                    await self._available.wait_for(
+                        lambda: self._closed or self._idle or self._size < self.max_size
+                    )
+                if self._closed:
+                    raise RuntimeError("MCP 서버 풀이 닫혔습니다.")
+                if self._idle:
+                    server = self._idle.popleft()[0]
+                else:
+                    server = None
+                    self._size += 1
+            if server is None:
+                return await self._spawn()  # 실패하면 _spawn이 자리를 돌려주고 기다리던 요청을 깨움
+            try:
+                healthy = await self._healthy(server)
+            except BaseException:
+                # 상태 확인 도중 취소됨: 꺼낸 서버를 다시 풀에 돌려놓음
+                await self._release(server)
+                raise
+            if healthy:
+                return server
+            # 자리가 비었으니 기다리던 다른 요청이 새 서버를 띄울 수 있게 함
+            async with self._available:
+                self._discard(server)
+                self._available.notify()
+
+    async def _release(self, server):
+        async with self._available:
+            if self._closed:
+                return  # close()가 이미 정리함
+            self._idle.append((server, time.monotonic()))
+            self._available.notify()
+
+    @asynccontextmanager
+    async def lease(self):
+        """풀에서 서버 하나를 빌립니다. 블록을 벗어나면 자동으로 반납됩니다."""
+        server = await self._acquire()
+        try:
+            yield server
+        finally:
+            await self._release(server)
+
+    async def _reap_idle(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 30.0))
+            now = time.monotonic()
+            async with self._available:
+                while self._size > self.min_size and self._idle and now - self._idle[0][1] > self.idle_timeout:
+                    self._discard(self._idle.popleft()[0])
+
+    async def close(self):
+        if self._reaper:
+            self._reaper.cancel()
+        async with self._available:
+            self._closed = True
+            self._available.notify_all()  # 빈자리를 기다리던 요청은 RuntimeError로 깨어남
+        tasks = list(self._tasks)
+        for stop in self._tasks.values():
+            stop.set()
+        self._owners.clear()
+        self._idle.clear()
+        self._size = 0
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class ListDirectoryModel(LocalModel):
+    """--local 용: API 호출 없이 list_directory 툴을 한 번 부르고, 그 결과를 그대로 답하는 모델"""
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        items = [] if isinstance(input, str) else input
+        outputs = [item["output"] for item in items if isinstance(item, dict) and item.get("type") == "function_call_output"]
+        if outputs:
+            return message_response(outputs[-1])
+        call = ResponseFunctionToolCall(type="function_call", id="fc_local", call_id="call_local",
+                                        name="list_directory", arguments="{}", status="completed")
+        return ModelResponse(output=[call], usage=Usage(), response_id=None)
+
+
+def local_params(path):
+    """npm/네트워크 없이 쓰는 로컬 Python 파일 시스템 서버"""
+    server = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openai_mcp_local_server.py")
+    params = {"command": sys.executable, "args": [server, path]}
+    if "PYTHONPATH" in os.environ:
+        # SDK는 기본 환경 변수만 넘기므로, 서버가 같은 패키지를 쓰도록 PYTHONPATH를 전달
+        params["env"] = {"PYTHONPATH": os.environ["PYTHONPATH"]}
+    return params
+
+
+async def main(runs=3):
+    path = os.path.dirname(os.path.abspath(__file__))
+    local = "--local" in sys.argv
+    if local:
+        # 서버도 모델도 로컬: OpenAI API를 부르지 않음
+        params = local_params(path)
+        set_tracing_disabled(True)
+    else:
+        params = {"command": "npx", "args": ["-y", "@modelcontextprotocol/server-filesystem", path]}
+
+    pool = MCPServerPool(params, min_size=1, max_size=2)
+    start = time.perf_counter()
+    await pool.start()
+    print(f"서버 준비: {time.perf_counter() - start:.2f}s")
+    try:
+        for _ in range(runs):
+            start = time.perf_counter()
+            async with pool.lease() as mcp_server:
+                agent = Agent(
+                    name="MCPAgent",
+                    instructions="파일 시스템 MCP 툴을 사용하세요.",
+                    mcp_servers=[mcp_server],
+                    model=ListDirectoryModel() if local else None,
+                )
+                result = await Runner.run(agent, "이 폴더에 있는 파일 목록을 보여줘.")
+            print(result.final_output)
+            print(f"실행 시간 (서버 시작 없음): {time.perf_counter() - start:.2f}s")
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
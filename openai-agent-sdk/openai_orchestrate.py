@@ -1,5 +1,16 @@
-from agents import Agent, Runner
+from agents import Agent, ModelResponse, ModelSettings, Runner, Usage, set_tracing_disabled
+from openai.types.responses import ResponseFunctionToolCall
+from openai_fake_model import LocalModel, message_response
+from pathlib import Path
 import asyncio
+import json
+import sys
+import time
+
+# 하위 agent 동시 실행 제한(limit_fan_out)은 src/orchestration.py 하나만 사용합니다.
+# (맨 뒤에 추가해야 src/agents 폴더가 SDK의 agents 패키지를 가리지 않습니다)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+from orchestration import DEFAULT_FAN_OUT_LIMIT as FAN_OUT_LIMIT, limit_fan_out  # noqa: E402
 
 spanish_agent = Agent(
     name="SpanishAgent",
@@ -10,15 +21,99 @@ french_agent = Agent(
     instructions="Translate the user's message to French."
 )
 
-orchestrator = Agent(
-    name="Orchestrator",
-    instructions="사용자의 요청에 따라 번역 툴을 사용하세요.",
-    tools=[
-        spanish_agent.as_tool(tool_name="to_spanish", tool_description="스페인어로 번역"),
-        french_agent.as_tool(tool_name="to_french", tool_description="프랑스어로 번역"),
-    ],
-)
+
+def build_orchestrator(model=None, sub_model=None, parallel=True, limit=FAN_OUT_LIMIT):
+    """번역 agent들을 툴로 가진 오케스트레이터를 만듭니다. (model/sub_model을 주면 그 모델로 교체)
+
+    parallel_tool_calls=True: 서로 독립적인 번역 요청을 한 턴에 함께 호출하면
+    SDK가 동시에 실행하고(최대 limit개), 결과는 모델이 호출한 순서대로 대화에 합쳐집니다.
+    """
+    spanish, french = (
+        (agent.clone(model=sub_model) for agent in (spanish_agent, french_agent)) if sub_model
+        else (spanish_agent, french_agent)
+    )
+    return Agent(
+        name="Orchestrator",
+        instructions="사용자의 요청에 따라 번역 툴을 사용하세요. 서로 독립적인 번역은 한 번에 함께 호출하세요.",
+        model=model,
+        model_settings=ModelSettings(parallel_tool_calls=parallel),
+        tools=limit_fan_out([
+            spanish.as_tool(tool_name="to_spanish", tool_description="스페인어로 번역"),
+            french.as_tool(tool_name="to_french", tool_description="프랑스어로 번역"),
+        ], limit),
+    )
+
+
+
+def _field(item, name):
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+class FakeModel(LocalModel):
+    """API 호출 없이 일정 시간 뒤 답하는 로컬 모델 (벤치마크용)
+
+    requests([(툴 이름, 문장)])가 있으면 오케스트레이터 모델처럼, 아직 결과가 없는 요청을 툴 호출로 보냅니다.
+    (parallel_tool_calls=True면 한 턴에 모두, 아니면 한 턴에 하나씩) 결과가 다 모이면 호출 순서대로 합칩니다.
+    requests가 없으면 하위 agent처럼 지시문과 입력을 그대로 돌려주고, 동시에 실행된 최대 수(peak)를 기록합니다.
+    """
+
+    def __init__(self, delay=0.2, requests=()):
+        self.delay = delay
+        self.requests = list(requests)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_response(self, system_instructions, input, model_settings, *args, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if not self.requests:
+            text = input if isinstance(input, str) else _field(input[-1], "content")
+            return message_response(f"[{system_instructions}] {text}")
+
+        items = [] if isinstance(input, str) else input
+        outputs = {_field(item, "call_id"): _field(item, "output")
+                   for item in items if _field(item, "type") == "function_call_output"}
+        calls = [(f"call_{index}", name, text) for index, (name, text) in enumerate(self.requests)]
+        pending = [call for call in calls if call[0] not in outputs]
+        if not pending:
+            return message_response("\n".join(outputs[call_id] for call_id, _, _ in calls))
+        batch = pending if model_settings.parallel_tool_calls else pending[:1]
+        output = [
+            ResponseFunctionToolCall(type="function_call", id=call_id, call_id=call_id, name=name,
+                                     arguments=json.dumps({"input": text}, ensure_ascii=False), status="completed")
+            for call_id, name, text in batch
+        ]
+        return ModelResponse(output=output, usage=Usage(), response_id=None)
+
+
+async def benchmark(n_calls=8, limit=FAN_OUT_LIMIT, delay=0.2):
+    """오케스트레이터 한 번 실행에서 번역 툴 호출 n_calls개를
+    턴마다 하나씩(parallel_tool_calls=False) vs 한 턴에 모두(parallel_tool_calls=True + limit_fan_out)로 비교합니다."""
+    set_tracing_disabled(True)  # 로컬 벤치마크이므로 트레이스를 보내지 않음
+    requests = [("to_spanish" if index % 2 == 0 else "to_french", f"문장 {index}") for index in range(n_calls)]
+    outputs = []
+    for label, parallel in (("순차 실행", False), (f"동시 실행(limit={limit})", True)):
+        sub_model = FakeModel(delay)
+        agent = build_orchestrator(FakeModel(0, requests), sub_model, parallel=parallel, limit=limit)
+        start = time.perf_counter()
+        result = await Runner.run(agent, "번역해줘", max_turns=n_calls + 2)
+        print(f"{label}: {time.perf_counter() - start:.2f}s, 하위 agent 동시 실행 최대 {sub_model.peak}개")
+        assert sub_model.peak <= (limit if parallel else 1)
+        outputs.append(result.final_output)
+
+    # 툴 결과는 완료 순서와 상관없이 호출 순서대로 합쳐지므로 결과가 같아야 합니다.
+    assert outputs[0] == outputs[1]
+
 
 if __name__ == "__main__":
-    result = Runner.run_sync(orchestrator, "'안녕하세요'를 스페인어와 프랑스어로 번역해줘.")
-    print(result.final_output) 
\ No newline at end of file
+    if "--bench" in sys.argv:
+        asyncio.run(benchmark())
+    else:
+        # 오케스트레이터(와 동시 실행 제한)는 실행할 때 만듦: import만으로 이벤트 루프 자원을 만들지 않음
+        orchestrator = build_orchestrator()
+        result = Runner.run_sync(orchestrator, "'안녕하세요'를 스페인어와 프랑스어로 번역해줘.")
+        print(result.final_output)
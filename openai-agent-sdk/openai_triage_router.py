@@ -0,0 +1,364 @@
+# 이 파일은 triage agent의 handoff를 LLM 호출 전에 로컬 분류기로 먼저 정하는 pre-router를 보여줍니다.
+# - 문자 n-gram 언어 판별(나이브 베이즈) + 키워드 규칙표로 요청 언어를 추정합니다. (외부 패키지 없음)
+#   라우팅 대상이 아닌 언어(독일어, 프랑스어 등)는 'other' 클래스로 학습해 두어, 그쪽에 가까우면 LLM에 맡깁니다.
+# - 확신이 있으면 LLM을 부르지 않고 handoff 툴 호출을 바로 만들어 SDK가 평소처럼 handoff를 처리하게 하고,
+#   애매하면(짧은 입력, 두 언어 섞임 등) 원래 모델에게 그대로 맡깁니다.
+# - Model 래퍼라서 agent 그래프(handoffs, tools, draw_graph)는 바뀌지 않습니다.
+# - triage agent에 툴이 있으면, 툴이 필요할 수 있는 요청(tool_patterns에 걸리거나 패턴이 없는 툴)은
+#   pre-route하지 않습니다. 바로 handoff하면 그 툴을 건너뛰게 되기 때문입니다.
+#
+#   triage_agent = Agent(..., handoffs=[spanish_agent, english_agent],
+#                        model=PreRouterModel(routes={"es": "Spanish agent", "en": "English agent"}))
+#
+#   python openai_triage_router.py --bench          (API 호출 없이, LLM 라우팅은 지연 시간만 흉내)
+#   python openai_triage_router.py --bench --live   (실제 모델로 LLM 라우팅, OPENAI_API_KEY 필요)
+
+import asyncio
+import math
+import re
+import sys
+import time
+import uuid
+from collections import Counter
+
+from agents import Agent, Model, ModelResponse, Runner, Usage
+from agents.models.multi_provider import MultiProvider
+from openai.types.responses import ResponseFunctionToolCall
+from openai_fake_model import LocalModel
+
+NGRAM_SIZES = (1, 2, 3)
+MIN_NGRAMS = 12  # 이보다 n-gram이 적은(아주 짧은) 입력은 LLM에 맡김
+MIN_MARGIN = 0.25  # n-gram 하나당 평균 로그 우도 차이가 이보다 작으면 애매하다고 봄
+KEYWORD_BONUS = 0.3  # 한 언어의 키워드가 보이면 그 언어 점수에 더하는 값
+UNKNOWN = "other"  # 라우팅하지 않는 언어들을 모은 학습 클래스
+
+# 언어별 학습 문장. 짧아도 문자 n-gram 분포는 언어를 꽤 잘 구분합니다.
+TRAINING_TEXT = {
+    "es": (
+        "Hola, ¿cómo estás? Quisiera saber qué tiempo hace hoy en la ciudad. "
+        "Necesito ayuda con mi cuenta porque no puedo iniciar sesión desde ayer. "
+        "¿Puedes explicarme cómo funciona este servicio y cuánto cuesta al mes? "
+        "Mañana tengo una reunión muy importante con el equipo de ventas. "
+        "Gracias por tu respuesta, me ha sido de gran ayuda. "
+        "Los niños están jugando en el parque mientras sus padres conversan. "
+        "Me gustaría reservar una mesa para cuatro personas esta noche. "
+        "El informe debe estar listo antes del viernes por la tarde. "
+        "¿Dónde está la estación de tren más cercana? "
+        "Por favor, envíame el documento por correo electrónico lo antes posible. "
+        "No entiendo por qué el programa se cierra cada vez que lo abro. "
+        "Quiero cambiar la dirección de envío de mi pedido. "
+        "Ellos llegaron tarde a la cena porque había mucho tráfico en la carretera. "
+        "Este libro trata de la historia de una familia que vive en el campo. "
+        "Mi teléfono no se carga y la pantalla se queda en negro. "
+        "Nosotros vamos a viajar a la playa durante las vacaciones de verano. "
+        "¿Me puedes recomendar una película para ver con mis amigos? "
+        "Hay que pagar la factura de la luz antes de que termine la semana."
+    ),
+    "en": (
+        "Hello, how are you? I would like to know what the weather is like in the city today. "
+        "I need help with my account because I cannot log in since yesterday. "
+        "Can you explain how this service works and how much it costs per month? "
+        "Tomorrow I have a very important meeting with the sales team. "
+        "Thanks for your answer, it was really helpful. "
+        "The children are playing in the park while their parents are talking. "
+        "I would like to book a table for four people tonight. "
+        "The report should be ready before Friday afternoon. "
+        "Where is the nearest train station? "
+        "Please send me the document by email as soon as possible. "
+        "I don't understand why the program closes every time I open it. "
+        "I want to change the shipping address of my order. "
+        "They arrived late to dinner because there was a lot of traffic on the highway. "
+        "This book is about the history of a family that lives in the countryside. "
+        "My phone won't charge and the screen just stays black. "
+        "We are going to travel to the beach during the summer holidays. "
+        "Could you recommend a movie to watch with my friends? "
+        "You have to pay the electricity bill before the end of the week."
+    ),
+    # 라우팅 대상이 아닌 언어들: 이 클래스가 이기거나 차이가 작으면 LLM이 판단
+    UNKNOWN: (
+        "Guten Tag, ich möchte wissen, wie spät es ist und wann der nächste Zug fährt. "
+        "Können Sie mir sagen, wo das Rathaus ist? Vielen Dank für Ihre schnelle Antwort. "
+        "Mein Computer startet nicht mehr und ich weiß nicht, was ich tun soll. "
+        "Wir fahren morgen mit den Kindern in die Berge, wenn das Wetter schön bleibt. "
+        "Bonjour, je cherche un hôtel pas trop cher près de la gare pour ce soir. "
+        "Pouvez-vous m'aider à remplir ce formulaire ? Merci beaucoup pour votre aide. "
+        "Il fait très froid aujourd'hui et nous restons à la maison avec les enfants. "
+        "Je n'arrive pas à me connecter à mon compte depuis hier soir. "
+        "Olá, gostaria de saber quanto custa o bilhete para o Porto. "
+        "Não consigo abrir o arquivo que você me enviou ontem. Obrigado pela ajuda. "
+        "Buongiorno, vorrei prenotare un tavolo per due persone stasera. "
+        "Non riesco a trovare le chiavi della macchina, puoi aiutarmi a cercarle? "
+        "Goedemorgen, ik wil graag een afspraak maken bij de dokter voor volgende week. "
+        "Waar is het dichtstbijzijnde station? Ik ben mijn fiets kwijt."
+    ),
+}
+
+# 한 언어에서만 쓰이는 강한 신호. n-gram 점수에 가산점을 주고, 두 언어가 함께 보이면 LLM에 맡깁니다.
+KEYWORD_RULES = {
+    "es": re.compile(r"[¿¡ñ]|\b(?:hola|gracias|por favor|buenos días|buenas noches|qué|cómo|dónde|cuándo|pero|tengo|"
+                     r"quiero|necesito|puedes)\b", re.I),
+    "en": re.compile(r"\b(?:the|you|your|my|is|are|what's|don't|can't|i'm|please|thanks|thank you|could|would|"
+                     r"how|where|need)\b", re.I),
+}
+
+
+def _normalize(text):
+    return " " + re.sub(r"[^\w¿¡]+", " ", text.lower()).strip() + " "
+
+
+def _ngrams(text):
+    text = _normalize(text)
+    for n in NGRAM_SIZES:
+        for i in range(len(text) - n + 1):
+            gram = text[i:i + n]
+            if gram.strip():
+                yield gram
+
+
+class LanguageRouter:
+    """문자 n-gram 나이브 베이즈 + 키워드 규칙으로 언어를 고르고, 확신이 없거나 UNKNOWN에 가까우면 None을 돌려줍니다."""
+
+    def __init__(self, training_text=TRAINING_TEXT, rules=KEYWORD_RULES, min_ngrams=MIN_NGRAMS, min_margin=MIN_MARGIN,
+                 keyword_bonus=KEYWORD_BONUS):
+        self.rules = rules
+        self.keyword_bonus = keyword_bonus
+        self.min_ngrams = min_ngrams
+        self.min_margin = min_margin
+        counts = {label: Counter(_ngrams(text)) for label, text in training_text.items()}
+        vocabulary = set().union(*counts.values())
+        self.log_probs = {}
+        self.unseen = {}
+        for label, counter in counts.items():
+            # add-one smoothing
+            total = sum(counter.values()) + len(vocabulary) + 1
+            self.log_probs[label] = {gram: math.log((c + 1) / total) for gram, c in counter.items()}
+            self.unseen[label] = math.log(1 / total)
+
+    def scores(self, text):
+        """언어별 n-gram 하나당 평균 로그 우도와 n-gram 수"""
+        grams = list(_ngrams(text))
+        if not grams:
+            return {label: 0.0 for label in self.log_probs}, 0
+        return {
+            label: sum(table.get(gram, self.unseen[label]) for gram in grams) / len(grams)
+            for label, table in self.log_probs.items()
+        }, len(grams)
+
+    def classify(self, text):
+        """(언어 또는 None, 이유) — None이면 LLM에 맡겨야 함"""
+        matched = [label for label, pattern in self.rules.items() if pattern.search(text)]
+        if len(matched) > 1:
+            return None, "mixed"
+        scores, count = self.scores(text)
+        if count < self.min_ngrams:
+            return None, "short"
+        for label in matched:
+            scores[label] += self.keyword_bonus
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        if ranked[0] == UNKNOWN:
+            return None, "other"
+        if scores[ranked[0]] - scores[ranked[1]] < self.min_margin:
+            return None, "uncertain"
+        return ranked[0], "keyword" if matched else "ngram"
+
+    def best_guess(self, text):
+        """UNKNOWN을 뺀 언어 중 가장 그럴듯한 것 (벤치마크의 LLM 흉내용)"""
+        scores, _ = self.scores(text)
+        return max((label for label in scores if label != UNKNOWN), key=scores.get)
+
+
+def last_user_text(input):
+    """대화 입력의 마지막 항목이 사용자 메시지면 그 텍스트, 아니면(툴 결과 등) None"""
+    if isinstance(input, str):
+        return input
+    if not input:
+        return None
+    item = input[-1]
+    if not isinstance(item, dict) or item.get("role") != "user":
+        return None
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content or [] if part.get("type") == "input_text") or None
+
+
+def handoff_response(handoffs, agent_name):
+    """agent_name으로 가는 handoff 툴 호출 하나만 담긴 응답 (모델이 handoff를 고른 것과 같은 모양)"""
+    for handoff in handoffs:
+        if handoff.agent_name == agent_name:
+            call = ResponseFunctionToolCall(
+                type="function_call",
+                id=f"fc_{uuid.uuid4().hex}",
+                call_id=f"call_{uuid.uuid4().hex}",
+                name=handoff.tool_name,
+                arguments="{}",
+                status="completed",
+            )
+            return ModelResponse(output=[call], usage=Usage(), response_id=None)
+    return None
+
+
+class PreRouterModel(Model):
+    """새 사용자 메시지를 로컬에서 분류해 확신이 있으면 바로 handoff하고, 아니면 model에 맡기는 Model
+
+    routes는 {"언어": "handoff 대상 agent 이름"}, model은 Model 인스턴스나 모델 이름(None이면 기본 모델)입니다.
+    tool_patterns는 {"툴 이름": 정규식}으로, 요청이 패턴에 걸리면 그 툴이 필요할 수 있다고 보고 LLM에 맡깁니다.
+    패턴이 없는 툴은 어떤 요청에든 쓰일 수 있다고 보므로, 그런 툴이 있으면 pre-route하지 않습니다.
+    """
+
+    def __init__(self, routes, model=None, router=None, tool_patterns=None):
+        self.routes = routes
+        self._model = model
+        self.router = router or LanguageRouter()
+        self.tool_patterns = {name: re.compile(pattern, re.I) if isinstance(pattern, str) else pattern
+                              for name, pattern in (tool_patterns or {}).items()}
+        self.local_routes = 0
+        self.llm_routes = 0
+
+    @property
+    def model(self):
+        # 기본 모델의 클라이언트는 LLM이 실제로 필요할 때 만듭니다.
+        if self._model is None or isinstance(self._model, str):
+            self._model = MultiProvider().get_model(self._model)
+        return self._model
+
+    def _tool_plausible(self, text, tools):
+        for tool in tools or []:
+            pattern = self.tool_patterns.get(getattr(tool, "name", None))
+            if pattern is None or pattern.search(text):
+                return True
+        return False
+
+    def _route(self, input, handoffs, tools):
+        text = last_user_text(input)
+        if text is None or self._tool_plausible(text, tools):
+            return None
+        label, _ = self.router.classify(text)
+        if label not in self.routes:
+            return None
+        return handoff_response(handoffs, self.routes[label])
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs,
+                           tracing, **kwargs):
+        response = self._route(input, handoffs, tools)
+        if response is not None:
+            self.local_routes += 1
+            return response
+        self.llm_routes += 1
+        return await self.model.get_response(
+            system_instructions=system_instructions, input=input, model_settings=model_settings, tools=tools,
+            output_schema=output_schema, handoffs=handoffs, tracing=tracing, **kwargs,
+        )
+
+    def stream_response(self, *args, **kwargs):
+        # 스트리밍은 이벤트 형식을 맞춰야 하므로 pre-route 없이 원래 모델로 보냄
+        return self.model.stream_response(*args, **kwargs)
+
+
+# ---- 벤치마크 ----
+
+# (입력, 정답 언어). 학습 문장과 겹치지 않게 따로 만든 표본입니다.
+LABELED_SAMPLE = [
+    ("¿Qué tiempo hace en Madrid?", "es"),
+    ("What's the weather in London?", "en"),
+    ("Necesito cancelar mi suscripción cuanto antes", "es"),
+    ("I need to cancel my subscription right away", "en"),
+    ("Mi hijo tiene fiebre desde anoche, ¿qué debo hacer?", "es"),
+    ("My flight was delayed and I missed the connection", "en"),
+    ("Quiero aprender a cocinar paella valenciana", "es"),
+    ("Could you recommend a good book about history?", "en"),
+    ("La factura de este mes es demasiado alta", "es"),
+    ("The invoice for this month looks too high", "en"),
+    ("¿Cuál es el horario de la biblioteca?", "es"),
+    ("Which museum should I visit on Sunday?", "en"),
+    ("Estoy buscando un apartamento cerca del centro", "es"),
+    ("I am looking for an apartment near downtown", "en"),
+    ("Buenos días, tengo una pregunta sobre mi pedido", "es"),
+    ("Good morning, I have a question about my order", "en"),
+    ("El coche hace un ruido extraño al frenar", "es"),
+    ("My laptop battery drains very quickly lately", "en"),
+    ("Necesitamos traducir este contrato al inglés", "es"),
+    ("We need to translate this contract into Spanish", "en"),
+    ("Explícame la diferencia entre ser y estar", "es"),
+    ("Explain the difference between affect and effect", "en"),
+    ("Hola", "es"),
+    ("OK", "en"),
+    ("Tacos?", "es"),
+    ("Hola, can you help me with my homework?", "en"),
+    ("Thanks, pero prefiero hablar en español", "es"),
+    ("Barcelona vs Madrid", "es"),
+    ("Netflix", "en"),
+    ("Por favor, reset my password", "en"),
+]
+
+
+class SimulatedLLM(LocalModel):
+    """API 호출 없이 일정 시간 뒤 handoff를 고르는 모델 (벤치마크용 LLM 라우팅 흉내)"""
+
+    def __init__(self, routes, latency, router):
+        self.routes = routes
+        self.latency = latency
+        self.router = router
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs,
+                           tracing, **kwargs):
+        await asyncio.sleep(self.latency)
+        return handoff_response(handoffs, self.routes[self.router.best_guess(last_user_text(input))])
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+async def benchmark(live=False, llm_latency=0.8):
+    """LLM만으로 라우팅 vs pre-router + LLM 대체, 라벨 붙은 표본으로 정확도/지연 시간/LLM 호출 수 비교"""
+    from openai_hedged_model import TailLatencyModel
+
+    router = LanguageRouter()
+    routes = {"es": "Spanish agent", "en": "English agent"}
+    labels = {name: label for label, name in routes.items()}
+
+    # handoff 대상은 즉시 답하는 로컬 모델로 바꿔, 측정 시간이 곧 라우팅 시간이 되게 함
+    targets = [
+        Agent(name=name, instructions=f"Answer in {label}.", model=TailLatencyModel(name, fast=0, slow=0, slow_ratio=0))
+        for label, name in routes.items()
+    ]
+    llm = None if live else SimulatedLLM(routes, llm_latency, router)
+
+    decisions = Counter(router.classify(text)[1] for text, _ in LABELED_SAMPLE)
+    start = time.perf_counter()
+    for _ in range(100):
+        for text, _ in LABELED_SAMPLE:
+            router.classify(text)
+    classify_us = (time.perf_counter() - start) / (100 * len(LABELED_SAMPLE)) * 1e6
+
+    print(f"표본 {len(LABELED_SAMPLE)}개, LLM {'실제 모델' if live else f'시뮬레이션 ({llm_latency * 1000:.0f}ms)'}")
+    print(f"로컬 분류: 평균 {classify_us:.1f}us/건, 판정 이유 {dict(decisions)}")
+    for label, model in (("LLM 라우팅", llm), ("pre-router", PreRouterModel(routes, model=llm, router=router))):
+        triage = Agent(
+            name="Triage agent",
+            instructions="Handoff to the appropriate agent based on the language of the request.",
+            handoffs=targets,
+            model=model,
+        )
+        latencies, correct = [], 0
+        for text, expected in LABELED_SAMPLE:
+            start = time.perf_counter()
+            result = await Runner.run(triage, text)
+            latencies.append(time.perf_counter() - start)
+            correct += labels.get(result.last_agent.name) == expected
+        line = (f"{label:>10}: 정확도 {correct}/{len(LABELED_SAMPLE)}, "
+                f"p50 {_percentile(latencies, 0.5) * 1000:.1f}ms, p95 {_percentile(latencies, 0.95) * 1000:.1f}ms")
+        if isinstance(model, PreRouterModel):
+            line += f", 로컬 {model.local_routes}건 / LLM {model.llm_routes}건"
+        else:
+            line += f", LLM {len(LABELED_SAMPLE)}건"
+        print(line)
+    if not live:
+        print("(시뮬레이션 LLM은 정답을 모르므로 LLM 라우팅 정확도는 n-gram 추측값입니다. --live로 실제 모델과 비교)")
+
+
+if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        asyncio.run(benchmark(live="--live" in sys.argv))
@@ -1,4 +1,6 @@
 from agents import Agent
+from link_checks import extract_links
+from near_duplicates import NearDuplicateIndex
 from tools import list_files, read_file
 
 @Agent(name="directory_audit")
@@ -8,9 +10,21 @@ async def directory_audit(state: dict):
     state["existing_docs"] = files
     # simple metadata (first heading) for gap analysis
     meta = {}
+    links = {}
+    # near-duplicate index: only docs whose content changed since the last audit are re-signed
+    index = NearDuplicateIndex.load()
     for path in files:
         content = await read_file.read(path)
         first_line = content.split("\n", 1)[0].lstrip("# ")
         meta[path] = first_line
+        index.update(path, content)
+        links[path] = extract_links(content)
+    index.prune(files)
+    index.save()
     state["doc_meta"] = meta
+    # every URL per doc, collected in this single read for the link validation stage
+    state["doc_links"] = links
+    # later stages process one representative per cluster and report the rest
+    state["near_duplicates"] = index.clusters()
+    state["duplicate_of"] = index.duplicates()
     return state
\ No newline at end of file
@@ -0,0 +1,28 @@
+from agents import Agent
+from link_checks import LinkCache, LinkChecker, extract_links
+from tools import read_file
+
+@Agent(name="link_validation")
+async def link_validation(state: dict):
+    """Checks every distinct URL linked from docs/ once and records the broken ones."""
+    # links were extracted during the directory audit; only docs changed since then are re-read
+    doc_links = state.setdefault("doc_links", {})
+    for path in state.get("changed_files", []):
+        doc_links[path] = extract_links(await read_file.read(path))
+
+    pages_by_url = {}
+    for path, urls in doc_links.items():
+        for url in urls:
+            pages_by_url.setdefault(url, []).append(path)
+
+    cache = LinkCache.load()
+    checker = LinkChecker(cache)
+    results = await checker.check_all(pages_by_url)
+    cache.save()
+
+    state["broken_links"] = [
+        {"url": url, "status": result.status, "error": result.error, "pages": pages_by_url[url]}
+        for url, result in sorted(results.items()) if not result.ok
+    ]
+    state["link_stats"] = {"links": len(pages_by_url), "checked": len(results), **checker.stats}
+    return state
@@ -1,14 +1,78 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
 from agents import Agent
+from link_checks import dead_links, extract_links
 from tools import list_files, read_file, check_freshness_and_accuracy, write_file
 
+# path -> {"mtime", "size", "sha256", "links", "dead_links"} of each doc as of its last QA pass.
+# The verdict also depends on the link cache, so a doc whose links' dead/alive state changed is checked again.
+MANIFEST_PATH = Path("docs/.qa-manifest.json")
+QA_CONCURRENCY = 8
+NOTE_PATTERN = re.compile(r"\n> \*\*NOTE \(auto‑qa\):\*\*[^\n]*\n")
+
+
+def _load_manifest() -> dict:
+    if MANIFEST_PATH.exists():
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    return {}
+
+
+def _stat_entry(path: str) -> dict:
+    st = os.stat(path)
+    return {"mtime": st.st_mtime, "size": st.st_size}
+
+
+def _digest(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _links_changed(entry: dict) -> bool:
+    return entry.get("dead_links") != dead_links(entry.get("links", []))
+
+
+async def _check(path: str, entry: dict, semaphore: asyncio.Semaphore):
+    """Checks one doc and rewrites it only when its auto-qa note must change."""
+    async with semaphore:
+        md = await read_file.read(path)
+        if entry.get("sha256") == _digest(md) and not _links_changed(entry):
+            return {**entry, **_stat_entry(path)}
+        # Previous notes are dropped first so re-running never stacks duplicates
+        body = NOTE_PATTERN.sub("", md)
+        links = extract_links(body)
+        verdict = await check_freshness_and_accuracy(body, links)
+        fixed = body
+        if verdict.startswith("needs_revision"):
+            fixed += f"\n> **NOTE (auto‑qa):** {verdict.split(':',1)[1]}\n"
+        if fixed != md:
+            await write_file.write(path, fixed, overwrite=True)
+        return {**_stat_entry(path), "sha256": _digest(fixed), "links": links, "dead_links": dead_links(links)}
+
+
 @Agent(name="qa")
 async def qa(state: dict):
-    """Runs freshness/accuracy check; fixes trivial issues automatically."""
+    """Checks docs changed in this run (or since the last QA pass); fixes trivial issues idempotently."""
     md_paths = await list_files.search("docs/**/*.md")
-    for p in md_paths:
-        md = await read_file.read(p)
-        verdict = await check_freshness_and_accuracy(md, [])
-        if verdict.startswith("needs_revision"):
-            note = f"\n> **NOTE (auto‑qa):** {verdict.split(':',1)[1]}\n"
-            await write_file.write(p, md + note, overwrite=True)
-    return state
\ No newline at end of file
+    manifest = _load_manifest()
+    changed = set(state.get("changed_files", []))
+
+    # Unchanged mtime/size and link state means the doc was already checked and is skipped without reading it
+    targets = [
+        p for p in md_paths
+        if p in changed
+        or {k: manifest.get(p, {}).get(k) for k in ("mtime", "size")} != _stat_entry(p)
+        or _links_changed(manifest[p])
+    ]
+    semaphore = asyncio.Semaphore(QA_CONCURRENCY)
+    entries = await asyncio.gather(*(
+        _check(p, manifest.get(p, {}), semaphore) for p in targets
+    ))
+
+    manifest = {p: manifest[p] for p in md_paths if p in manifest}
+    manifest.update(zip(targets, entries))
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    state["qa_checked"] = targets
+    return state
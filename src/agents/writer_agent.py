@@ -1,32 +1,72 @@
+import asyncio
+import time
 from datetime import date
+from pathlib import Path
 from textwrap import dedent
 from agents import Agent
 from tools import write_file
 
+DOCS_DIR = Path("docs")
+WRITE_CONCURRENCY = 16  # 동시에 진행할 파일 쓰기 수
+
+# 한 번만 dedent 해두고 문서마다 format만 수행
+DOC_TEMPLATE = dedent("""
+    ---
+    title: {title}
+    date: {date}
+    ---
+
+    # {title}
+
+    _이 페이지는 자동 생성되었습니다. 아래는 주요 학습 포인트입니다._
+
+    1. 정의
+    2. 핵심 특징
+    3. 예제 코드
+
+    ```python
+    print('Hello, {title}')
+    ```
+
+    > 더 상세 내용은 추후 업데이트 예정입니다.
+    """)
+
+
 @Agent(name="writer")
 async def writer(state: dict):
-    """Generates new Markdown files listed in state['todo']."""
+    """Generates new Markdown files listed in state['todo'], writing them concurrently."""
+    # 이미 있는 파일은 디렉토리를 한 번만 훑어서 미리 걸러냅니다.
+    existing = {p.relative_to(DOCS_DIR).as_posix() for p in DOCS_DIR.rglob("*")} if DOCS_DIR.exists() else set()
+    today = date.today()
+    # 같은 파일이 todo에 여러 번 있으면 첫 항목만 씀 (중복은 skipped_existing과 따로 셈)
+    todo = {}
     for item in state.get("todo", []):
-        filename = f"docs/{item['filename']}"
-        md = dedent(f"""
-        ---
-        title: {item['title']}
-        date: {date.today()}
-        ---
-
-        # {item['title']}
-        
-        _이 페이지는 자동 생성되었습니다. 아래는 주요 학습 포인트입니다._
-        
-        1. 정의
-        2. 핵심 특징
-        3. 예제 코드
-        
-        ```python
-        print('Hello, {item['title']}')
-        ```
-        
-        > 더 상세 내용은 추후 업데이트 예정입니다.
-        """)
-        await write_file.write(filename, md, overwrite=False)
-    return state
\ No newline at end of file
+        todo.setdefault(item["filename"], item)
+    pending = {
+        filename: DOC_TEMPLATE.format(title=item["title"], date=today)
+        for filename, item in todo.items() if filename not in existing
+    }
+
+    semaphore = asyncio.Semaphore(WRITE_CONCURRENCY)
+
+    async def write_one(filename: str, md: str):
+        async with semaphore:
+            await write_file.write(f"docs/{filename}", md, overwrite=False)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(write_one(filename, md) for filename, md in pending.items()))
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    written_bytes = sum(len(md.encode("utf-8")) for md in pending.values())
+    state.setdefault("changed_files", []).extend(f"docs/{filename}" for filename in pending)
+    state["writer_stats"] = {
+        "files": len(pending),
+        "skipped_existing": len(todo) - len(pending),
+        "duplicates": len(state.get("todo", [])) - len(todo),
+        "bytes": written_bytes,
+        "seconds": elapsed,
+        "files_per_sec": len(pending) / elapsed,
+        "bytes_per_sec": written_bytes / elapsed,
+    }
+    print(f"   쓰기 처리량: {len(pending) / elapsed:.1f} files/s, {written_bytes / elapsed / 1024:.1f} KB/s")
+    return state
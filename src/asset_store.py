@@ -0,0 +1,99 @@
+"""
+Content-addressed store for generated code examples.
+
+Examples are generated once per (generator, generator version) and stored by the
+hash of their content, so generators that produce the same example share one entry.
+Their code is kept as snippet files named by content hash under docs/assets/snippets/.
+Pages can then embed the cached code or link to the shared snippet file.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict
+
+SNIPPETS_DIR = Path("docs") / "assets" / "snippets"
+INDEX_FILE = "index.json"
+# Bump when the example generator's output changes so stale snippets are not reused
+EXAMPLE_GENERATOR_VERSION = "1"
+CODE_FIELDS = ("server_code", "client_code")
+
+
+def _example_digest(example: dict) -> str:
+    content = json.dumps([example["explanation"], *(example[field] for field in CODE_FIELDS)], ensure_ascii=False)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+class AssetStore:
+    """Generated examples keyed by content hash, with code stored by hash."""
+
+    def __init__(self, root: Path = SNIPPETS_DIR, version: str = EXAMPLE_GENERATOR_VERSION):
+        self.root = Path(root)
+        self.version = version
+        self._examples: Dict[str, dict] = {}
+        self._index = None
+
+    def _key(self, generator: Callable[[], dict]) -> str:
+        return f"{generator.__module__}.{generator.__qualname__}@{self.version}"
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            index_path = self.root / INDEX_FILE
+            index = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else {}
+            # Older indexes were keyed by topic; they are rebuilt on the next miss
+            if "examples" not in index:
+                index = {"generators": {}, "examples": {}}
+            self._index = index
+        return self._index
+
+    def put_blob(self, content: str, suffix: str = ".py") -> Path:
+        """Store content under its hash and return the snippet path; identical content is written once."""
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        path = self.root / f"{digest}{suffix}"
+        if not path.exists():
+            self.root.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding="utf-8")
+        return path
+
+    def get_example(self, generator: Callable[[], dict]) -> dict:
+        """
+        Return the generator's example, calling `generator` only on a cache miss.
+        The result also carries its content hash under "digest" and the snippet path
+        of each code field under "snippets".
+        """
+        key = self._key(generator)
+        if key in self._examples:
+            return self._examples[key]
+
+        index = self._load_index()
+        digest = index["generators"].get(key)
+        entry = index["examples"].get(digest)
+        if entry and all((self.root / entry["snippets"][field]).exists() for field in CODE_FIELDS):
+            example = {"explanation": entry["explanation"], "digest": digest, "snippets": {}}
+            for field in CODE_FIELDS:
+                path = self.root / entry["snippets"][field]
+                example[field] = path.read_text(encoding="utf-8")
+                example["snippets"][field] = path
+        else:
+            example = dict(generator())
+            example["digest"] = _example_digest(example)
+            example["snippets"] = {field: self.put_blob(example[field]) for field in CODE_FIELDS}
+            index["generators"][key] = example["digest"]
+            index["examples"][example["digest"]] = {
+                "explanation": example["explanation"],
+                "snippets": {field: path.name for field, path in example["snippets"].items()}
+            }
+            (self.root / INDEX_FILE).write_text(json.dumps(self._index, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        self._examples[key] = example
+        return example
+
+    def link(self, snippet: Path, page_path: str = "") -> str:
+        """Relative link from a docs page (or the docs root) to a snippet file."""
+        base = Path(page_path).parent if page_path else self.root.parent.parent
+        return Path(os.path.relpath(snippet, base)).as_posix()
+
+
+# Shared store used by the content tools
+example_store = AssetStore()
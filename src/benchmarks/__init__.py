@@ -0,0 +1,12 @@
+"""
+Benchmarks for the docs pipeline on synthetic Markdown corpora.
+
+    python -m benchmarks --files 10000 --seed 1 --out results.json
+    python -m benchmarks --files 10000 --seed 1 --baseline results.json
+
+Run from src/. See corpus.py for the generator and run.py for the measured stages.
+"""
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+__all__ = ["CorpusSpec", "generate_corpus"]
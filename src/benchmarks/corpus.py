@@ -0,0 +1,144 @@
+"""
+Seeded generator for synthetic Markdown corpora.
+
+Every file is generated from its own `Random(f"{seed}:{index}")`, so a corpus is
+reproducible file by file regardless of how many files are requested. Files are
+spread over docs/NNNN/ directories of FILES_PER_DIR files each, which keeps
+directory listings manageable for corpora of up to a million files.
+"""
+
+import json
+import math
+import random
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator
+
+FILES_PER_DIR = 1000
+MIN_FILE_BYTES = 256
+MAX_FILE_BYTES = 1024 * 1024
+SPEC_FILE = "corpus.json"
+
+WORDS_EN = (
+    "model context protocol server client tool resource prompt agent request response "
+    "schema session transport stream message handler runtime config example cache index "
+    "document update pipeline latency token result error the a of to and in with for"
+).split()
+WORDS_KO = (
+    "모델 컨텍스트 프로토콜 서버 클라이언트 도구 리소스 프롬프트 에이전트 요청 응답 "
+    "스키마 세션 전송 메시지 설정 예제 캐시 문서 업데이트 파이프라인 지연 결과 오류 "
+    "그리고 에서 으로 합니다 있습니다 사용 구현"
+).split()
+# Phrases the freshness and knowledge-gap checks look for
+TOPIC_PHRASES = (
+    "Model Context Protocol", "MCP", "client-server architecture", "tools", "resources",
+    "prompts", "implementation example", "practical applications"
+)
+CODE_SNIPPET = '''```python
+from mcp.server import MCPServer, Tool
+
+class EchoTool(Tool):
+    name = "echo"
+
+    async def call(self, args):
+        return args["text"]
+```'''
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Parameters of a synthetic corpus; two corpora with equal specs are identical."""
+    files: int = 1000
+    seed: int = 0
+    size_distribution: str = "lognormal"  # lognormal | uniform | fixed
+    median_bytes: int = 4096
+    korean_ratio: float = 0.5  # share of words drawn from the Korean vocabulary
+    code_ratio: float = 0.3  # chance that a section contains a code fence
+    topic_ratio: float = 0.02  # chance that a word is replaced by a topic phrase
+    min_year: int = 2019
+    max_year: int = 2026
+
+    def file_size(self, rng: random.Random) -> int:
+        if self.size_distribution == "fixed":
+            size = self.median_bytes
+        elif self.size_distribution == "uniform":
+            size = rng.uniform(0.5, 1.5) * self.median_bytes
+        elif self.size_distribution == "lognormal":
+            size = rng.lognormvariate(math.log(self.median_bytes), 1.0)
+        else:
+            raise ValueError(f"Unknown size distribution: {self.size_distribution}")
+        return int(min(max(size, MIN_FILE_BYTES), MAX_FILE_BYTES))
+
+
+def corpus_path(root: Path, index: int) -> Path:
+    return root / "docs" / f"{index // FILES_PER_DIR:04d}" / f"doc-{index:07d}.md"
+
+
+def _paragraph(spec: CorpusSpec, rng: random.Random) -> str:
+    words = []
+    for _ in range(rng.randint(30, 90)):
+        if rng.random() < spec.topic_ratio:
+            words.append(rng.choice(TOPIC_PHRASES))
+        else:
+            words.append(rng.choice(WORDS_KO if rng.random() < spec.korean_ratio else WORDS_EN))
+    return " ".join(words) + "."
+
+
+def render_file(spec: CorpusSpec, index: int) -> str:
+    """Markdown content of file `index`: title, last-updated line, then sections up to the drawn size."""
+    rng = random.Random(f"{spec.seed}:{index}")
+    target = spec.file_size(rng)
+    year = rng.randint(spec.min_year, spec.max_year)
+    parts = [
+        f"# {rng.choice(WORDS_EN).title()} {rng.choice(WORDS_KO)} {index}",
+        f"Last updated: {year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    ]
+    size = sum(len(part.encode("utf-8")) + 2 for part in parts)
+    section = 0
+    while size < target:
+        section += 1
+        block = [f"## {rng.choice(WORDS_EN).title()} {rng.choice(WORDS_KO)} {section}"]
+        for _ in range(rng.randint(1, 3)):
+            block.append(_paragraph(spec, rng))
+        if rng.random() < spec.code_ratio:
+            block.append(CODE_SNIPPET)
+        text = "\n\n".join(block)
+        parts.append(text)
+        size += len(text.encode("utf-8")) + 2
+    return "\n\n".join(parts) + "\n"
+
+
+def iter_paths(root: Path, files: int) -> Iterator[Path]:
+    for index in range(files):
+        yield corpus_path(root, index)
+
+
+def generate_corpus(root: Path, spec: CorpusSpec, progress: bool = False) -> dict:
+    """
+    Write the corpus described by `spec` under root/docs and return its manifest.
+    An existing corpus with the same spec is reused as is.
+    """
+    root = Path(root)
+    manifest_path = root / SPEC_FILE
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest["spec"] == asdict(spec):
+            return manifest
+        # A corpus written by an earlier spec: drop it so no stale files remain
+        shutil.rmtree(root / "docs", ignore_errors=True)
+
+    total_bytes = 0
+    for index in range(spec.files):
+        path = corpus_path(root, index)
+        if index % FILES_PER_DIR == 0:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if progress and index:
+                print(f"  generated {index}/{spec.files} files", flush=True)
+        data = render_file(spec, index).encode("utf-8")
+        path.write_bytes(data)
+        total_bytes += len(data)
+
+    manifest = {"spec": asdict(spec), "total_bytes": total_bytes}
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
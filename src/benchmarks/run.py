@@ -0,0 +1,261 @@
+"""
+Times the docs pipeline tools and the dry-run pipeline on a synthetic corpus.
+
+Each stage runs in a fresh (spawned) process so its peak RSS is its own. Per-file
+stages report p50/p99 of the tool call itself; the file read is excluded for tools
+that take content rather than a path. Stages without a per-file call
+(batch_process_files, the pipeline) only report throughput. A stage that fails is
+recorded with its error and the remaining stages still run.
+
+The dry-run pipeline runs the agent stages of src/agents/ with local stand-ins for
+their `Agent` decorator and hosted tools, so it needs neither the Agents SDK nor
+network access.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import CorpusSpec, generate_corpus, iter_paths
+
+STAGES = (
+    "extract_metadata", "check_freshness", "detect_knowledge_gaps", "batch_process_files", "near_duplicates",
+    "pipeline_dry_run"
+)
+STUB_SEARCH_RESULTS = 3
+
+
+def peak_rss_kb() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _percentile(sorted_ns: array, fraction: float) -> float:
+    index = min(int(fraction * len(sorted_ns)), len(sorted_ns) - 1)
+    return sorted_ns[index] / 1000
+
+
+def _summary(files: int, total_bytes: int, seconds: float, timings: Optional[array] = None) -> Dict[str, Any]:
+    result = {
+        "files": files,
+        "bytes": total_bytes,
+        "seconds": round(seconds, 6),
+        "files_per_sec": round(files / seconds, 2) if seconds else None,
+        "mb_per_sec": round(total_bytes / seconds / 1e6, 3) if seconds else None,
+        "p50_us": None,
+        "p99_us": None
+    }
+    if timings:
+        ordered = array("q", sorted(timings))
+        result["p50_us"] = round(_percentile(ordered, 0.50), 2)
+        result["p99_us"] = round(_percentile(ordered, 0.99), 2)
+    return result
+
+
+def _per_file(paths: List[Path], check: Callable[[Path, str], Any], takes_path: bool) -> Dict[str, Any]:
+    """Call `check` once per file; `seconds` is the sum of the timed calls."""
+    timings = array("q")
+    total_bytes = 0
+    for path in paths:
+        if takes_path:
+            started = time.perf_counter_ns()
+            check(path, None)
+            timings.append(time.perf_counter_ns() - started)
+            total_bytes += path.stat().st_size
+        else:
+            content = path.read_text(encoding="utf-8")
+            started = time.perf_counter_ns()
+            check(path, content)
+            timings.append(time.perf_counter_ns() - started)
+            total_bytes += len(content.encode("utf-8"))
+    return _summary(len(paths), total_bytes, sum(timings) / 1e9, timings)
+
+
+def _install_stub_tools(root: Path):
+    """
+    Local stand-ins for the hosted tools: search returns canned results without network
+    access and writes are dropped, so a dry run never changes the corpus. The stages'
+    @Agent(name=...) decorator just returns the stage function.
+    Must run before any agent stage is imported.
+    """
+    import glob
+    import agents
+    import tools
+    from doc_checks import freshness_verdict
+
+    def stage_agent(name: str):
+        return lambda stage: stage
+
+    class StubFiles:
+        async def search(self, pattern: str) -> List[str]:
+            return sorted(glob.glob(pattern, recursive=True))
+
+        async def read(self, path: str) -> str:
+            return await asyncio.to_thread(Path(path).read_text, encoding="utf-8")
+
+        async def write(self, path: str, content: str, overwrite: bool = False):
+            return None
+
+        async def __call__(self, path: str, content: str, overwrite: bool = False):
+            return None
+
+    async def web_search(query: str) -> List[Dict[str, str]]:
+        return [
+            {"title": f"{query} #{rank}", "url": f"https://example.com/{rank}", "snippet": query}
+            for rank in range(STUB_SEARCH_RESULTS)
+        ]
+
+    async def check_freshness_and_accuracy(md_content: str, references: list) -> str:
+        return freshness_verdict(md_content)
+
+    files = StubFiles()
+    agents.Agent = stage_agent
+    tools.web_search = web_search
+    tools.list_files = tools.read_file = tools.write_file = files
+    tools.check_freshness_and_accuracy = check_freshness_and_accuracy
+
+
+def run_stage(stage: str, root: str, files: int) -> Dict[str, Any]:
+    """Runs one stage in the current process and returns its measurements."""
+    root = Path(root)
+    paths = list(iter_paths(root, files))
+
+    if stage == "extract_metadata":
+        from doc_checks import read_metadata
+        result = _per_file(paths, lambda path, _: read_metadata(str(path)), takes_path=True)
+    elif stage == "check_freshness":
+        from doc_checks import freshness_verdict
+        result = _per_file(paths, lambda _, content: freshness_verdict(content), takes_path=False)
+    elif stage == "detect_knowledge_gaps":
+        from doc_checks import find_knowledge_gaps
+        result = _per_file(paths, lambda _, content: find_knowledge_gaps(content, "MCP"), takes_path=False)
+    elif stage == "batch_process_files":
+        from doc_checks import process_files
+        started = time.perf_counter()
+        processed = process_files(str(root / "docs" / "**" / "*.md"), "extract_metadata")
+        elapsed = time.perf_counter() - started
+        result = _summary(len(processed), sum(item.get("size_bytes", 0) for item in processed), elapsed)
+    elif stage == "near_duplicates":
+        # Cold index build (every doc signed); clustering is timed separately
+        from near_duplicates import NearDuplicateIndex
+        index = NearDuplicateIndex(path=root / "near-duplicates.json")
+        result = _per_file(paths, lambda path, content: index.update(str(path), content), takes_path=False)
+        started = time.perf_counter()
+        result["clusters"] = len(index.clusters())
+        result["cluster_seconds"] = round(time.perf_counter() - started, 6)
+    elif stage == "pipeline_dry_run":
+        # The pipeline works on docs/ relative to the working directory
+        os.chdir(root)
+        _install_stub_tools(root)
+        from runner import MCPEducationRunner
+        state_files = [root / "docs" / name for name in (".qa-manifest.json", ".near-duplicates.json", ".link-cache.json")]
+        for state_file in state_files:
+            state_file.unlink(missing_ok=True)
+        started = time.perf_counter()
+        # Link validation sends HTTP requests; link_checks.py --bench measures it against a local stub server
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = asyncio.run(MCPEducationRunner(dry_run=True, check_links=False).run_pipeline())
+        elapsed = time.perf_counter() - started
+        for state_file in state_files:
+            state_file.unlink(missing_ok=True)
+        result = _summary(report["summary"]["total_docs"], sum(p.stat().st_size for p in paths), elapsed)
+        result["errors"] = report["summary"]["errors"]
+    else:
+        raise ValueError(f"Unknown stage: {stage}")
+
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def run_benchmarks(spec: CorpusSpec, root: Path, stages: List[str]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    manifest = generate_corpus(root, spec, progress=True)
+    generation_seconds = time.perf_counter() - started
+
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for stage in stages:
+        try:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                results[stage] = executor.submit(run_stage, stage, str(root), spec.files).result()
+        except Exception as e:
+            results[stage] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"stage {stage} failed: {results[stage]['error']}", file=sys.stderr)
+    return {
+        "corpus": {**manifest, "generation_seconds": round(generation_seconds, 3)},
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "stages": results
+    }
+
+
+def print_table(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None, out=sys.stderr):
+    print(f"{'stage':<24}{'files/s':>12}{'MB/s':>10}{'p50 us':>10}{'p99 us':>10}{'RSS MB':>9}", file=out)
+    for stage, result in report["stages"].items():
+        if "error" in result:
+            print(f"{stage:<24}failed: {result['error']}", file=out)
+            continue
+        cell = lambda value, width, scale=1: f"{value / scale:>{width}.1f}" if value is not None else f"{'-':>{width}}"
+        line = (
+            f"{stage:<24}{cell(result['files_per_sec'], 12)}{cell(result['mb_per_sec'], 10)}"
+            f"{cell(result['p50_us'], 10)}{cell(result['p99_us'], 10)}{cell(result['peak_rss_kb'], 9, 1024)}"
+        )
+        previous = (baseline or {}).get("stages", {}).get(stage)
+        if previous and previous.get("files_per_sec") and result["files_per_sec"]:
+            line += f"   throughput x{result['files_per_sec'] / previous['files_per_sec']:.2f} vs baseline"
+        print(line, file=out)
+
+
+def main(argv: Optional[List[str]] = None):
+    defaults = CorpusSpec()
+    parser = argparse.ArgumentParser(description="Benchmark the docs pipeline on a synthetic corpus")
+    parser.add_argument("--files", type=int, default=defaults.files, help="Number of files (100 to 1,000,000)")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--size-distribution", choices=["lognormal", "uniform", "fixed"], default=defaults.size_distribution)
+    parser.add_argument("--median-bytes", type=int, default=defaults.median_bytes)
+    parser.add_argument("--korean-ratio", type=float, default=defaults.korean_ratio)
+    parser.add_argument("--code-ratio", type=float, default=defaults.code_ratio)
+    parser.add_argument("--root", type=Path, help="Corpus directory (reused when its spec matches; default: a temp dir)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--out", type=Path, help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", type=Path, help="Earlier JSON report to compare throughput against")
+    args = parser.parse_args(argv)
+
+    spec = CorpusSpec(**{
+        field.name: getattr(args, field.name)
+        for field in fields(CorpusSpec) if hasattr(args, field.name)
+    })
+    with contextlib.ExitStack() as stack:
+        root = args.root or Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="docs-bench-")))
+        report = run_benchmarks(spec, root.resolve(), args.stages)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    if baseline and baseline["corpus"]["spec"] != asdict(spec):
+        print("warning: baseline was measured on a different corpus spec", file=sys.stderr)
+    print_table(report, baseline)
+    output = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(output, encoding="utf-8")
+    else:
+        print(output)
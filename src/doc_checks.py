@@ -0,0 +1,130 @@
+"""
+Plain document checks shared by the agent tools, the runner and the docs MCP server.
+Kept free of agent SDK imports so that single-file checks start quickly.
+"""
+
+import glob
+from datetime import datetime
+from typing import List, Dict, Any
+
+CURRENT_YEAR = datetime.now().year
+
+def freshness_verdict(md_content: str) -> str:
+    """Verdict used by check_freshness_and_accuracy: 'pass' or 'needs_revision:<reason>'."""
+    outdated_years = [str(year) for year in range(2019, CURRENT_YEAR)]
+    if any(year in md_content for year in outdated_years):
+        return f"needs_revision: mentions outdated year"
+    
+    if "MCP" in md_content and "Model Context Protocol" not in md_content:
+        return "needs_revision: uses abbreviation MCP without full name"
+    
+    return "pass"
+
+def metadata_from_content(file_path: str, content: str) -> Dict[str, Any]:
+    """Title, dates, sections and word count of already loaded Markdown content."""
+    lines = content.splitlines()
+    
+    # Extract title (first heading)
+    title = ""
+    for line in lines:
+        if line.startswith("# "):
+            title = line.replace("# ", "")
+            break
+    
+    # Count sections
+    section_count = sum(1 for line in lines if line.startswith("## "))
+    
+    # Extract date if available
+    date_str = ""
+    for line in lines:
+        if "date:" in line.lower():
+            date_str = line.split(":", 1)[1].strip()
+        elif "last updated" in line.lower():
+            date_str = line.split(":", 1)[1].strip() if ":" in line else ""
+    
+    # Check if content has examples
+    has_examples = "example" in content.lower() or "```" in content
+    
+    # Estimate word count
+    word_count = len(content.split())
+    
+    return {
+        "file_path": file_path,
+        "title": title,
+        "date": date_str,
+        "section_count": section_count,
+        "has_examples": has_examples,
+        "word_count": word_count,
+        "size_bytes": len(content.encode('utf-8'))
+    }
+
+def summarize_metadata(metadata_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate metadata entries into the summary report structure."""
+    total_files = len(metadata_list)
+    total_words = sum(item.get("word_count", 0) for item in metadata_list)
+    avg_sections = sum(item.get("section_count", 0) for item in metadata_list) / max(total_files, 1)
+    files_with_examples = sum(1 for item in metadata_list if item.get("has_examples", False))
+    
+    return {
+        "total_files": total_files,
+        "total_words": total_words,
+        "average_word_count": total_words / max(total_files, 1),
+        "average_sections": avg_sections,
+        "files_with_examples": files_with_examples,
+        "files_with_examples_percent": (files_with_examples / max(total_files, 1)) * 100,
+        "generated_at": datetime.now().isoformat()
+    }
+
+def find_knowledge_gaps(content: str, topic: str) -> List[str]:
+    """Essential subtopics of the topic that the content does not mention."""
+    gaps = []
+    
+    # For MCP-related content
+    if topic.lower() in ["mcp", "model context protocol"]:
+        essential_topics = [
+            "client-server architecture",
+            "tools",
+            "resources",
+            "prompts",
+            "implementation example",
+            "practical applications"
+        ]
+        
+        for subtopic in essential_topics:
+            if subtopic.lower() not in content.lower():
+                gaps.append(subtopic)
+    
+    return gaps
+
+def read_metadata(file_path: str) -> Dict[str, Any]:
+    """Metadata of a Markdown file on disk, or an error entry if it cannot be read."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        return metadata_from_content(file_path, content)
+    except Exception as e:
+        return {
+            "file_path": file_path,
+            "error": str(e)
+        }
+
+def process_files(glob_pattern: str, processor_func: str) -> List[Dict[str, Any]]:
+    """Run one of the named checks over every file matching the glob pattern."""
+    results = []
+    for file_path in glob.glob(glob_pattern, recursive=True):
+        if processor_func == "extract_metadata":
+            result = read_metadata(file_path)
+        elif processor_func == "check_freshness":
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+            result = {
+                "file_path": file_path,
+                "check_result": freshness_verdict(content)
+            }
+        else:
+            result = {
+                "file_path": file_path,
+                "error": f"Unknown processor function: {processor_func}"
+            }
+        results.append(result)
+    return results
@@ -0,0 +1,154 @@
+# 이 파일은 docs 파이프라인 도구(tools.py)를 MCP 서버로 제공합니다.
+# 외부 agent가 같은 프로세스에 있지 않아도 문서 코퍼스 상태(메타데이터, 신선도, 지식 갭, 요약)를 조회할 수 있습니다.
+# 서버는 문서 캐시와 인덱스를 메모리에 유지하므로, 바뀐 파일만 다시 읽고 나머지 호출은 캐시에서 바로 응답합니다.
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from mcp.server.fastmcp import FastMCP
+
+from single_flight import flights, make_key
+from doc_checks import find_knowledge_gaps, freshness_verdict, metadata_from_content, summarize_metadata
+
+DOCS_DIR = Path("docs")
+MAX_CACHED_FILES = 1024  # 본문을 메모리에 유지하는 최대 파일 수 (오래 안 쓴 것부터 제거)
+
+
+class DocsIndex:
+    """docs/ 문서 캐시: 파일의 (수정 시각, 크기)가 바뀌었을 때만 다시 읽고 메타데이터를 계산"""
+
+    def __init__(self, root: Path = DOCS_DIR, max_files: int = MAX_CACHED_FILES):
+        self.root = root
+        self.max_files = max_files
+        self._entries = OrderedDict()  # 실제 경로 -> (signature, content, metadata), LRU 순서
+        self._metadata = {}  # 실제 경로 -> (signature, metadata), 요약 리포트용
+        self._summary = None  # (코퍼스 signature, 요약 리포트)
+        self._lock = threading.Lock()
+
+    def resolve(self, path: str) -> Path:
+        # 클라이언트가 보낸 경로는 docs/ 안의 파일만 허용 (../, 절대 경로, 심볼릭 링크로 빠져나가는 것 차단)
+        resolved = Path(path).resolve()
+        if not resolved.is_relative_to(self.root.resolve()):
+            raise PermissionError(f"{path} is outside {self.root}")
+        return resolved
+
+    def get(self, path: str):
+        key = self.resolve(path)
+        st = os.stat(key)
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None or entry[0] != signature:
+            with open(key, "r", encoding="utf-8") as f:
+                content = f.read()
+            entry = (signature, content, metadata_from_content(path, content))
+            with self._lock:
+                self._entries[key] = entry
+                self._metadata[key] = (signature, entry[2])
+                while len(self._entries) > self.max_files:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def metadata(self, path: str) -> dict:
+        key = self.resolve(path)
+        st = os.stat(key)
+        cached = self._metadata.get(key)
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        return self.get(path)[2]
+
+    def summary(self) -> dict:
+        root = self.root.resolve()
+        # docs/ 밖을 가리키는 심볼릭 링크는 요약에서도 제외
+        paths = sorted(str(p) for p in self.root.rglob("*.md") if p.resolve().is_relative_to(root))
+        metadata, keys, signature, errors = [], [], [], []
+        for path in paths:
+            # 읽을 수 없는 파일 하나 때문에 전체 리포트가 실패하지 않도록 오류 항목으로 남김
+            try:
+                metadata.append(self.metadata(path))
+            except (OSError, UnicodeDecodeError) as e:
+                errors.append({"file_path": path, "error": str(e)})
+                signature.append((path, None))
+                continue
+            key = self.resolve(path)
+            keys.append(key)
+            signature.append((path, self._metadata[key][0]))
+        corpus_signature = tuple(signature)
+        if self._summary is None or self._summary[0] != corpus_signature:
+            report = summarize_metadata(metadata)
+            if errors:
+                report["errors"] = errors
+            with self._lock:
+                # 삭제된 파일은 캐시에서도 제거
+                live = set(keys)
+                self._metadata = {k: v for k, v in self._metadata.items() if k in live}
+                for key in [k for k in self._entries if k not in live]:
+                    del self._entries[key]
+                self._summary = (corpus_signature, report)
+        return self._summary[1]
+
+
+def _on_file(path: str, func):
+    # 파일을 읽을 수 없거나 docs/ 밖의 경로면 예외 대신 extract_metadata와 같은 오류 항목을 반환
+    try:
+        return func(index.get(path))
+    except (OSError, UnicodeDecodeError) as e:
+        return {"file_path": path, "error": str(e)}
+
+
+index = DocsIndex()
+mcp = FastMCP("docs")
+
+
+async def _json_result(name, func, *args) -> str:
+    # 파일 I/O는 스레드에서 처리해 동시에 들어온 다른 요청을 막지 않음
+    # 같은 툴/인자로 동시에 들어온 요청은 한 번만 계산해 결과를 나눠 씀
+    # (요청이 모두 취소돼도 이미 시작한 스레드 작업은 끝까지 실행되고 결과만 버려짐)
+    result = await flights.do(make_key(name, *args), asyncio.to_thread, func, *args)
+    return json.dumps(result, ensure_ascii=False)
+
+
+@mcp.tool()
+async def extract_metadata(file_path: str) -> str:
+    """마크다운 문서의 제목, 날짜, 섹션 수 등 메타데이터를 반환합니다."""
+    return await _json_result("extract_metadata", lambda p: _on_file(p, lambda entry: entry[2]), file_path)
+
+
+@mcp.tool()
+async def check_freshness_and_accuracy(file_path: str) -> str:
+    """문서가 최신이고 정확한지 검사해 'pass' 또는 'needs_revision:<이유>'를 반환합니다."""
+    return await _json_result(
+        "check_freshness_and_accuracy", lambda p: _on_file(p, lambda entry: freshness_verdict(entry[1])), file_path
+    )
+
+
+@mcp.tool()
+async def detect_knowledge_gaps(file_path: str, topic: str) -> str:
+    """문서에서 주제에 비해 빠진 하위 주제 목록을 반환합니다."""
+    return await _json_result(
+        "detect_knowledge_gaps", lambda p, t: _on_file(p, lambda entry: find_knowledge_gaps(entry[1], t)), file_path, topic
+    )
+
+
+@mcp.tool()
+async def generate_summary_report() -> str:
+    """docs/ 전체 문서의 요약 리포트를 반환합니다. 코퍼스가 바뀌지 않았으면 캐시된 결과를 씁니다."""
+    return await _json_result("generate_summary_report", index.summary)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="docs 파이프라인 MCP 서버")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    # streamable-http: 하나의 오래 유지되는 서버에서 여러 클라이언트 요청을 동시에 처리
+    mcp.settings.port = args.port
+    mcp.run(transport=args.transport)
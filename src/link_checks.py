@@ -0,0 +1,371 @@
+"""
+Link validation for docs/: URL extraction, a pooled async checker and a result cache.
+
+Every URL in the corpus is extracted in one pass over the pages and checked once,
+however many pages link to it. Checks share one HTTP connection pool, and each
+host (scheme + host + port) gets at most PER_HOST_CONCURRENCY requests at a time.
+Results are cached with a TTL; expired entries are revalidated with If-None-Match /
+If-Modified-Since, so a repeat run sends mostly cheap conditional requests or none.
+
+    python link_checks.py --bench --links 50000   (local HTTP stub, no network access)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+CACHE_PATH = Path("docs/.link-cache.json")
+OK_TTL = 24 * 3600.0  # seconds before a working link is revalidated
+BROKEN_TTL = 3600.0  # broken links are retried sooner
+MAX_CONNECTIONS = 64
+PER_HOST_CONCURRENCY = 8
+TIMEOUT = 10.0
+RETRIES = 2
+MAX_RETRY_AFTER = 30.0
+USER_AGENT = "teach-mcp-link-checker/1.0"
+# Hosts that only resolve on the author's machine, plus reserved example/test TLDs
+SKIP_HOSTS = ("localhost", "127.0.0.1", "0.0.0.0", "::1")
+SKIP_SUFFIXES = (".local", ".localhost", ".test", ".example", ".invalid")
+# Statuses that mean the target is gone rather than temporarily unavailable
+DEAD_STATUSES = (404, 410)
+# Servers that reject or mishandle HEAD; those links are retried with GET
+HEAD_REJECTED = (403, 405, 501)
+
+# Parentheses are allowed inside URLs (wiki/Foo_(bar)); an unbalanced closing one is trimmed afterwards
+URL_PATTERN = re.compile(r"https?://[^\s<>\"'`\[\]]+")
+CODE_PATTERN = re.compile(r"^(```|~~~).*?^\1|`[^`\n]*`", re.MULTILINE | re.DOTALL)
+TRAILING_PUNCTUATION = ".,;:!?*_~"
+
+
+def extract_links(content: str) -> List[str]:
+    """Distinct http(s) URLs of a Markdown page, without fragments, ignoring code blocks and inline code."""
+    links = {}
+    for match in URL_PATTERN.finditer(CODE_PATTERN.sub("", content)):
+        url = _trim(match.group()).split("#", 1)[0]
+        links.setdefault(url, None)
+    return list(links)
+
+
+def _trim(url: str) -> str:
+    """Drop trailing punctuation and closing parentheses that belong to the surrounding text, e.g. `[a](url)`."""
+    while True:
+        url = url.rstrip(TRAILING_PUNCTUATION)
+        if not url.endswith(")") or url.count(")") <= url.count("("):
+            return url
+        url = url[:-1]
+
+
+def origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+
+def should_skip(url: str, skip_hosts: Iterable[str] = SKIP_HOSTS) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    return not host or host in skip_hosts or host.endswith(SKIP_SUFFIXES)
+
+
+@dataclass
+class LinkResult:
+    """Outcome of the last check of a URL (`cached` is True when no request was sent this run)."""
+    url: str
+    ok: bool
+    status: Optional[int] = None
+    error: Optional[str] = None
+    final_url: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    checked_at: float = 0.0
+    cached: bool = False
+
+    @property
+    def dead(self) -> bool:
+        return self.status in DEAD_STATUSES
+
+
+class LinkCache:
+    """Check results by URL, persisted as JSON next to the other docs/ manifests."""
+
+    def __init__(self, path: Path = CACHE_PATH, ok_ttl: float = OK_TTL, broken_ttl: float = BROKEN_TTL):
+        self.path = Path(path)
+        self.ok_ttl = ok_ttl
+        self.broken_ttl = broken_ttl
+        self.entries: Dict[str, LinkResult] = {}
+
+    @classmethod
+    def load(cls, path: Path = CACHE_PATH, **kwargs) -> "LinkCache":
+        cache = cls(path, **kwargs)
+        if cache.path.exists():
+            for url, entry in json.loads(cache.path.read_text(encoding="utf-8")).items():
+                cache.entries[url] = LinkResult(url=url, cached=True, **entry)
+        return cache
+
+    def save(self):
+        data = {
+            url: {k: v for k, v in asdict(result).items() if k not in ("url", "cached")}
+            for url, result in sorted(self.entries.items())
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+
+    def get(self, url: str) -> Optional[LinkResult]:
+        return self.entries.get(url)
+
+    def is_fresh(self, result: LinkResult, now: float) -> bool:
+        return now - result.checked_at < (self.ok_ttl if result.ok else self.broken_ttl)
+
+    def put(self, result: LinkResult):
+        self.entries[result.url] = result
+
+
+_shared_cache: Optional[LinkCache] = None
+_shared_mtime: Optional[float] = None
+
+
+def dead_links(urls: Iterable[str], path: Path = CACHE_PATH) -> List[str]:
+    """URLs whose last recorded check found them gone (404/410). Never sends requests."""
+    global _shared_cache, _shared_mtime
+    mtime = path.stat().st_mtime if path.exists() else None
+    if _shared_cache is None or mtime != _shared_mtime or _shared_cache.path != path:
+        _shared_cache, _shared_mtime = LinkCache.load(path), mtime
+    return [url for url in urls if (result := _shared_cache.get(url)) is not None and result.dead]
+
+
+class LinkChecker:
+    """
+    Checks URLs over one pooled httpx client. URLs are grouped by origin and each
+    origin gets at most `per_host` workers, while `max_connections` bounds the total.
+    """
+
+    def __init__(self, cache: Optional[LinkCache] = None, per_host: int = PER_HOST_CONCURRENCY,
+                 max_connections: int = MAX_CONNECTIONS, timeout: float = TIMEOUT, retries: int = RETRIES,
+                 skip_hosts: Iterable[str] = SKIP_HOSTS):
+        self.cache = cache if cache is not None else LinkCache()
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.retries = retries
+        self.skip_hosts = tuple(skip_hosts)
+        self.stats = Counter()
+
+    async def check_all(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        """Results for every distinct, non-skipped URL; fresh cache entries are reused without a request."""
+        import httpx
+
+        now = time.time()
+        results: Dict[str, LinkResult] = {}
+        queues = defaultdict(deque)
+        for url in dict.fromkeys(urls):
+            if should_skip(url, self.skip_hosts):
+                self.stats["skipped"] += 1
+                continue
+            cached = self.cache.get(url)
+            if cached is not None and self.cache.is_fresh(cached, now):
+                cached.cached = True
+                results[url] = cached
+                self.stats["cached"] += 1
+            else:
+                queues[origin(url)].append(url)
+
+        limit = asyncio.Semaphore(self.max_connections)
+
+        async def check_origin(queue):
+            # One small keep-alive pool per origin: httpcore's request-to-connection assignment
+            # scales with pool size, so a single shared pool of max_connections slows every request
+            limits = httpx.Limits(max_connections=self.per_host, max_keepalive_connections=self.per_host)
+            async with httpx.AsyncClient(
+                limits=limits, timeout=self.timeout, follow_redirects=True, headers={"User-Agent": USER_AGENT}
+            ) as client:
+                await asyncio.gather(*(worker(client, queue) for _ in range(min(self.per_host, len(queue)))))
+
+        async def worker(client, queue):
+            while queue:
+                url = queue.popleft()
+                async with limit:
+                    result = await self._check(client, url, self.cache.get(url))
+                results[url] = result
+                self.cache.put(result)
+
+        await asyncio.gather(*(check_origin(queue) for queue in queues.values()))
+        return results
+
+    async def _check(self, client, url: str, previous: Optional[LinkResult]) -> LinkResult:
+        import httpx
+
+        headers = {}
+        if previous is not None and previous.ok:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+
+        error = None
+        for attempt in range(self.retries + 1):
+            try:
+                response = await client.head(url, headers=headers)
+                self.stats["head"] += 1
+                if response.status_code in HEAD_REJECTED:
+                    # The body is never read; closing the stream is enough to get the status
+                    async with client.stream("GET", url, headers=headers) as response:
+                        self.stats["get"] += 1
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+                self.stats["transport_errors"] += 1
+                if attempt < self.retries:
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                continue
+
+            status = response.status_code
+            if status in (429, 503) and attempt < self.retries:
+                self.stats["retried"] += 1
+                await asyncio.sleep(_retry_after(response.headers.get("Retry-After"), attempt))
+                continue
+            if status == 304 and previous is not None:
+                self.stats["not_modified"] += 1
+                return LinkResult(**{**asdict(previous), "checked_at": time.time(), "cached": False})
+            self.stats[f"status_{status // 100}xx"] += 1
+            return LinkResult(
+                url=url,
+                ok=status < 400,
+                status=status,
+                final_url=str(response.url) if str(response.url) != url else None,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                checked_at=time.time()
+            )
+        return LinkResult(url=url, ok=False, error=error or "retries exhausted", checked_at=time.time())
+
+
+def _retry_after(value: Optional[str], attempt: int) -> float:
+    try:
+        return min(float(value), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return min(0.5 * 2 ** attempt, MAX_RETRY_AFTER)
+
+
+# ---- Local HTTP stub and benchmark ----
+
+class StubServer:
+    """
+    Minimal keep-alive HTTP/1.1 server for exercising the checker without network access.
+    /ok/N answers 200 with an ETag and Last-Modified (304 when they match), /gone/N is 404,
+    /nohead/N rejects HEAD with 405, /flaky/N answers 503 once with Retry-After: 0.
+    """
+
+    def __init__(self, latency: float = 0.01):
+        self.latency = latency
+        self.requests = Counter()
+        self.in_flight = Counter()
+        self.max_in_flight = Counter()
+        self._flaky_seen = set()
+        self._servers = []
+        self.ports: List[int] = []
+
+    async def start(self, hosts: int):
+        for _ in range(hosts):
+            server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+            self._servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        port = writer.get_extra_info("sockname")[1]
+        try:
+            while request_line := await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                self.requests[method] += 1
+                self.in_flight[port] += 1
+                self.max_in_flight[port] = max(self.max_in_flight[port], self.in_flight[port])
+                await asyncio.sleep(self.latency)
+                self.in_flight[port] -= 1
+                status, extra = self._route(method, path, headers)
+                self.requests[status] += 1
+                body = b"" if method == "HEAD" or status == 304 else b"ok"
+                head = f"HTTP/1.1 {status} X\r\nContent-Length: {len(body)}\r\n{extra}\r\n"
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def _route(self, method: str, path: str, headers: Dict[str, str]):
+        kind, _, key = path.strip("/").partition("/")
+        etag = f'"{key}"'
+        last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+        validators = f"ETag: {etag}\r\nLast-Modified: {last_modified}\r\n"
+        if kind == "gone":
+            return 404, ""
+        if kind == "nohead" and method == "HEAD":
+            return 405, ""
+        if kind == "flaky" and path not in self._flaky_seen:
+            self._flaky_seen.add(path)
+            return 503, "Retry-After: 0\r\n"
+        if headers.get("if-none-match") == etag or headers.get("if-modified-since") == last_modified:
+            return 304, validators
+        return 200, validators
+
+
+async def benchmark(links: int, hosts: int, latency: float, per_host: int, max_connections: int):
+    stub = StubServer(latency)
+    await stub.start(hosts)
+    kinds = ["ok"] * 16 + ["gone", "nohead", "flaky"]
+    # Pages link to the same URLs many times over; only distinct URLs are checked
+    urls = [
+        f"http://127.0.0.1:{stub.ports[i % hosts]}/{kinds[i % len(kinds)]}/{i}"
+        for i in range(links)
+    ]
+    page_links = urls + urls[: links // 2]
+    cache_path = Path(os.getenv("TMPDIR", "/tmp")) / f"link-cache-bench-{os.getpid()}.json"
+    try:
+        for label, ok_ttl in (("cold", OK_TTL), ("expired (conditional)", 0.0), ("fresh cache", OK_TTL)):
+            cache = LinkCache.load(cache_path, ok_ttl=ok_ttl, broken_ttl=OK_TTL)
+            checker = LinkChecker(cache, per_host=per_host, max_connections=max_connections, skip_hosts=())
+            stub.requests.clear()
+            stub.max_in_flight.clear()
+            started = time.perf_counter()
+            results = await checker.check_all(page_links)
+            elapsed = time.perf_counter() - started
+            cache.save()
+            broken = sum(not r.ok for r in results.values())
+            print(f"{label:<22} {len(results)} links in {elapsed:6.2f}s ({len(results) / elapsed:8.0f}/s), "
+                  f"broken {broken}, requests {dict(stub.requests)}, "
+                  f"max per host {max(stub.max_in_flight.values(), default=0)}")
+    finally:
+        cache_path.unlink(missing_ok=True)
+        await stub.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Link checker benchmark against a local HTTP stub")
+    parser.add_argument("--bench", action="store_true", help="run the benchmark")
+    parser.add_argument("--links", type=int, default=5000, help="distinct URLs to check")
+    parser.add_argument("--hosts", type=int, default=8, help="stub hosts (one port each)")
+    parser.add_argument("--latency", type=float, default=0.01, help="stub response delay in seconds")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_CONCURRENCY)
+    parser.add_argument("--max-connections", type=int, default=MAX_CONNECTIONS)
+    args = parser.parse_args()
+    if not args.bench:
+        parser.print_help()
+        return
+    asyncio.run(benchmark(args.links, args.hosts, args.latency, args.per_host, args.max_connections))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Lightweight Markdown section tree used for in-place section edits.
+
+A document is split into sections at ATX headings (outside fenced code blocks).
+Each section keeps its exact source text, so rendering is a single join and always
+reproduces the original bytes. Parsed documents are cached by content hash.
+"""
+
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+HEADING_PATTERN = re.compile(r"(#{1,6})[ \t]+(.*?)[ \t#]*$")
+FENCE_PREFIXES = ("```", "~~~")
+CACHE_SIZE = 256
+
+_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class Section:
+    """One heading and the text up to the next heading (level 0 = text before any heading)."""
+    level: int
+    title: str
+    text: str
+
+
+def _split_sections(content: str) -> List[Section]:
+    """Split Markdown text into sections at headings, ignoring lines inside code fences."""
+    sections = []
+    level, title, start = 0, "", 0
+    in_fence = False
+    position = 0
+    for line in content.splitlines(keepends=True):
+        stripped = line.lstrip()
+        if stripped.startswith(FENCE_PREFIXES):
+            in_fence = not in_fence
+        elif not in_fence and line.startswith("#"):
+            match = HEADING_PATTERN.match(line.rstrip("\r\n"))
+            if match:
+                if position > start or level:
+                    sections.append(Section(level, title, content[start:position]))
+                level, title, start = len(match.group(1)), match.group(2), position
+        position += len(line)
+    if position > start or level:
+        sections.append(Section(level, title, content[start:position]))
+    return sections
+
+
+def _content_key(content: str) -> bytes:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def _remember(key: bytes, sections: List[Section]):
+    _cache[key] = tuple(sections)
+    _cache.move_to_end(key)
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+class MarkdownDocument:
+    """Editable list of sections; edits touch only the affected sections."""
+
+    def __init__(self, sections: List[Section]):
+        self.sections = sections
+
+    def find(self, title: str, level: Optional[int] = None) -> int:
+        """Index of the first section with the given heading title, or -1."""
+        for index, section in enumerate(self.sections):
+            if section.title == title and section.level and (level is None or section.level == level):
+                return index
+        return -1
+
+    def find_level(self, level: int) -> int:
+        """Index of the first section with the given heading level, or -1."""
+        for index, section in enumerate(self.sections):
+            if section.level == level:
+                return index
+        return -1
+
+    def section_end(self, index: int) -> int:
+        """Index just past the section at `index` and all of its subsections."""
+        level = self.sections[index].level
+        for end in range(index + 1, len(self.sections)):
+            if 0 < self.sections[end].level <= level:
+                return end
+        return len(self.sections)
+
+    def insert(self, index: int, text: str):
+        """
+        Insert Markdown text before the section at `index`.
+        Leading text without a heading joins the preceding section's body.
+        """
+        new_sections = _split_sections(text)
+        if new_sections and new_sections[0].level == 0 and index > 0:
+            previous = self.sections[index - 1]
+            self.sections[index - 1] = Section(previous.level, previous.title, previous.text + new_sections[0].text)
+            new_sections = new_sections[1:]
+        self.sections[index:index] = new_sections
+
+    def append(self, text: str):
+        """Append Markdown text to the end of the document."""
+        self.insert(len(self.sections), text)
+
+    def replace(self, index: int, text: str):
+        """Replace the source text of the section at `index`."""
+        self.sections[index:index + 1] = _split_sections(text)
+
+    def render(self) -> str:
+        """Join the sections back into Markdown text and cache the result's parse."""
+        content = "".join(section.text for section in self.sections)
+        _remember(_content_key(content), self.sections)
+        return content
+
+
+def parse_markdown(content: str) -> MarkdownDocument:
+    """Parse content into a MarkdownDocument, reusing a cached parse of identical content."""
+    key = _content_key(content)
+    sections = _cache.get(key)
+    if sections is None:
+        sections = _split_sections(content)
+        _remember(key, sections)
+    else:
+        _cache.move_to_end(key)
+    return MarkdownDocument(list(sections))
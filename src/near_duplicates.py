@@ -0,0 +1,267 @@
+"""
+Near-duplicate detection for docs/ with MinHash signatures and LSH banding.
+
+Each document is reduced to word shingles and a fixed-size MinHash signature,
+computed in one pass with one-permutation hashing (the shingle's top bits pick a
+bin, each bin keeps its minimum; empty bins borrow from the next filled one).
+Signatures are split into bands; documents that share any band land in the same
+bucket and only those candidates are compared, so finding duplicates stays close
+to linear in the number of documents instead of comparing every pair.
+
+Short documents have too few shingles for a reliable estimate (a 20-shingle stub
+fills a third of the bins), so their shingle sets are kept and pairs of short
+documents are compared by exact Jaccard similarity.
+
+Signatures are persisted next to the QA manifest, keyed by content hash, so a
+directory audit only re-signs documents whose content changed.
+"""
+
+import base64
+import hashlib
+import json
+import re
+import sys
+from array import array
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+INDEX_PATH = Path("docs/.near-duplicates.json")
+SHINGLE_WORDS = 4
+# Shorter docs (generated stubs) are compared word by word: in a 30-word page a changed title
+# touches most 4-word windows, and those pages should still match
+SHORT_DOC_WORDS = 64
+NUM_PERM = 128  # bins are almost free with one-permutation hashing; more bins lower the estimate's variance
+BANDS = 16  # 16 bands x 8 rows: pairs above ~0.75 Jaccard almost always share a bucket
+THRESHOLD = 0.8  # estimated Jaccard similarity at which two docs count as near-duplicates
+# Lines that differ between otherwise identical pages (dates, auto-qa notes) are not shingled
+VOLATILE_LINE = re.compile(r"^(?:date:.*|Last updated:.*|> \*\*NOTE \(auto‑qa\):\*\*.*)$", re.MULTILINE)
+WORD = re.compile(r"\w+")
+# Shingles use Python's tuple hash of word hashes, which is stable across runs but not across versions
+FORMAT_VERSION = f"2:{NUM_PERM}:{SHINGLE_WORDS}:{SHORT_DOC_WORDS}:{sys.version_info[0]}.{sys.version_info[1]}"
+_BIN_BITS = NUM_PERM.bit_length() - 1  # NUM_PERM must be a power of two
+_VALUE_BITS = 64 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 1 << 64
+
+
+def _shingles(content: str) -> Tuple[Set[int], bool]:
+    words = WORD.findall(VOLATILE_LINE.sub("", content).lower())
+    # Each distinct word is hashed once; windows then hash the tuple of word hashes in C
+    word_hashes = {word: int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+                   for word in set(words)}
+    ids = [word_hashes[word] for word in words] or [0]
+    short = len(words) < SHORT_DOC_WORDS
+    size = 1 if short else SHINGLE_WORDS
+    windows = zip(*(ids[offset:] for offset in range(size))) if len(ids) >= size else [tuple(ids)]
+    return {value & 0xFFFFFFFFFFFFFFFF for value in map(hash, windows)}, short
+
+
+def shingles(content: str) -> Set[int]:
+    """64-bit hashes of a document's overlapping word windows (single words for short docs)."""
+    return _shingles(content)[0]
+
+
+def signature(hashes: Iterable[int]) -> bytes:
+    """One-permutation MinHash signature of 64-bit shingle hashes (NUM_PERM unsigned 64-bit values)."""
+    bins = [_EMPTY] * NUM_PERM
+    for value in hashes:
+        index = value >> _VALUE_BITS
+        value &= _VALUE_MASK
+        if value < bins[index]:
+            bins[index] = value
+    if all(value == _EMPTY for value in bins):
+        return array("Q", bytes(8 * NUM_PERM)).tobytes()
+    # Rotation densification: an empty bin takes the next filled bin's value, tagged with the distance
+    densified = list(bins)
+    for index, value in enumerate(bins):
+        distance = 0
+        while value == _EMPTY:
+            distance += 1
+            value = bins[(index + distance) % NUM_PERM]
+        densified[index] = value | (distance << _VALUE_BITS)
+    return array("Q", densified).tobytes()
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity: the fraction of signature positions that agree."""
+    left, right = array("Q", a), array("Q", b)
+    return sum(x == y for x, y in zip(left, right)) / len(left)
+
+
+def jaccard(a: bytes, b: bytes) -> float:
+    """Exact Jaccard similarity of two packed shingle sets."""
+    left, right = set(array("Q", a)), set(array("Q", b))
+    return len(left & right) / len(left | right)
+
+
+def _bands(sig: bytes) -> List[bytes]:
+    width = len(sig) // BANDS
+    return [bytes([index]) + sig[index * width:(index + 1) * width] for index in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """Incrementally updated MinHash/LSH index over documents keyed by path."""
+
+    def __init__(self, threshold: float = THRESHOLD, path: Path = INDEX_PATH):
+        self.threshold = threshold
+        self.path = Path(path)
+        # path -> {"sha256", "length", "signature", "shingles"}; shingles (packed) only for short docs
+        self._entries: Dict[str, dict] = {}
+        self._buckets: Dict[bytes, Set[str]] = defaultdict(set)
+        self._clusters: Optional[List[List[str]]] = None
+        self.signed = 0  # documents (re)signed since load
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH, threshold: float = THRESHOLD) -> "NearDuplicateIndex":
+        """Load persisted signatures; a missing file or a different format starts empty."""
+        index = cls(threshold, path)
+        if index.path.exists():
+            data = json.loads(index.path.read_text(encoding="utf-8"))
+            if data.get("version") == FORMAT_VERSION:
+                for doc, entry in data["files"].items():
+                    packed = base64.b64decode(entry["shingles"]) if "shingles" in entry else None
+                    index._insert(doc, entry["sha256"], entry["length"], base64.b64decode(entry["signature"]), packed)
+        return index
+
+    def save(self):
+        files = {}
+        for doc, entry in sorted(self._entries.items()):
+            files[doc] = {
+                "sha256": entry["sha256"],
+                "length": entry["length"],
+                "signature": base64.b64encode(entry["signature"]).decode("ascii")
+            }
+            if entry["shingles"] is not None:
+                files[doc]["shingles"] = base64.b64encode(entry["shingles"]).decode("ascii")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"version": FORMAT_VERSION, "files": files}), encoding="utf-8")
+
+    def __contains__(self, doc: str) -> bool:
+        return doc in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, doc: str, digest: str, length: int, sig: bytes, packed: Optional[bytes] = None):
+        self._entries[doc] = {"sha256": digest, "length": length, "signature": sig, "shingles": packed}
+        for band in _bands(sig):
+            self._buckets[band].add(doc)
+        self._clusters = None
+
+    def remove(self, doc: str):
+        entry = self._entries.pop(doc, None)
+        if entry is None:
+            return
+        for band in _bands(entry["signature"]):
+            bucket = self._buckets[band]
+            bucket.discard(doc)
+            if not bucket:
+                del self._buckets[band]
+        self._clusters = None
+
+    def update(self, doc: str, content: str) -> bool:
+        """Index a document's current content; returns False when it was unchanged."""
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        entry = self._entries.get(doc)
+        if entry is not None and entry["sha256"] == digest:
+            return False
+        self.remove(doc)
+        hashes, short = _shingles(content)
+        packed = array("Q", sorted(hashes)).tobytes() if short else None
+        self._insert(doc, digest, len(content), signature(hashes), packed)
+        self.signed += 1
+        return True
+
+    def update_files(self, paths: Iterable[str]):
+        """Re-index files from disk; files that no longer exist are dropped."""
+        for doc in paths:
+            file = Path(doc)
+            if file.exists():
+                self.update(doc, file.read_text(encoding="utf-8"))
+            else:
+                self.remove(doc)
+
+    def prune(self, keep: Iterable[str]):
+        """Drop every document not in `keep` (e.g. files deleted since the last audit)."""
+        keep = set(keep)
+        for doc in [doc for doc in self._entries if doc not in keep]:
+            self.remove(doc)
+
+    def similarity(self, a: str, b: str) -> float:
+        """Jaccard similarity of two indexed documents: exact for two short docs, estimated otherwise."""
+        left, right = self._entries[a], self._entries[b]
+        if left["shingles"] is not None and right["shingles"] is not None:
+            return jaccard(left["shingles"], right["shingles"])
+        return similarity(left["signature"], right["signature"])
+
+    def similar(self, doc: str) -> List[Tuple[str, float]]:
+        """Indexed documents at or above the threshold for `doc`, most similar first."""
+        sig = self._entries[doc]["signature"]
+        candidates = set().union(*(self._buckets.get(band, ()) for band in _bands(sig))) - {doc}
+        matches = [(other, self.similarity(doc, other)) for other in candidates]
+        return sorted((m for m in matches if m[1] >= self.threshold), key=lambda m: (-m[1], m[0]))
+
+    def clusters(self) -> List[List[str]]:
+        """
+        Groups of near-duplicate documents, representative first. Each bucket member is
+        compared with the members of every group found in the bucket so far until one
+        matches, so two documents also merge through a third one they both resemble, while
+        a bucket of near-identical stubs costs about one comparison per member. Each pair is
+        compared at most once across buckets. The representative is the longest document
+        of the group.
+        """
+        if self._clusters is not None:
+            return self._clusters
+
+        parent = {}
+
+        def find(doc):
+            parent.setdefault(doc, doc)
+            while parent[doc] != doc:
+                parent[doc] = parent[parent[doc]]
+                doc = parent[doc]
+            return doc
+
+        compared = set()
+
+        def matches(a, b):
+            pair = (a, b) if a < b else (b, a)
+            if pair in compared:
+                return False
+            compared.add(pair)
+            return self.similarity(a, b) >= self.threshold
+
+        for bucket in self._buckets.values():
+            if len(bucket) < 2:
+                continue
+            seen = []  # bucket members so far, one list per connected group
+            for doc in sorted(bucket):
+                joined = None
+                for group in seen:
+                    if find(group[0]) == find(doc) or any(matches(doc, member) for member in group):
+                        parent[find(group[0])] = find(doc)
+                        if joined is None:
+                            joined = group
+                            group.append(doc)
+                        else:
+                            joined.extend(group)
+                            group.clear()
+                if joined is None:
+                    seen.append([doc])
+                else:
+                    seen = [group for group in seen if group]
+
+        groups = defaultdict(list)
+        for doc in parent:
+            groups[find(doc)].append(doc)
+        self._clusters = sorted(
+            (sorted(group, key=lambda doc: (-self._entries[doc]["length"], doc)) for group in groups.values()
+             if len(group) > 1),
+            key=lambda group: group[0]
+        )
+        return self._clusters
+
+    def duplicates(self) -> Dict[str, str]:
+        """Maps each non-representative member of a cluster to its representative."""
+        return {doc: group[0] for group in self.clusters() for doc in group[1:]}
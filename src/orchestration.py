@@ -0,0 +1,47 @@
+"""
+Concurrent fan-out helpers for sub-agents exposed to an orchestrator through `as_tool`.
+"""
+
+import asyncio
+import dataclasses
+import weakref
+from typing import Any, List, Sequence
+
+from agents import FunctionTool, ModelSettings
+
+# Maximum number of sub-agent calls allowed in flight at once
+DEFAULT_FAN_OUT_LIMIT = 4
+
+# Lets the orchestrator emit several independent tool calls in a single turn
+PARALLEL_TOOL_CALLS = ModelSettings(parallel_tool_calls=True)
+
+
+def limit_fan_out(tools: Sequence[Any], limit: int = DEFAULT_FAN_OUT_LIMIT) -> List[Any]:
+    """
+    Bound the concurrency of sub-agent tools with one shared semaphore.
+    Tool calls issued in the same turn run concurrently (at most `limit` at a time)
+    and their outputs keep the order in which the model issued the calls.
+    Non-function tools are returned unchanged.
+
+    The semaphore is created per event loop, so the same tools can be reused across
+    separate runs (e.g. successive Runner.run_sync calls).
+    """
+    semaphores = weakref.WeakKeyDictionary()
+
+    def semaphore() -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in semaphores:
+            semaphores[loop] = asyncio.Semaphore(limit)
+        return semaphores[loop]
+
+    def bounded(tool: FunctionTool) -> FunctionTool:
+        invoke = tool.on_invoke_tool
+
+        async def on_invoke_tool(ctx, input_json: str):
+            async with semaphore():
+                return await invoke(ctx, input_json)
+
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+    return [bounded(t) if isinstance(t, FunctionTool) else t for t in tools]
+
@@ -0,0 +1,335 @@
+"""
+Adaptive client-side concurrency limits driven by provider rate-limit headers.
+
+Every (provider, model) pair gets its own AIMD controller. Successful calls raise
+the in-flight limit by one per window of `limit` successes, a 429 halves it (once
+per retry-after period) and pauses new calls until the retry-after has passed.
+Rate-limit headers (OpenAI `x-ratelimit-*`, Anthropic `anthropic-ratelimit-*`, also
+with litellm's `llm_provider-` prefix) stop growth when the window runs low, keep
+in-flight calls within the remaining requests and pause the key until the window
+resets when nothing is left.
+
+    python rate_limits.py --simulate
+"""
+
+import asyncio
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+DEFAULT_INITIAL_LIMIT = 4
+DEFAULT_MAX_LIMIT = 64
+DECREASE_FACTOR = 0.5
+# Stop growing once less than this share of the provider's window is left
+LOW_REMAINING_FRACTION = 0.1
+MAX_RETRIES = 5
+DEFAULT_RETRY_AFTER = 1.0
+
+HEADER_ALIASES = {
+    "remaining_requests": ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"),
+    "limit_requests": ("x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit"),
+    "reset_requests": ("x-ratelimit-reset-requests", "anthropic-ratelimit-requests-reset"),
+    "remaining_tokens": ("x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining"),
+    "limit_tokens": ("x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit"),
+    "reset_tokens": ("x-ratelimit-reset-tokens", "anthropic-ratelimit-tokens-reset"),
+    "retry_after_ms": ("retry-after-ms",),
+    "retry_after": ("retry-after",)
+}
+DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def model_key(model: str) -> Tuple[str, str]:
+    """'anthropic/claude-x' -> ('anthropic', 'claude-x'); models without a provider prefix are OpenAI's."""
+    provider, _, name = model.partition("/")
+    return (provider, name) if name else ("openai", model)
+
+
+def parse_duration(value: Any) -> Optional[float]:
+    """Seconds until a reset: plain seconds ('1.5'), Go-style durations ('6m0s', '20ms') or a date."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    try:
+        return max(float(text), 0.0)
+    except ValueError:
+        pass
+    parts = DURATION_PART.findall(text)
+    if parts and "".join(number + unit for number, unit in parts) == text:
+        return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+    try:
+        from datetime import datetime
+        moment = datetime.fromisoformat(text.replace("Z", "+00:00")) if text[:4].isdigit() else parsedate_to_datetime(text)
+        return max(moment.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_headers(headers: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Normalize provider headers to the HEADER_ALIASES field names."""
+    if not headers:
+        return {}
+    lowered = {str(k).lower().removeprefix("llm_provider-"): v for k, v in headers.items()}
+    found = {}
+    for field, names in HEADER_ALIASES.items():
+        for name in names:
+            if name in lowered:
+                found[field] = lowered[name]
+                break
+    return found
+
+
+def response_headers(result: Any) -> Optional[Mapping[str, Any]]:
+    """Headers of a provider response: a (response, headers) pair, a litellm response or an error."""
+    if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], Mapping):
+        return result[1]
+    hidden = getattr(result, "_hidden_params", None)
+    if isinstance(hidden, Mapping) and hidden.get("additional_headers"):
+        return hidden["additional_headers"]
+    response = getattr(result, "response", None)
+    return getattr(response, "headers", None) or getattr(result, "headers", None)
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError"
+
+
+class AdaptiveLimit:
+    """AIMD in-flight limit for one provider/model."""
+
+    def __init__(self, initial: int = DEFAULT_INITIAL_LIMIT, maximum: int = DEFAULT_MAX_LIMIT, minimum: int = 1):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.successes = 0
+        self.rate_limited = 0
+        self._paused_until = 0.0
+        self._headroom = (0.0, 0.0)  # (requests left in the provider's window, when that window resets)
+        self._recovering_until = 0.0  # one decrease per congestion event, not one per failed call
+        self._changed = asyncio.Condition()
+
+    def _wake_time(self, now: float) -> Optional[float]:
+        """None if a call may start now, else when to look again (inf: wait for a release)."""
+        if now < self._paused_until:
+            return self._paused_until
+        capacity = int(self.limit)
+        remaining, resets_at = self._headroom
+        if now < resets_at and remaining < capacity:
+            # Never keep more calls in flight than the provider's window still allows
+            if self.in_flight >= remaining:
+                return resets_at
+        elif self.in_flight >= capacity:
+            return float("inf")
+        return None
+
+    async def acquire(self):
+        async with self._changed:
+            while (wake := self._wake_time(time.monotonic())) is not None:
+                if wake == float("inf"):
+                    await self._changed.wait()
+                    continue
+                try:
+                    await asyncio.wait_for(self._changed.wait(), wake - time.monotonic())
+                except TimeoutError:
+                    pass
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._changed:
+            self.in_flight -= 1
+            self._changed.notify_all()
+
+    def _pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def on_success(self, headers: Optional[Mapping[str, Any]] = None):
+        info = rate_limit_headers(headers)
+        async with self._changed:
+            self.successes += 1
+            grow = True
+            for kind in ("requests", "tokens"):
+                remaining = info.get(f"remaining_{kind}")
+                if remaining is None:
+                    continue
+                remaining = float(remaining)
+                window = float(info.get(f"limit_{kind}") or 0)
+                if remaining <= 0:
+                    self._pause(parse_duration(info.get(f"reset_{kind}")) or DEFAULT_RETRY_AFTER)
+                    grow = False
+                elif window and remaining < window * LOW_REMAINING_FRACTION:
+                    grow = False
+                if kind == "requests":
+                    resets_in = parse_duration(info.get("reset_requests")) or DEFAULT_RETRY_AFTER
+                    self._headroom = (remaining, time.monotonic() + resets_in)
+            if grow:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._changed.notify_all()
+
+    async def on_rate_limited(self, headers: Optional[Mapping[str, Any]] = None) -> float:
+        """Back off after a 429; returns how long the caller should wait before retrying."""
+        info = rate_limit_headers(headers)
+        retry_after = (
+            (parse_duration(info.get("retry_after_ms")) or 0) / 1000
+            or parse_duration(info.get("retry_after"))
+            or parse_duration(info.get("reset_requests"))
+            or DEFAULT_RETRY_AFTER
+        )
+        async with self._changed:
+            self.rate_limited += 1
+            now = time.monotonic()
+            if now >= self._recovering_until:
+                self.limit = max(float(self.minimum), self.limit * DECREASE_FACTOR)
+                self._recovering_until = now + retry_after
+            self._pause(retry_after)
+        return retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "successes": self.successes,
+            "rate_limited": self.rate_limited
+        }
+
+
+class AdaptiveRateLimiter:
+    """Per-(provider, model) adaptive limits shared by every caller in the process."""
+
+    def __init__(self, initial: int = DEFAULT_INITIAL_LIMIT, maximum: int = DEFAULT_MAX_LIMIT, max_retries: int = MAX_RETRIES):
+        self.initial = initial
+        self.maximum = maximum
+        self.max_retries = max_retries
+        self._limits: Dict[Tuple[str, str], AdaptiveLimit] = {}
+
+    def limit(self, key: Tuple[str, str]) -> AdaptiveLimit:
+        if key not in self._limits:
+            self._limits[key] = AdaptiveLimit(self.initial, self.maximum)
+        return self._limits[key]
+
+    async def call(self, key: Tuple[str, str], func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Run `func` under the key's limit, feed its response headers back and retry
+        429s after their retry-after (up to max_retries times).
+        """
+        limit = self.limit(key)
+        for attempt in range(self.max_retries + 1):
+            await limit.acquire()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                await limit.on_rate_limited(response_headers(e))
+                continue
+            finally:
+                await limit.release()
+            await limit.on_success(response_headers(result))
+            return result
+
+    async def acompletion(self, **kwargs) -> Any:
+        """litellm.acompletion under the adaptive limit of its provider/model."""
+        import litellm
+        return await self.call(model_key(kwargs["model"]), litellm.acompletion, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {"/".join(key): limit.stats() for key, limit in self._limits.items()}
+
+
+# Shared by every bulk run in the process
+limiter = AdaptiveRateLimiter()
+
+
+class RateLimitedError(Exception):
+    """429 raised by StubProvider, shaped like provider SDK errors."""
+
+    status_code = 429
+
+    def __init__(self, headers: Dict[str, str]):
+        super().__init__("rate limited")
+        self.headers = headers
+
+
+class StubProvider:
+    """
+    Local provider with a fixed-window request limit that emits synthetic
+    OpenAI-style rate-limit headers; used to exercise the limiter without a network.
+    """
+
+    def __init__(self, requests_per_window: int = 50, window: float = 1.0, latency: float = 0.05):
+        self.requests_per_window = requests_per_window
+        self.window = window
+        self.latency = latency
+        self.calls = 0
+        self.rejected = 0
+        self._window_start = time.monotonic()
+        self._used = 0
+
+    async def complete(self, prompt: str) -> Tuple[str, Dict[str, str]]:
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            self._window_start, self._used = now, 0
+        reset = self._window_start + self.window - now
+        self.calls += 1
+        if self._used >= self.requests_per_window:
+            self.rejected += 1
+            raise RateLimitedError({"retry-after-ms": str(int(reset * 1000))})
+        self._used += 1
+        await asyncio.sleep(self.latency)
+        return f"echo: {prompt}", {
+            "x-ratelimit-limit-requests": str(self.requests_per_window),
+            "x-ratelimit-remaining-requests": str(self.requests_per_window - self._used),
+            "x-ratelimit-reset-requests": f"{int(reset * 1000)}ms"
+        }
+
+
+async def run_fixed(provider: StubProvider, requests: int, concurrency: int = 32):
+    """Send `requests` calls with a fixed concurrency, waiting out each 429's retry-after."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            while True:
+                try:
+                    return await provider.complete(f"doc {i}")
+                except RateLimitedError as e:
+                    await asyncio.sleep(int(e.headers["retry-after-ms"]) / 1000)
+
+    return await asyncio.gather(*(one(i) for i in range(requests)))
+
+
+async def run_adaptive(provider: StubProvider, requests: int, limiter: Optional[AdaptiveRateLimiter] = None):
+    """Send `requests` calls at once through an adaptive limiter."""
+    limiter = limiter or AdaptiveRateLimiter(max_retries=100)
+    return await asyncio.gather(*(
+        limiter.call(("stub", "model"), provider.complete, f"doc {i}") for i in range(requests)
+    ))
+
+
+async def _simulate(requests: int = 500, fixed_concurrency: int = 32):
+    """Compare a fixed concurrency (retrying 429s after retry-after) with the adaptive limiter."""
+    for label in ("fixed", "adaptive"):
+        provider = StubProvider()
+        adaptive = AdaptiveRateLimiter(max_retries=100)
+        started = time.perf_counter()
+        if label == "fixed":
+            await run_fixed(provider, requests, fixed_concurrency)
+        else:
+            await run_adaptive(provider, requests, adaptive)
+        elapsed = time.perf_counter() - started
+        print(f"{label:>8}: {requests} requests in {elapsed:.2f}s, "
+              f"{provider.rejected} x 429 ({provider.calls} upstream calls)"
+              + (f", final {adaptive.stats()}" if label == "adaptive" else ""))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Adaptive rate limiting")
+    parser.add_argument("--simulate", action="store_true", help="Run against a local stub provider")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    if args.simulate:
+        asyncio.run(_simulate(args.requests))
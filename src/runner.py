@@ -4,30 +4,18 @@ MCP 교육 자료 자동 업데이트 통합 Agent Runner
 """
 
 import asyncio
+import hashlib
+import importlib
+import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
 import argparse
 
-# Agent imports
-from agents import Agent, Runner
-from agents.directory_agent import directory_audit
-from agents.gap_agent import gap_analysis  
-from agents.writer_agent import writer
-from agents.qa_agent import qa
-from agents.builder_agent import builder
-
-# Tool imports
-from tools import (
-    web_search,
-    list_files,
-    read_file,
-    write_file,
-    check_freshness_and_accuracy,
-    extract_metadata,
-    detect_knowledge_gaps,
-    generate_summary_report
-)
+# 문서 체크는 SDK 없이 바로 쓰고, agent 단계와 hosted 툴은 처음 쓸 때 불러옴 (빠른 시작)
+from doc_checks import find_knowledge_gaps, freshness_verdict, metadata_from_content
+from markdown_sections import parse_markdown
+from near_duplicates import NearDuplicateIndex
 
 # Constants
 DOCS_DIR = Path("docs")
@@ -41,12 +29,68 @@ MCP_TOPICS = [
     "LiteLLM 연동",
     "OpenAI Agents SDK 연동"
 ]
+WATCH_DEBOUNCE = 1.0  # 마지막 변경 후 이 시간(초) 동안 조용하면 배치를 처리
+WATCH_POLL_INTERVAL = 1.0  # watchfiles가 없을 때 사용하는 폴링 주기(초)
+WATCH_MAX_BATCH = 50  # 한 번에 처리할 최대 파일 수
+
+
+def _load_stage(module: str, name: str):
+    """agents.<module>의 단계 함수를 처음 필요할 때 import"""
+    return getattr(importlib.import_module(f"agents.{module}"), name)
+
+
+async def _write_file(path: str, content: str):
+    from tools import write_file
+    await write_file(path, content, overwrite=True)
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _snapshot(root: Path) -> Dict[str, tuple]:
+    """마크다운 파일별 (수정 시각, 크기) 스냅샷"""
+    snapshot = {}
+    for path in root.rglob("*.md"):
+        st = path.stat()
+        snapshot[str(path)] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+async def _poll_changes(root: Path, interval: float):
+    """파일 변경 이벤트를 쓸 수 없을 때의 폴링 방식 감지"""
+    previous = _snapshot(root)
+    while True:
+        await asyncio.sleep(interval)
+        current = _snapshot(root)
+        # 삭제된 파일도 변경으로 알림 (유사 중복 인덱스에서 제거해야 함)
+        changed = {p for p, sig in current.items() if previous.get(p) != sig} | (previous.keys() - current.keys())
+        previous = current
+        if changed:
+            yield changed
+
+
+async def _docs_changes(root: Path, interval: float):
+    """docs/ 아래 변경된 마크다운 경로 묶음을 차례로 돌려줌 (watchfiles 우선, 없으면 폴링)"""
+    try:
+        from watchfiles import awatch
+    except ImportError:
+        print("   watchfiles 미설치: 폴링 방식으로 변경을 감지합니다.")
+        async for changed in _poll_changes(root, interval):
+            yield changed
+        return
+    async for changes in awatch(root):
+        changed = {os.path.relpath(path) for _, path in changes if path.endswith(".md")}
+        if changed:
+            yield changed
 
 class MCPEducationRunner:
     """MCP 교육 자료 업데이트를 위한 통합 Runner"""
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, check_links: bool = True):
         self.dry_run = dry_run
+        self.check_links = check_links
         self.state = {
             "topic": "MCP (Model Context Protocol)",
             "docs_dir": str(DOCS_DIR),
@@ -55,8 +99,14 @@ class MCPEducationRunner:
             "doc_meta": {},
             "todo": [],
             "updates": [],
+            "changed_files": [],  # 이번 실행에서 수정/생성된 문서 (QA는 이 파일들만 다시 검사)
+            "near_duplicates": [],  # 유사 중복 문서 클러스터 (대표 문서가 맨 앞)
+            "duplicate_of": {},  # 대표가 아닌 중복 문서 -> 대표 문서
+            "doc_links": {},  # 문서 -> 문서 안의 URL 목록 (디렉토리 감사 때 한 번에 추출)
+            "broken_links": [],
             "errors": []
         }
+        self._duplicate_index = None  # watch 모드에서 변경된 파일만 갱신하는 유사 중복 인덱스
     
     async def run_pipeline(self, target_file: str = None) -> Dict[str, Any]:
         """전체 파이프라인 실행"""
@@ -64,9 +114,15 @@ class MCPEducationRunner:
             print("🚀 MCP 교육 자료 업데이트 파이프라인 시작...")
             print(f"   모드: {'체크 전용 (Dry Run)' if self.dry_run else '실제 업데이트'}")
             
+            if self.dry_run and target_file:
+                # 단일 파일 체크 (pre-commit 훅 등): 스캔/리서치/QA 없이 해당 파일만 검사
+                self.state['existing_docs'] = [target_file]
+                await self._update_existing_docs(target_file)
+                return self._generate_final_report()
+            
             # 1단계: 디렉토리 감사 - 현재 문서 상태 파악
             print("\n📂 1단계: 문서 디렉토리 스캔 중...")
-            self.state = await directory_audit(self.state)
+            self.state = await _load_stage("directory_agent", "directory_audit")(self.state)
             print(f"   발견된 문서: {len(self.state['existing_docs'])}개")
             
             # 2단계: 웹 리서치 - 최신 MCP 정보 수집
@@ -75,7 +131,7 @@ class MCPEducationRunner:
             
             # 3단계: 갭 분석 - 누락된 문서 확인
             print("\n📊 3단계: 교육 자료 갭 분석...")
-            self.state = await gap_analysis(self.state)
+            self.state = await _load_stage("gap_agent", "gap_analysis")(self.state)
             print(f"   생성 필요 문서: {len(self.state['todo'])}개")
             
             # 4단계: 콘텐츠 업데이트 - 기존 문서 개선
@@ -85,17 +141,25 @@ class MCPEducationRunner:
             # 5단계: 새 문서 작성 - 누락된 주제 추가
             if not self.dry_run and self.state['todo']:
                 print("\n📝 5단계: 새로운 문서 작성...")
-                self.state = await writer(self.state)
+                self.state = await _load_stage("writer_agent", "writer")(self.state)
                 print(f"   작성된 문서: {len(self.state['todo'])}개")
             
-            # 6단계: 품질 보증 - 전체 문서 검증
-            print("\n✅ 6단계: 품질 보증 검사...")
-            self.state = await qa(self.state)
+            # 6단계: 링크 검증 - 문서의 모든 URL을 한 번씩만 확인 (QA는 이 결과로 깨진 참조를 표시)
+            if self.check_links:
+                print("\n🔗 6단계: 링크 검증...")
+                self.state = await _load_stage("link_agent", "link_validation")(self.state)
+                stats = self.state['link_stats']
+                print(f"   URL {stats['links']}개 중 요청 {stats['checked'] - stats.get('cached', 0)}개, "
+                      f"캐시 {stats.get('cached', 0)}개, 깨진 링크 {len(self.state['broken_links'])}개")
+            
+            # 7단계: 품질 보증 - 전체 문서 검증
+            print("\n✅ 7단계: 품질 보증 검사...")
+            self.state = await _load_stage("qa_agent", "qa")(self.state)
             
-            # 7단계: 빌드 & 배포 (Git 커밋)
+            # 8단계: 빌드 & 배포 (Git 커밋)
             if not self.dry_run and self.state.get('updates'):
-                print("\n🏗️ 7단계: GitHub Pages 빌드 & 배포...")
-                self.state = await builder(self.state)
+                print("\n🏗️ 8단계: GitHub Pages 빌드 & 배포...")
+                self.state = await _load_stage("builder_agent", "builder")(self.state)
             
             # 최종 리포트 생성
             return self._generate_final_report()
@@ -107,28 +171,38 @@ class MCPEducationRunner:
     
     async def _research_latest_info(self):
         """최신 MCP 정보 웹 리서치"""
+        from single_flight import web_search
+        
         research_queries = [
             "Model Context Protocol latest updates 2025",
             "MCP server client tutorial examples",
             "Anthropic MCP documentation guide"
         ]
         
-        research_results = []
-        for query in research_queries:
+        async def search(query):
             try:
                 result = await web_search(query)
-                research_results.extend(result[:3])  # 상위 3개 결과만
+                return result[:3]  # 상위 3개 결과만
             except Exception as e:
                 print(f"   ⚠️ 리서치 실패: {query} - {str(e)}")
+                return []
+        
+        # 쿼리는 동시에 실행하고, 같은 쿼리가 동시에 들어오면 한 번만 검색
+        research_results = []
+        for results in await asyncio.gather(*(search(query) for query in research_queries)):
+            research_results.extend(results)
         
         self.state['research_results'] = research_results
         print(f"   수집된 리서치 결과: {len(research_results)}개")
     
-    async def _update_existing_docs(self, target_file: str = None):
+    async def _update_existing_docs(self, target_file: str = None, files: List[str] = None):
         """기존 문서 업데이트"""
         files_to_update = []
         
-        if target_file:
+        if files is not None:
+            # watch 모드: 변경된 파일만 업데이트
+            files_to_update = files
+        elif target_file:
             # 특정 파일만 업데이트
             if Path(target_file).exists():
                 files_to_update = [target_file]
@@ -136,25 +210,25 @@ class MCPEducationRunner:
                 print(f"   ⚠️ 대상 파일을 찾을 수 없음: {target_file}")
                 return
         else:
-            # 모든 마크다운 파일 업데이트
-            files_to_update = self.state['existing_docs']
+            # 모든 마크다운 파일 업데이트 (유사 중복 문서는 클러스터 대표만 처리하고 나머지는 리포트에 남김)
+            duplicate_of = self.state['duplicate_of']
+            files_to_update = [p for p in self.state['existing_docs'] if p not in duplicate_of]
+            if duplicate_of:
+                print(f"   ⏭️ 유사 중복 문서 {len(duplicate_of)}개 건너뜀 (클러스터 {len(self.state['near_duplicates'])}개)")
         
         for file_path in files_to_update:
             try:
                 # 파일 읽기
-                content = await read_file(file_path)
+                content = await asyncio.to_thread(Path(file_path).read_text, encoding="utf-8")
                 
                 # 메타데이터 추출
-                metadata = extract_metadata(file_path)
+                metadata = metadata_from_content(file_path, content)
                 
                 # 지식 갭 확인
-                knowledge_gaps = detect_knowledge_gaps(content, "MCP")
+                knowledge_gaps = find_knowledge_gaps(content, "MCP")
                 
                 # 신선도 및 정확성 체크
-                freshness_check = check_freshness_and_accuracy(
-                    content, 
-                    self.state.get('research_results', [])
-                )
+                freshness_check = freshness_verdict(content)
                 
                 # 업데이트 필요 여부 판단
                 needs_update = (
@@ -169,7 +243,8 @@ class MCPEducationRunner:
                         updated_content = await self._enhance_content(
                             file_path, content, knowledge_gaps
                         )
-                        await write_file(file_path, updated_content, overwrite=True)
+                        await _write_file(file_path, updated_content)
+                        self.state['changed_files'].append(file_path)
                         
                     self.state['updates'].append({
                         'file': file_path,
@@ -186,17 +261,20 @@ class MCPEducationRunner:
     
     async def _enhance_content(self, file_path: str, content: str, gaps: List[str]) -> str:
         """콘텐츠 개선 로직"""
-        enhanced = content
+        # 섹션 트리로 한 번만 파싱하고, 수정은 해당 섹션에만 적용
+        document = parse_markdown(content)
         
         # 날짜 업데이트
         today = datetime.now().strftime("%Y-%m-%d")
-        if "Last updated:" in enhanced:
-            enhanced = enhanced.replace(
-                enhanced[enhanced.find("Last updated:"):enhanced.find("\n", enhanced.find("Last updated:"))],
-                f"Last updated: {today}"
-            )
+        for index, section in enumerate(document.sections):
+            start = section.text.find("Last updated:")
+            if start >= 0:
+                end = section.text.find("\n", start)
+                end = len(section.text) if end < 0 else end
+                document.replace(index, section.text[:start] + f"Last updated: {today}" + section.text[end:])
+                break
         else:
-            enhanced += f"\n\n---\n\nLast updated: {today}\n"
+            document.append(f"\n\n---\n\nLast updated: {today}\n")
         
         # 누락된 섹션 추가
         if gaps and "implementation example" in gaps:
@@ -220,9 +298,99 @@ if __name__ == "__main__":
     MyMCPServer().run()
 ```
 """
-            enhanced = enhanced.replace("## ", example_section + "\n## ", 1)
+            # 첫 번째 "## " 섹션 앞에 삽입 (없으면 문서 끝에 추가)
+            first_section = document.find_level(2)
+            if first_section >= 0:
+                document.insert(first_section, example_section + "\n")
+            else:
+                document.append(example_section)
+        
+        return document.render()
+    
+    async def watch(self, debounce: float = WATCH_DEBOUNCE, max_batch: int = WATCH_MAX_BATCH):
+        """docs/ 변경을 구독하며, 변경된 파일 묶음에 대해서만 업데이트와 QA를 반복 실행"""
+        print("👀 docs/ 변경 감시 시작 (종료: Ctrl+C)")
+        queue: asyncio.Queue = asyncio.Queue()
+        # 파이프라인이 직접 쓴 파일의 해시: 자기 자신의 쓰기로 다시 트리거되지 않도록 함
+        own_writes: Dict[str, str] = {}
+        
+        async def pump():
+            async for changed in _docs_changes(DOCS_DIR, WATCH_POLL_INTERVAL):
+                for path in changed:
+                    queue.put_nowait(path)
+        
+        pump_task = asyncio.create_task(pump())
+        
+        async def next_change(timeout: Optional[float] = None) -> Optional[str]:
+            # 큐와 감시 task를 함께 기다림: 감시 task가 죽으면 큐를 영원히 기다리지 않고 그 예외를 올림
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, pump_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                return getter.result()
+            getter.cancel()
+            if pump_task in done:
+                pump_task.result()
+                raise RuntimeError("docs/ 변경 감시가 예기치 않게 끝났습니다")
+            return None
+        
+        try:
+            while True:
+                batch = {await next_change()}
+                # 변경이 debounce초 동안 멈추거나 배치가 가득 찰 때까지 모음
+                while len(batch) < max_batch:
+                    path = await next_change(debounce)
+                    if path is None:
+                        break
+                    batch.add(path)
+                await self._process_batch(batch, own_writes)
+        finally:
+            pump_task.cancel()
+    
+    async def _process_batch(self, batch: Set[str], own_writes: Dict[str, str]):
+        """변경된 파일 묶음에 영향을 받는 단계(업데이트, QA)만 실행"""
+        deleted = sorted(p for p in batch if not Path(p).exists())
+        changed = sorted(
+            p for p in batch
+            if p not in deleted and own_writes.get(p) != _file_digest(p)
+        )
+        for path in deleted:
+            own_writes.pop(path, None)
+        if not changed and not deleted:
+            return
+        
+        # 유사 중복 인덱스를 먼저 갱신: 바뀐 파일은 다시 서명하고 삭제된 파일은 인덱스에서 제거
+        self._refresh_duplicates(changed + deleted)
+        duplicate_of = self.state['duplicate_of']
+        files = [p for p in changed if p not in duplicate_of]
         
-        return enhanced
+        print(f"\n🔄 변경 감지: {len(changed)}개 파일, 삭제 {len(deleted)}개")
+        if len(files) < len(changed):
+            print(f"   ⏭️ 유사 중복 문서 {len(changed) - len(files)}개 건너뜀")
+        if not files:
+            return
+        
+        self.state.update(updates=[], changed_files=list(files), errors=[])
+        await self._update_existing_docs(files=files)
+        self.state = await _load_stage("qa_agent", "qa")(self.state)
+        
+        for path in files:
+            if Path(path).exists():
+                own_writes[path] = _file_digest(path)
+        
+        # 파이프라인이 다시 쓴 파일은 watch 이벤트가 무시되므로 여기서 다시 서명 (내용이 같으면 건너뜀)
+        self._refresh_duplicates(files)
+        print(f"   업데이트 {len(self.state['updates'])}개, 오류 {len(self.state['errors'])}개")
+    
+    def _refresh_duplicates(self, paths: List[str]):
+        """유사 중복 인덱스에서 paths만 다시 서명(삭제된 파일은 제거)하고 클러스터 상태를 갱신"""
+        if self._duplicate_index is None:
+            self._duplicate_index = NearDuplicateIndex.load()
+        self._duplicate_index.update_files(paths)
+        self._duplicate_index.save()
+        self.state.update(
+            near_duplicates=self._duplicate_index.clusters(),
+            duplicate_of=self._duplicate_index.duplicates()
+        )
     
     def _generate_final_report(self) -> Dict[str, Any]:
         """최종 리포트 생성"""
@@ -230,6 +398,8 @@ if __name__ == "__main__":
         updated_docs = len([u for u in self.state['updates'] if u['status'] == 'updated'])
         needs_update = len([u for u in self.state['updates'] if u['status'] == 'needs_update'])
         new_docs = len(self.state['todo'])
+        near_duplicates = len(self.state['duplicate_of'])
+        broken_links = len(self.state['broken_links'])
         errors = len(self.state['errors'])
         
         print("\n" + "="*60)
@@ -239,6 +409,13 @@ if __name__ == "__main__":
         print(f"업데이트된 문서: {updated_docs}")
         print(f"업데이트 필요 문서: {needs_update}")
         print(f"새로 생성된 문서: {new_docs}")
+        print(f"유사 중복 문서: {near_duplicates} (클러스터 {len(self.state['near_duplicates'])}개)")
+        for cluster in self.state['near_duplicates'][:10]:
+            more = f" 외 {len(cluster) - 4}개" if len(cluster) > 4 else ""
+            print(f"   - {cluster[0]} ≈ {', '.join(cluster[1:4])}{more}")
+        print(f"깨진 링크: {broken_links}")
+        for link in self.state['broken_links'][:10]:
+            print(f"   - {link['url']} ({link['status'] or link['error']}) ← {', '.join(link['pages'][:3])}")
         print(f"오류 발생: {errors}")
         print(f"실행 시간: {self.state['timestamp']}")
         print("="*60)
@@ -250,11 +427,15 @@ if __name__ == "__main__":
                 "updated": updated_docs,
                 "needs_update": needs_update,
                 "new_docs": new_docs,
+                "near_duplicates": near_duplicates,
+                "broken_links": broken_links,
                 "errors": errors
             },
             "details": {
                 "updates": self.state['updates'],
                 "todos": self.state['todo'],
+                "near_duplicates": self.state['near_duplicates'],
+                "broken_links": self.state['broken_links'],
                 "errors": self.state['errors']
             },
             "timestamp": self.state['timestamp']
@@ -276,11 +457,24 @@ async def main():
         type=str,
         help="특정 파일만 업데이트 (예: docs/mcp-concept.md)"
     )
+    parser.add_argument(
+        "--skip-links",
+        action="store_true",
+        help="링크 검증 단계를 건너뜀 (오프라인 실행 등)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="docs/ 변경을 감시하며 변경된 파일만 계속 처리"
+    )
     
     args = parser.parse_args()
     
     # Runner 실행
-    runner = MCPEducationRunner(dry_run=args.dry_run)
+    runner = MCPEducationRunner(dry_run=args.dry_run, check_links=not args.skip_links)
+    if args.watch:
+        await runner.watch()
+        return {"status": "success"}
     result = await runner.run_pipeline(target_file=args.target)
     
     # 결과 반환
@@ -289,7 +483,11 @@ async def main():
 
 if __name__ == "__main__":
     # 이벤트 루프 실행
-    result = asyncio.run(main())
+    try:
+        result = asyncio.run(main())
+    except KeyboardInterrupt:
+        # watch 모드 종료
+        result = {"status": "success"}
     
     # 종료 코드 설정
     exit(0 if result['status'] == 'success' else 1)
\ No newline at end of file
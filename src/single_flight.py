@@ -0,0 +1,139 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+The first caller for a key starts the work; everyone who asks for the same key
+while it is in flight awaits the same task and gets the same result or exception.
+Nothing is cached once the call finishes. A waiter that is cancelled only stops
+waiting; the shared call is cancelled when its last waiter goes away. Cancelling
+only stops the awaiting coroutine: work handed to a thread (asyncio.to_thread)
+keeps running until it returns, and its result is discarded.
+"""
+
+import asyncio
+import dataclasses
+import functools
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence
+
+
+def make_key(name: str, *args, **kwargs) -> Hashable:
+    """Key for a call; falls back to canonical JSON for unhashable arguments."""
+    try:
+        key = (name, args, tuple(sorted(kwargs.items())))
+        hash(key)
+        return key
+    except TypeError:
+        return (name, json.dumps([args, kwargs], sort_keys=True, default=str))
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(func(*args, **kwargs)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(functools.partial(self._forget, key, flight))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # shield: cancelling one waiter must not cancel the call the others are awaiting
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Later callers for this key start a fresh call instead of joining a cancelled one
+                self._forget(key, flight, None)
+                flight.task.cancel()
+
+    def _forget(self, key: Hashable, flight: _Flight, task: asyncio.Task = None):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if task is not None and not task.cancelled():
+            task.exception()  # retrieved here so an unawaited failure is not logged as lost
+
+    def wrap(self, func: Callable[..., Awaitable[Any]], name: str = None) -> Callable[..., Awaitable[Any]]:
+        """Coalescing version of an async function, keyed by its arguments."""
+        name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        async def coalesced(*args, **kwargs):
+            return await self.do(make_key(name, *args, **kwargs), func, *args, **kwargs)
+
+        return coalesced
+
+    def stats(self) -> Dict[str, int]:
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": self.in_flight()}
+
+
+# Shared by web search, completions and tool calls in this process
+flights = SingleFlight()
+
+
+async def web_search(query: str) -> Any:
+    """Hosted web search; identical concurrent queries reach the provider once."""
+    from tools import web_search as search
+    return await flights.do(make_key("web_search", query), search, query)
+
+
+def is_deterministic(request: Dict[str, Any]) -> bool:
+    """True for completion requests with one answer per prompt: temperature 0 and a single choice."""
+    return request.get("temperature") == 0 and request.get("n") in (None, 1)
+
+
+async def completion(coalesce: Optional[bool] = None, **kwargs) -> Any:
+    """
+    litellm completion under the adaptive rate limit. Identical concurrent requests are
+    sent once only when they are deterministic (see is_deterministic); sampled requests
+    are independent draws and each gets its own call. `coalesce` overrides the check.
+    """
+    from rate_limits import limiter
+    if coalesce is None:
+        coalesce = is_deterministic(kwargs)
+    if not coalesce:
+        return await limiter.acompletion(**kwargs)
+    return await flights.do(make_key("completion", **kwargs), limiter.acompletion, **kwargs)
+
+
+async def embedding(**kwargs) -> Any:
+    """litellm embedding; identical concurrent inputs are embedded once."""
+    import litellm
+    return await flights.do(make_key("embedding", **kwargs), litellm.aembedding, **kwargs)
+
+
+def coalesce_tools(tools: Sequence[Any]) -> List[Any]:
+    """
+    Make function tools coalesce identical concurrent invocations (same tool, same
+    arguments). Non-function tools are returned unchanged.
+    """
+    from agents import FunctionTool
+
+    def coalesced(tool: FunctionTool) -> FunctionTool:
+        invoke = tool.on_invoke_tool
+
+        async def on_invoke_tool(ctx, input_json: str):
+            return await flights.do(("tool", tool.name, input_json), invoke, ctx, input_json)
+
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+    return [coalesced(t) if isinstance(t, FunctionTool) else t for t in tools]
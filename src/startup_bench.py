@@ -0,0 +1,88 @@
+"""
+Startup benchmark for single-file checks.
+
+Runs `runner.py --dry-run --target <file>` under `python -X importtime` and reports
+wall time, total import time and the slowest imports. `--full-stack` measures the same
+check after building every function tool of tools and teach_mcp_agent up front
+(tool_registry, the Agents SDK and link_checks), i.e. the cost the lazy loading
+avoids. The agent stages and hosted tools are not part of it: they import `Agent`
+and `agents.hosted` from src/agents/, which cannot be loaded in the same process
+as the SDK of the same name.
+
+    python startup_bench.py --target ../docs/index.md --runs 5
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC_DIR = Path(__file__).parent
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+FULL_STACK_IMPORTS = (
+    # The Agents SDK has to resolve as `agents` ahead of src/agents/
+    "import sys; sys.path.append(sys.path.pop(0))\n"
+    "import tool_registry; tool_registry.register_all()\n"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every top-level import in -X importtime output."""
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        # Nested imports are already included in their parent's cumulative time
+        if match and len(match.group(3)) == 1:
+            imports.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return imports
+
+
+def measure(target: str, full_stack: bool) -> Tuple[float, Dict[str, int]]:
+    """Run one check; returns (wall seconds, cumulative us per top-level import)."""
+    if full_stack:
+        code = FULL_STACK_IMPORTS + f"import sys, asyncio, runner; sys.argv = ['runner.py', '--dry-run', '--target', {target!r}]; asyncio.run(runner.main())"
+        command = [sys.executable, "-X", "importtime", "-c", code]
+    else:
+        command = [sys.executable, "-X", "importtime", "runner.py", "--dry-run", "--target", target]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=SRC_DIR, env=os.environ, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return wall, {module: cumulative for module, _, cumulative in parse_importtime(result.stderr)}
+
+
+def report(label: str, target: str, runs: int, top: int, full_stack: bool):
+    walls, totals, samples = [], [], []
+    for _ in range(runs):
+        wall, imports = measure(target, full_stack)
+        walls.append(wall)
+        totals.append(sum(imports.values()))
+        samples.append(imports)
+    print(f"{label}: wall median {statistics.median(walls) * 1000:.1f} ms, "
+          f"imports median {statistics.median(totals) / 1000:.1f} ms")
+    modules = {module for imports in samples for module in imports}
+    slowest = sorted(
+        ((statistics.median(imports.get(module, 0) for imports in samples), module) for module in modules),
+        reverse=True
+    )[:top]
+    for cumulative, module in slowest:
+        print(f"    {cumulative / 1000:8.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure startup time of a single-file dry-run check")
+    parser.add_argument("--target", default="../docs/index.md")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to show")
+    parser.add_argument("--full-stack", action="store_true", help="Also measure with every agent and tool imported eagerly")
+    args = parser.parse_args()
+
+    report("lazy (default)", args.target, args.runs, args.top, full_stack=False)
+    if args.full_stack:
+        report("full stack", args.target, args.runs, args.top, full_stack=True)
@@ -3,22 +3,34 @@ Multi-agent system for reviewing and updating MCP educational materials.
 """
 
 import os
+import asyncio
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-# Import agent and tool infrastructure
-from agent import Agent, function_tool
-from tools import web_search, list_files, read_file, write_file, check_freshness_and_accuracy
-from agents.code_example_agent import code_example_agent, generate_complete_mcp_example
+# Lightweight helpers only; the agent SDK, hosted tools and agents are imported on first use
+from asset_store import example_store
+from markdown_sections import parse_markdown
 
 # Constants
 DOCS_DIR = Path("docs")
+DEFAULT_WORKERS = int(os.getenv("DOC_WORKERS", 4))
+# Per-stage concurrency limits for the review_and_update_docs worker pool
+STAGE_LIMITS = {"research": 2, "review": 4, "update": 2, "qa": 4}
+# Link pages to shared snippet files instead of embedding the generated example code
+LINK_CODE_SNIPPETS = os.getenv("LINK_CODE_SNIPPETS", "0") == "1"
 MCP_KEYWORDS = ["Model Context Protocol", "MCP", "function calling", "tool usage", "AI context"]
 CURRENT_YEAR = datetime.now().year
+QUALITY_FIELDS = ("clarity_score", "comprehensiveness_score", "engagement_score", "accuracy_score", "suggestions")
+# Provider/model whose adaptive rate limit (see rate_limits.py) gates the agent calls of bulk runs
+AGENT_MODEL = os.getenv("OPENAI_MODEL", "openai/gpt-3.5-turbo")
+# The batch scorer only starts a process pool for this much text (and more than one CPU): scoring
+# runs at ~100 MB/s inline, so smaller batches spend more on pool startup and pickling than they save
+BATCH_POOL_MIN_CHARS = 16_000_000
 
 # 1. Enhanced tools for specialized tasks
+# Plain functions; they are wrapped as function tools when the agents are built.
 
-@function_tool
 def analyze_content_freshness(content: str, topic: str) -> dict:
     """
     Analyzes content for freshness and relevance to the given topic.
@@ -60,72 +72,81 @@ def analyze_content_freshness(content: str, topic: str) -> dict:
     
     return analysis
 
-@function_tool
-def generate_educational_content(topic: str, current_content: str, web_research_results: list) -> dict:
+# Precompiled templates for generate_educational_content
+INTRO_TEMPLATE = "# {topic}\n\nThis guide provides up-to-date information about {topic}, including concepts, examples, and best practices.\n\n"
+CONCEPTS_TEMPLATE = "## Key Concepts\n\n- {items}\n\n"
+EXAMPLES_TEMPLATE = "## Examples\n\n- {items}\n\n"
+PRACTICES_TEMPLATE = "## Best Practices\n\n1. {items}\n\n"
+QUIZ_SECTION = (
+    "## Check Your Understanding\n\n"
+    "1. What is the primary purpose of MCP?\n"
+    "2. How does MCP differ from traditional function calling?\n"
+    "3. What are the main components of an MCP implementation?\n\n"
+)
+RESOURCES_SECTION = (
+    "## Additional Resources\n\n"
+    "- [MCP Official Documentation](https://modelcontextprotocol.io/introduction)\n"
+    "- [MCP GitHub Repository](https://github.com/modelcontextprotocol)\n\n"
+)
+CONCLUSION_TEMPLATE = "---\n\nLast updated: {date}\n\n"
+
+@lru_cache(maxsize=128)
+def classify_research(web_research_results: tuple) -> tuple:
     """
-    Generates educational content based on topic, existing content, and web research.
-    Returns structured educational material with multiple components.
+    Classify a research batch into (key_points, latest_developments, examples).
+    Each result is lowercased once; the classification is memoized per batch.
     """
-    # This would be implemented with an actual LLM call in production
-    # Here we're creating a simplified placeholder
-    
-    # Extract key information from web research
     key_points = []
     latest_developments = []
     examples = []
     
     for result in web_research_results:
-        if "latest" in result.lower() or "new" in result.lower():
+        lowered = result.lower()
+        if "latest" in lowered or "new" in lowered:
             latest_developments.append(result)
-        if "example" in result.lower():
+        if "example" in lowered:
             examples.append(result)
-        if any(keyword in result.lower() for keyword in ["important", "key", "essential"]):
+        if any(keyword in lowered for keyword in ["important", "key", "essential"]):
             key_points.append(result)
     
-    # Create the educational content components
-    intro = f"# {topic}\n\nThis guide provides up-to-date information about {topic}, including concepts, examples, and best practices.\n\n"
-    
-    concepts_section = "## Key Concepts\n\n"
-    concepts_section += "- " + "\n- ".join(key_points[:3] if key_points else ["[Placeholder for key concept]"])
-    concepts_section += "\n\n"
-    
-    examples_section = "## Examples\n\n"
-    examples_section += "- " + "\n- ".join(examples[:2] if examples else ["[Placeholder for example]"])
-    examples_section += "\n\n"
-    
-    practice_section = "## Best Practices\n\n"
-    practice_section += "1. " + "\n2. ".join(latest_developments[:3] if latest_developments else ["[Placeholder for best practice]"])
-    practice_section += "\n\n"
-    
-    quiz_section = "## Check Your Understanding\n\n"
-    quiz_section += "1. What is the primary purpose of MCP?\n"
-    quiz_section += "2. How does MCP differ from traditional function calling?\n"
-    quiz_section += "3. What are the main components of an MCP implementation?\n\n"
-    
-    resources_section = "## Additional Resources\n\n"
-    resources_section += "- [MCP Official Documentation](https://modelcontextprotocol.io/introduction)\n"
-    resources_section += "- [MCP GitHub Repository](https://github.com/modelcontextprotocol)\n\n"
+    return tuple(key_points), tuple(latest_developments), tuple(examples)
+
+@lru_cache(maxsize=128)
+def _render_research_sections(web_research_results: tuple) -> tuple:
+    """Render the research-dependent sections once per research batch."""
+    key_points, latest_developments, examples = classify_research(web_research_results)
+    concepts_section = CONCEPTS_TEMPLATE.format(items="\n- ".join(key_points[:3] or ["[Placeholder for key concept]"]))
+    examples_section = EXAMPLES_TEMPLATE.format(items="\n- ".join(examples[:2] or ["[Placeholder for example]"]))
+    practice_section = PRACTICES_TEMPLATE.format(items="\n2. ".join(latest_developments[:3] or ["[Placeholder for best practice]"]))
+    return concepts_section, examples_section, practice_section
+
+def generate_educational_content(topic: str, current_content: str, web_research_results: list) -> dict:
+    """
+    Generates educational content based on topic, existing content, and web research.
+    Returns structured educational material with multiple components.
+    """
+    # This would be implemented with an actual LLM call in production
+    # Here we're creating a simplified placeholder
     
-    conclusion = f"---\n\nLast updated: {datetime.now().strftime('%Y-%m-%d')}\n\n"
+    # Research-dependent sections are shared by every topic using the same research batch
+    concepts_section, examples_section, practice_section = _render_research_sections(tuple(web_research_results))
     
-    # Combine all sections
-    full_content = intro + concepts_section + examples_section + practice_section + quiz_section + resources_section + conclusion
+    components = {
+        "intro": INTRO_TEMPLATE.format(topic=topic),
+        "concepts": concepts_section,
+        "examples": examples_section,
+        "practices": practice_section,
+        "quiz": QUIZ_SECTION,
+        "resources": RESOURCES_SECTION,
+        "conclusion": CONCLUSION_TEMPLATE.format(date=datetime.now().strftime('%Y-%m-%d'))
+    }
     
     # Also provide structured components for targeted updates
     return {
-        "full_content": full_content,
-        "components": {
-            "intro": intro,
-            "concepts": concepts_section,
-            "examples": examples_section,
-            "practices": practice_section,
-            "quiz": quiz_section,
-            "resources": resources_section,
-            "conclusion": conclusion
-        }
+        "full_content": "".join(components.values()),
+        "components": components
     }
 
-@function_tool
 def evaluate_educational_quality(content: str) -> dict:
     """
     Evaluates the quality of educational content using pedagogical principles.
@@ -174,125 +195,227 @@ def evaluate_educational_quality(content: str) -> dict:
     
     return evaluation
 
-@function_tool
-def insert_code_examples(content: str, topic: str) -> str:
+def evaluate_educational_quality_batch(contents: list, max_workers: int = None) -> dict:
+    """
+    Score many documents, across a process pool when the batch is large enough to pay for it.
+    Returns a columnar result: one list per evaluation field, aligned with `contents`.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers < 2 or sum(map(len, contents)) < BATCH_POOL_MIN_CHARS:
+        evaluations = [evaluate_educational_quality(content) for content in contents]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunksize = max(1, len(contents) // (workers * 4))
+            evaluations = list(pool.map(evaluate_educational_quality, contents, chunksize=chunksize))
+    
+    columns = {field: [] for field in QUALITY_FIELDS}
+    for evaluation in evaluations:
+        for field in QUALITY_FIELDS:
+            columns[field].append(evaluation[field])
+    return columns
+
+def insert_code_examples(content: str, topic: str, link_snippets: bool = False, page_path: str = "") -> str:
     """
     Insert appropriate code examples into educational content based on the topic.
+    With link_snippets, the page links to the shared snippet files instead of embedding the code.
     """
     # Check if the content already has code examples
     if "```python" in content or "```typescript" in content:
         return content  # Already has code examples
     
-    # Generate a complete MCP example
-    example = generate_complete_mcp_example()
+    from agents.code_example_agent import generate_complete_mcp_example
     
-    # Find the right place to insert examples (after the Examples section)
-    if "## Examples" in content:
-        parts = content.split("## Examples", 1)
-        examples_section = parts[1].split("##", 1)
-        
-        # Create the code example content
-        code_content = "\n\n### Complete MCP Example\n\n"
-        code_content += example["explanation"] + "\n\n"
+    # Generate a complete MCP example (once per generator version; the example does not depend on the topic)
+    example = example_store.get_example(generate_complete_mcp_example)
+    # In link mode the page holds snippet links instead of code fences
+    if any(path.name in content for path in example["snippets"].values()):
+        return content  # Already links the example
+    
+    # Create the code example content
+    code_content = "\n\n### Complete MCP Example\n\n"
+    code_content += example["explanation"] + "\n\n"
+    if link_snippets:
+        server_link = example_store.link(example["snippets"]["server_code"], page_path)
+        client_link = example_store.link(example["snippets"]["client_code"], page_path)
+        code_content += f"#### Server Code (Python)\n\n[server.py]({server_link})\n\n"
+        code_content += f"#### Client Code (Python)\n\n[client.py]({client_link})\n\n"
+    else:
         code_content += "#### Server Code (Python)\n\n```python\n" + example["server_code"] + "\n```\n\n"
         code_content += "#### Client Code (Python)\n\n```python\n" + example["client_code"] + "\n```\n\n"
-        
-        # Insert the code examples
-        updated_content = parts[0] + "## Examples" + examples_section[0] + code_content + "##" + examples_section[1]
-        return updated_content
     
-    # If no Examples section, add one
-    return content + "\n\n## Code Examples\n\n" + "### Complete MCP Example\n\n" + example["explanation"] + "\n\n" + "#### Server Code (Python)\n\n```python\n" + example["server_code"] + "\n```\n\n" + "#### Client Code (Python)\n\n```python\n" + example["client_code"] + "\n```\n\n"
+    # Find the right place to insert examples (at the end of the Examples section)
+    document = parse_markdown(content)
+    examples_index = document.find("Examples", level=2)
+    if examples_index >= 0:
+        document.insert(document.section_end(examples_index), code_content)
+    else:
+        # If no Examples section, add one
+        document.append("\n\n## Code Examples" + code_content)
+    return document.render()
+
+# Plain functions the agents below expose as function tools (prebuilt by `tool_registry.py --build`)
+FUNCTION_TOOLS = {
+    func.__name__: func
+    for func in (analyze_content_freshness, generate_educational_content, insert_code_examples, evaluate_educational_quality)
+}
 
 # 2. Specialized agents for educational content management
+# Agents are built on first use (see get_agent) so importing this module stays cheap.
 
 # Web Research Agent
-web_research_agent = Agent(
-    name="WebResearchAgent",
-    instructions="""
-    Research the latest information about MCP (Model Context Protocol).
-    Search for up-to-date documentation, examples, best practices, and recent developments.
-    Focus on official sources like modelcontextprotocol.io and trusted tech blogs.
-    Summarize findings with key points, examples, and recent updates.
-    """,
-    tools=[web_search]
-)
+def _build_web_research_agent():
+    from agent import Agent
+    from tools import web_search
+    
+    return Agent(
+        name="WebResearchAgent",
+        instructions="""
+        Research the latest information about MCP (Model Context Protocol).
+        Search for up-to-date documentation, examples, best practices, and recent developments.
+        Focus on official sources like modelcontextprotocol.io and trusted tech blogs.
+        Summarize findings with key points, examples, and recent updates.
+        """,
+        tools=[web_search]
+    )
 
 # Content Review Agent
-content_review_agent = Agent(
-    name="ContentReviewAgent",
-    instructions="""
-    Review MCP educational materials for accuracy, freshness, and quality.
-    Identify outdated information, gaps in coverage, and areas for improvement.
-    Analyze each document for technical accuracy and educational effectiveness.
-    Provide specific recommendations for updates and enhancements.
-    """,
-    tools=[read_file, list_files, analyze_content_freshness, check_freshness_and_accuracy]
-)
+def _build_content_review_agent():
+    from agent import Agent
+    from tools import read_file, list_files, check_freshness_and_accuracy
+    from tool_registry import function_tool
+    
+    return Agent(
+        name="ContentReviewAgent",
+        instructions="""
+        Review MCP educational materials for accuracy, freshness, and quality.
+        Identify outdated information, gaps in coverage, and areas for improvement.
+        Analyze each document for technical accuracy and educational effectiveness.
+        Provide specific recommendations for updates and enhancements.
+        """,
+        tools=[read_file, list_files, function_tool(analyze_content_freshness), check_freshness_and_accuracy]
+    )
 
 # Content Update Agent
-content_update_agent = Agent(
-    name="ContentUpdateAgent",
-    instructions="""
-    Update MCP educational materials based on review findings and web research.
-    Generate new content for identified gaps and outdated sections.
-    Maintain consistent style and formatting across all documents.
-    Ensure all content is accurate, up-to-date, and pedagogically sound.
-    """,
-    tools=[read_file, write_file, generate_educational_content, insert_code_examples]
-)
+def _build_content_update_agent():
+    from agent import Agent
+    from tools import read_file, write_file
+    from tool_registry import function_tool
+    
+    return Agent(
+        name="ContentUpdateAgent",
+        instructions="""
+        Update MCP educational materials based on review findings and web research.
+        Generate new content for identified gaps and outdated sections.
+        Maintain consistent style and formatting across all documents.
+        Ensure all content is accurate, up-to-date, and pedagogically sound.
+        """,
+        tools=[read_file, write_file, function_tool(generate_educational_content), function_tool(insert_code_examples)]
+    )
 
 # Quality Assurance Agent
-quality_assurance_agent = Agent(
-    name="QualityAssuranceAgent",
-    instructions="""
-    Evaluate the quality of MCP educational materials.
-    Assess clarity, comprehensiveness, engagement, and accuracy.
-    Ensure consistent terminology and formatting.
-    Provide improvement recommendations for enhanced learning outcomes.
-    """,
-    tools=[read_file, evaluate_educational_quality]
-)
+def _build_quality_assurance_agent():
+    from agent import Agent
+    from tools import read_file
+    from tool_registry import function_tool
+    
+    return Agent(
+        name="QualityAssuranceAgent",
+        instructions="""
+        Evaluate the quality of MCP educational materials.
+        Assess clarity, comprehensiveness, engagement, and accuracy.
+        Ensure consistent terminology and formatting.
+        Provide improvement recommendations for enhanced learning outcomes.
+        """,
+        tools=[read_file, function_tool(evaluate_educational_quality)]
+    )
 
 # Orchestrator Agent
-orchestrator_agent = Agent(
-    name="OrchestratorAgent",
-    instructions="""
-    Coordinate the review and update process for MCP educational materials.
-    Manage the workflow from content review to final quality assurance.
-    Ensure all materials are thoroughly reviewed and updated.
-    Prioritize updates based on content freshness and importance.
-    """,
-    tools=[
-        list_files,
-        read_file,
-        write_file,
-        web_research_agent.as_tool(
-            tool_name="research_mcp",
-            tool_description="Research the latest information about MCP from the web"
-        ),
-        content_review_agent.as_tool(
-            tool_name="review_content",
-            tool_description="Review MCP educational materials for accuracy and quality"
-        ),
-        content_update_agent.as_tool(
-            tool_name="update_content",
-            tool_description="Update MCP educational materials based on review and research"
-        ),
-        quality_assurance_agent.as_tool(
-            tool_name="assess_quality",
-            tool_description="Evaluate the quality of MCP educational materials"
-        ),
-        code_example_agent.as_tool(
-            tool_name="generate_code_examples",
-            tool_description="Generate code examples for MCP concepts"
-        )
-    ]
-)
+def _build_orchestrator_agent():
+    from agent import Agent
+    from tools import list_files, read_file, write_file
+    from agents.code_example_agent import code_example_agent
+    from orchestration import DEFAULT_FAN_OUT_LIMIT, PARALLEL_TOOL_CALLS, limit_fan_out
+    from single_flight import coalesce_tools
+    from tool_registry import agent_tool
+    
+    return Agent(
+        name="OrchestratorAgent",
+        instructions="""
+        Coordinate the review and update process for MCP educational materials.
+        Manage the workflow from content review to final quality assurance.
+        Ensure all materials are thoroughly reviewed and updated.
+        Prioritize updates based on content freshness and importance.
+        Call independent sub-agents (e.g. reviewing and researching the same file) in the same turn.
+        """,
+        model_settings=PARALLEL_TOOL_CALLS,
+        tools=[
+            list_files,
+            read_file,
+            write_file,
+            # Identical sub-agent calls issued in the same turn run once
+            *limit_fan_out(coalesce_tools([
+                agent_tool(
+                    get_agent("web_research_agent"),
+                    tool_name="research_mcp",
+                    tool_description="Research the latest information about MCP from the web"
+                ),
+                agent_tool(
+                    get_agent("content_review_agent"),
+                    tool_name="review_content",
+                    tool_description="Review MCP educational materials for accuracy and quality"
+                ),
+                agent_tool(
+                    get_agent("content_update_agent"),
+                    tool_name="update_content",
+                    tool_description="Update MCP educational materials based on review and research"
+                ),
+                agent_tool(
+                    get_agent("quality_assurance_agent"),
+                    tool_name="assess_quality",
+                    tool_description="Evaluate the quality of MCP educational materials"
+                ),
+                agent_tool(
+                    code_example_agent,
+                    tool_name="generate_code_examples",
+                    tool_description="Generate code examples for MCP concepts"
+                )
+            ]), limit=int(os.getenv("FAN_OUT_LIMIT", DEFAULT_FAN_OUT_LIMIT)))
+        ]
+    )
+
+_AGENT_BUILDERS = {
+    "web_research_agent": _build_web_research_agent,
+    "content_review_agent": _build_content_review_agent,
+    "content_update_agent": _build_content_update_agent,
+    "quality_assurance_agent": _build_quality_assurance_agent,
+    "orchestrator_agent": _build_orchestrator_agent
+}
+
+@lru_cache(maxsize=None)
+def get_agent(name: str):
+    """Build one of the system's agents on first use and reuse it afterwards."""
+    return _AGENT_BUILDERS[name]()
+
+def __getattr__(name):
+    # Keeps `from teach_mcp_agent import orchestrator_agent` working without eager construction
+    if name in _AGENT_BUILDERS:
+        return get_agent(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Main workflow implementation
-async def review_and_update_docs(check_only=False, target_file=None):
-    """Main workflow to review and update educational materials."""
+async def review_and_update_docs(check_only=False, target_file=None, workers=DEFAULT_WORKERS, stage_limits=None):
+    """
+    Main workflow to review and update educational materials.
+    Files are processed by a pool of `workers`; each agent stage has its own
+    concurrency limit (see STAGE_LIMITS) and research is shared per topic.
+    All agent calls also share the adaptive rate limit of AGENT_MODEL.
+    In check-only mode the research stage is skipped entirely.
+    """
+    from tools import list_files
+    from rate_limits import limiter, model_key
+    
     # 1. Get list of markdown files to process
     if target_file:
         if os.path.exists(target_file) and target_file.endswith('.md'):
@@ -304,97 +427,153 @@ async def review_and_update_docs(check_only=False, target_file=None):
     
     print(f"Found {len(md_files)} markdown files to process")
     
-    results = []
+    stages = {name: asyncio.Semaphore(limit) for name, limit in {**STAGE_LIMITS, **(stage_limits or {})}.items()}
+    research_cache = {}
+    research_waiters = {}
     
-    for file_path in md_files:
-        print(f"Processing {file_path}...")
-        
-        # 2. Read the current content
-        content = await read_file.read(file_path)
-        filename = Path(file_path).name
-        topic = filename.replace('.md', '').replace('-', ' ').title()
-        
-        # 3. Research latest information about the topic
-        print(f"Researching information about {topic}...")
-        research_results = await web_research_agent.invoke({
-            "topic": topic,
-            "query": f"latest {topic} MCP Model Context Protocol information"
-        })
-        
+    async def research(topic):
+        # Files sharing a topic await the same research task instead of repeating it
+        if topic not in research_cache:
+            async def run():
+                async with stages["research"]:
+                    print(f"Researching information about {topic}...")
+                    return await limiter.call(model_key(AGENT_MODEL), get_agent("web_research_agent").invoke, {
+                        "topic": topic,
+                        "query": f"latest {topic} MCP Model Context Protocol information"
+                    })
+            research_cache[topic] = asyncio.ensure_future(run())
+        task = research_cache[topic]
+        research_waiters[topic] = research_waiters.get(topic, 0) + 1
+        try:
+            # shield: a file that stops waiting must not cancel research other files still share
+            return await asyncio.shield(task)
+        finally:
+            research_waiters[topic] -= 1
+            if research_waiters[topic] == 0 and not task.done():
+                # Nobody needs it any more; a later file with this topic starts it again
+                del research_cache[topic]
+                task.cancel()
+    
+    # The queue only holds as many files as there are workers, so listing never
+    # runs far ahead of the slowest stage.
+    worker_count = max(1, min(workers, len(md_files)))
+    queue = asyncio.Queue(maxsize=worker_count)
+    results = [None] * len(md_files)
+    
+    async def worker():
+        while (item := await queue.get()) is not None:
+            index, file_path = item
+            results[index] = await _process_file(file_path, check_only, stages, research)
+    
+    async with asyncio.TaskGroup() as group:
+        for _ in range(worker_count):
+            group.create_task(worker())
+        for item in enumerate(md_files):
+            await queue.put(item)
+        for _ in range(worker_count):
+            await queue.put(None)
+    
+    return results
+
+async def _process_file(file_path, check_only, stages, research):
+    """Take a single file through research, review, update, code insertion and QA."""
+    from tools import read_file, write_file
+    from rate_limits import limiter, model_key
+    
+    key = model_key(AGENT_MODEL)
+    print(f"Processing {file_path}...")
+    
+    # 2. Read the current content
+    content = await read_file.read(file_path)
+    filename = Path(file_path).name
+    topic = filename.replace('.md', '').replace('-', ' ').title()
+    
+    # 3. Start researching the topic while the review runs (not needed in check-only mode)
+    research_task = None if check_only else asyncio.ensure_future(research(topic))
+    
+    try:
         # 4. Review the current content
-        print(f"Reviewing content of {file_path}...")
-        review_results = await content_review_agent.invoke({
-            "file_path": file_path,
-            "content": content,
-            "topic": topic
-        })
-        
+        async with stages["review"]:
+            print(f"Reviewing content of {file_path}...")
+            review_results = await limiter.call(key, get_agent("content_review_agent").invoke, {
+                "file_path": file_path,
+                "content": content,
+                "topic": topic
+            })
+    
         needs_update = review_results.get("needs_update", False) or review_results.get("is_outdated", False)
-        
+    
         # In check-only mode, just report findings without updating
         if check_only:
-            result = {
+            return {
                 "file_path": file_path,
                 "needs_update": needs_update,
                 "review_findings": review_results
             }
-            results.append(result)
-            continue
-        
-        # 5. Update the content if needed
-        if needs_update:
-            print(f"Updating content of {file_path}...")
-            update_results = await content_update_agent.invoke({
-                "file_path": file_path,
-                "current_content": content,
-                "topic": topic,
-                "review_findings": review_results,
-                "research_results": research_results
-            })
-            
-            # 6. Generate code examples if appropriate
-            if "mcp" in topic.lower() or "model context protocol" in topic.lower():
-                print(f"Adding code examples to {file_path}...")
-                updated_content = await insert_code_examples(update_results.get("updated_content", content), topic)
-            else:
-                updated_content = update_results.get("updated_content", content)
-            
-            # 7. Assess the quality of the updated content
-            print(f"Assessing quality of updated content for {file_path}...")
-            quality_results = await quality_assurance_agent.invoke({
-                "file_path": file_path,
-                "content": updated_content
-            })
-            
-            # 8. Write the final content if it passes quality thresholds
-            overall_score = quality_results.get("overall_score", 0)
-            if overall_score >= 0.7:
-                print(f"Writing updated content to {file_path}...")
-                await write_file.write(
-                    file_path,
-                    updated_content,
-                    overwrite=True
-                )
-                result = {
-                    "file_path": file_path,
-                    "status": "updated",
-                    "quality_score": overall_score
-                }
-            else:
-                result = {
-                    "file_path": file_path,
-                    "status": "update_failed_quality_check",
-                    "quality_score": overall_score
-                }
-        else:
-            result = {
+    
+        if not needs_update:
+            return {
                 "file_path": file_path,
                 "status": "no_update_needed"
             }
-        
-        results.append(result)
     
-    return results
+        research_results = await research_task
+    finally:
+        # Research is only awaited on the update path; stop it when the review failed or found nothing to update
+        if research_task is not None:
+            if not research_task.done():
+                research_task.cancel()
+            elif not research_task.cancelled():
+                research_task.exception()  # retrieved so an unused failure is not logged as lost
+    
+    # 5. Update the content
+    async with stages["update"]:
+        print(f"Updating content of {file_path}...")
+        update_results = await limiter.call(key, get_agent("content_update_agent").invoke, {
+            "file_path": file_path,
+            "current_content": content,
+            "topic": topic,
+            "review_findings": review_results,
+            "research_results": research_results
+        })
+    
+    # 6. Generate code examples if appropriate
+    if "mcp" in topic.lower() or "model context protocol" in topic.lower():
+        print(f"Adding code examples to {file_path}...")
+        updated_content = insert_code_examples(
+            update_results.get("updated_content", content), topic, LINK_CODE_SNIPPETS, file_path
+        )
+    else:
+        updated_content = update_results.get("updated_content", content)
+    
+    # 7. Assess the quality of the updated content
+    async with stages["qa"]:
+        print(f"Assessing quality of updated content for {file_path}...")
+        quality_results = await limiter.call(key, get_agent("quality_assurance_agent").invoke, {
+            "file_path": file_path,
+            "content": updated_content
+        })
+    
+    # 8. Write the final content if it passes quality thresholds
+    overall_score = quality_results.get("overall_score", 0)
+    if overall_score < 0.7:
+        return {
+            "file_path": file_path,
+            "status": "update_failed_quality_check",
+            "quality_score": overall_score
+        }
+    
+    print(f"Writing updated content to {file_path}...")
+    await write_file.write(
+        file_path,
+        updated_content,
+        overwrite=True
+    )
+    return {
+        "file_path": file_path,
+        "status": "updated",
+        "quality_score": overall_score
+    }
 
 # Entry point for running the multi-agent system
 async def run_mcp_education_system(check_only=False, target_file=None):
@@ -433,7 +612,5 @@ async def run_mcp_education_system(check_only=False, target_file=None):
 
 # If running as a script
 if __name__ == "__main__":
-    import asyncio
-    
     # Run the multi-agent system
     asyncio.run(run_mcp_education_system()) 
\ No newline at end of file
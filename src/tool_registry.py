@@ -0,0 +1,196 @@
+"""
+Shared registry for function tools.
+
+Each tool's JSON schema is computed once per process and shared by every agent that
+uses it. Schemas are also serialized ahead of time to tool_catalog.json
+(`python tool_registry.py --build`); on later imports a tool whose code is unchanged
+is built straight from the catalog and its pydantic argument model is only created
+on first invocation.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict
+
+if __name__ == "__main__":
+    # Run as a script, src/ is first on sys.path and its agents/ package would shadow the Agents SDK
+    sys.path.append(sys.path.pop(0))
+
+from agents import FunctionTool
+from agents import function_tool as sdk_function_tool
+
+CATALOG_PATH = Path(__file__).with_name("tool_catalog.json")
+# Set TOOL_CATALOG=0 to ignore the precomputed catalog (used by the startup benchmark)
+USE_CATALOG = os.getenv("TOOL_CATALOG", "1") != "0"
+# Modules whose FUNCTION_TOOLS are written to the catalog by --build
+TOOL_MODULES = ("tools", "teach_mcp_agent")
+
+_catalog: Dict[str, Dict[str, Any]] = None
+_tools: Dict[str, FunctionTool] = {}
+_agent_tools: Dict[tuple, FunctionTool] = {}
+
+
+def _hash_const(digest, const):
+    """
+    Feed a code constant into digest. Nested code objects (inner functions, lambdas, comprehensions)
+    are hashed by content since their repr holds a memory address, and frozensets are sorted since
+    their iteration order changes with the string hash seed.
+    """
+    if isinstance(const, CodeType):
+        digest.update(const.co_code)
+        digest.update(repr(const.co_names).encode("utf-8"))
+        for nested in const.co_consts:
+            _hash_const(digest, nested)
+    elif isinstance(const, (tuple, frozenset)):
+        digest.update(b"(" if isinstance(const, tuple) else b"{")
+        for item in (const if isinstance(const, tuple) else sorted(const, key=repr)):
+            _hash_const(digest, item)
+        digest.update(b")")
+    else:
+        digest.update(f"{type(const).__name__}:{const!r};".encode("utf-8"))
+
+
+def _fingerprint(func) -> str:
+    """
+    Hash of the function's code (including nested code objects), defaults and annotations;
+    stable across processes and changes whenever its schema could.
+    """
+    digest = hashlib.sha256()
+    _hash_const(digest, func.__code__)
+    digest.update(repr(func.__defaults__).encode("utf-8"))
+    digest.update(repr(func.__kwdefaults__).encode("utf-8"))
+    digest.update(repr(func.__annotations__).encode("utf-8"))
+    digest.update((func.__doc__ or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _load_catalog() -> Dict[str, Dict[str, Any]]:
+    global _catalog
+    if _catalog is None:
+        _catalog = {}
+        if USE_CATALOG and CATALOG_PATH.exists():
+            _catalog = json.loads(CATALOG_PATH.read_text(encoding="utf-8"))
+    return _catalog
+
+
+def _catalog_tool(func, entry: Dict[str, Any], kwargs: Dict[str, Any]) -> FunctionTool:
+    """
+    Build a FunctionTool from a catalog entry without generating its schema. The SDK tool is
+    built on first invocation and handles the call, so invalid JSON, argument validation errors
+    and tool exceptions go through the SDK's error path (failure_error_function) as usual.
+    """
+    sdk_tool = None
+
+    async def on_invoke_tool(ctx, input_json: str):
+        nonlocal sdk_tool
+        if sdk_tool is None:
+            sdk_tool = sdk_function_tool(func, **kwargs)
+        return await sdk_tool.on_invoke_tool(ctx, input_json)
+
+    return FunctionTool(
+        name=entry["name"],
+        description=entry["description"],
+        params_json_schema=entry["params_json_schema"],
+        on_invoke_tool=on_invoke_tool,
+        strict_json_schema=entry["strict_json_schema"]
+    )
+
+
+def function_tool(func=None, **kwargs):
+    """
+    Drop-in replacement for agents.function_tool that reuses schemas across agents
+    and across runs (through the catalog). Decorator options other than strict_mode
+    bypass the catalog.
+    """
+    if func is None:
+        return lambda f: function_tool(f, **kwargs)
+
+    key = f"{func.__module__}.{func.__qualname__}"
+    if key in _tools:
+        return _tools[key]
+
+    entry = _load_catalog().get(key)
+    cacheable = set(kwargs) <= {"strict_mode"}
+    if (cacheable and entry and entry["fingerprint"] == _fingerprint(func)
+            and entry["strict_json_schema"] == kwargs.get("strict_mode", True)):
+        tool = _catalog_tool(func, entry, kwargs)
+    else:
+        tool = sdk_function_tool(func, **kwargs)
+        if cacheable:
+            _catalog[key] = {
+                "fingerprint": _fingerprint(func),
+                "name": tool.name,
+                "description": tool.description,
+                "params_json_schema": tool.params_json_schema,
+                "strict_json_schema": tool.strict_json_schema
+            }
+    _tools[key] = tool
+    return tool
+
+
+def agent_tool(agent, tool_name: str, tool_description: str) -> FunctionTool:
+    """Wrap a sub-agent with `as_tool` once and share the wrapper between orchestrators."""
+    key = (agent.name, tool_name)
+    if key not in _agent_tools:
+        _agent_tools[key] = agent.as_tool(tool_name=tool_name, tool_description=tool_description)
+    return _agent_tools[key]
+
+
+def catalog_json() -> str:
+    """Serialized catalog of every tool registered in this process."""
+    return json.dumps(_load_catalog(), ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def register_all(modules=TOOL_MODULES) -> int:
+    """Register every function tool of the given modules; returns the number of tools in the registry."""
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        options = getattr(module, "TOOL_OPTIONS", {})
+        for name, func in module.FUNCTION_TOOLS.items():
+            function_tool(func, **options.get(name, {}))
+    return len(_tools)
+
+
+def _import_time(modules: list, use_catalog: bool) -> float:
+    # Same sys.path order as the script: the Agents SDK ahead of src/agents
+    code = (
+        "import sys, time; sys.path.append(sys.path.pop(0)); start = time.perf_counter()\n"
+        f"import tool_registry; tool_registry.register_all({tuple(modules)!r})\n"
+        "print(time.perf_counter() - start)"
+    )
+    env = {**os.environ, "TOOL_CATALOG": "1" if use_catalog else "0"}
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parent, env=env,
+        capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Function tool registry")
+    parser.add_argument("--build", action="store_true", help="Write tool_catalog.json for all system tools")
+    parser.add_argument("--bench", action="store_true", help="Compare startup time with and without the catalog")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.build:
+        # The system modules register their tools on the importable module, not on __main__
+        import tool_registry as registry
+        registry.USE_CATALOG = False
+        registry.register_all()
+        CATALOG_PATH.write_text(registry.catalog_json(), encoding="utf-8")
+        print(f"Wrote {len(registry._catalog)} tool schemas to {CATALOG_PATH}")
+    if args.bench:
+        for use_catalog in (False, True):
+            times = [_import_time(TOOL_MODULES, use_catalog) for _ in range(args.runs)]
+            label = "with catalog" if use_catalog else "without catalog"
+            print(f"import + tool construction {label}: median {statistics.median(times) * 1000:.1f} ms")
@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Appended rather than inserted: src/agents would otherwise shadow the Agents SDK for other test modules
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.append(str(SRC_DIR))
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from docs_mcp_server import DocsIndex
+
+DOC = "# MCP Guide\n\nThe Model Context Protocol connects tools and resources.\n\n## Example\n\n```python\nprint(1)\n```\n"
+
+
+def write_docs(root: Path):
+    docs = root / "docs"
+    docs.mkdir()
+    (docs / "guide.md").write_text(DOC, encoding="utf-8")
+    (docs / "broken.md").write_bytes(b"# \xff\xfe not utf-8\n")
+    return docs
+
+
+class DocsIndexTest(unittest.TestCase):
+    def test_summary_reports_unreadable_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            docs = write_docs(Path(directory))
+            report = DocsIndex(root=docs).summary()
+        self.assertEqual(report["total_files"], 1)
+        self.assertEqual([error["file_path"] for error in report["errors"]], [str(docs / "broken.md")])
+
+
+class DocsServerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_tools_over_stdio(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        write_docs(Path(directory.name))
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=[str(SRC_DIR / "docs_mcp_server.py")],
+            cwd=directory.name,
+            # The client only passes a default environment; the server needs the same packages
+            env={"PYTHONPATH": os.environ["PYTHONPATH"]} if "PYTHONPATH" in os.environ else None,
+        )
+
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                tools = await session.list_tools()
+                self.assertEqual(
+                    sorted(tool.name for tool in tools.tools),
+                    ["check_freshness_and_accuracy", "detect_knowledge_gaps", "extract_metadata", "generate_summary_report"],
+                )
+
+                async def call(name, **arguments):
+                    result = await session.call_tool(name, arguments)
+                    self.assertFalse(result.isError)
+                    return json.loads(result.content[0].text)
+
+                metadata = await call("extract_metadata", file_path="docs/guide.md")
+                self.assertEqual(metadata["title"], "MCP Guide")
+                self.assertEqual(await call("check_freshness_and_accuracy", file_path="docs/guide.md"), "pass")
+                self.assertIn("prompts", await call("detect_knowledge_gaps", file_path="docs/guide.md", topic="MCP"))
+                self.assertIn("error", await call("extract_metadata", file_path="../outside.md"))
+                summary = await call("generate_summary_report")
+                self.assertEqual(summary["total_files"], 1)
+                self.assertEqual(len(summary["errors"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
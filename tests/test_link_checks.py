@@ -0,0 +1,88 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Appended rather than inserted: src/agents would otherwise shadow the Agents SDK for other test modules
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from link_checks import LinkCache, LinkChecker, StubServer, extract_links
+
+
+class ExtractLinksTest(unittest.TestCase):
+    def test_keeps_balanced_parentheses(self):
+        content = "See https://en.wikipedia.org/wiki/Foo_(bar) and [Foo](https://en.wikipedia.org/wiki/Foo_(baz))."
+        self.assertEqual(extract_links(content), [
+            "https://en.wikipedia.org/wiki/Foo_(bar)",
+            "https://en.wikipedia.org/wiki/Foo_(baz)",
+        ])
+
+    def test_drops_surrounding_punctuation_fragments_and_code(self):
+        content = "([docs](https://example.org/docs#intro)), https://example.org/a.\n`https://example.org/code`"
+        self.assertEqual(extract_links(content), ["https://example.org/docs", "https://example.org/a"])
+
+
+class LinkCheckerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.stub = StubServer(latency=0.02)
+        await self.stub.start(hosts=2)
+        self.addAsyncCleanup(self.stub.close)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_path = Path(directory.name) / "link-cache.json"
+
+    def url(self, kind, key, host=0):
+        return f"http://127.0.0.1:{self.stub.ports[host]}/{kind}/{key}"
+
+    async def check(self, urls, ok_ttl=3600.0, **kwargs):
+        cache = LinkCache.load(self.cache_path, ok_ttl=ok_ttl)
+        checker = LinkChecker(cache, skip_hosts=(), **kwargs)
+        results = await checker.check_all(urls)
+        cache.save()
+        return results, checker.stats
+
+    async def test_statuses(self):
+        ok, gone, nohead, flaky = (self.url(kind, 1) for kind in ("ok", "gone", "nohead", "flaky"))
+        results, stats = await self.check([ok, gone, nohead, flaky, ok])
+
+        self.assertEqual(len(results), 4)
+        self.assertTrue(results[ok].ok)
+        self.assertEqual(results[ok].status, 200)
+        self.assertEqual(results[ok].etag, '"1"')
+        self.assertFalse(results[gone].ok)
+        self.assertTrue(results[gone].dead)
+        # HEAD is rejected with 405, so the link is confirmed with GET
+        self.assertEqual((results[nohead].ok, results[nohead].status), (True, 200))
+        self.assertEqual(stats["get"], 1)
+        # 503 with Retry-After: 0 is retried once and then succeeds
+        self.assertEqual((results[flaky].ok, results[flaky].status), (True, 200))
+        self.assertEqual(stats["retried"], 1)
+
+    async def test_expired_entries_are_revalidated_with_304(self):
+        ok = self.url("ok", 2)
+        await self.check([ok])
+        results, stats = await self.check([ok], ok_ttl=0.0)
+        self.assertTrue(results[ok].ok)
+        self.assertEqual(results[ok].status, 200)
+        self.assertFalse(results[ok].cached)
+        self.assertEqual(stats["not_modified"], 1)
+        self.assertEqual(self.stub.requests[304], 1)
+
+    async def test_fresh_entries_send_no_request(self):
+        ok = self.url("ok", 3)
+        await self.check([ok])
+        self.stub.requests.clear()
+        results, stats = await self.check([ok])
+        self.assertTrue(results[ok].cached)
+        self.assertEqual(stats["cached"], 1)
+        self.assertEqual(sum(self.stub.requests.values()), 0)
+
+    async def test_per_host_cap(self):
+        urls = [self.url("ok", key, host=key % 2) for key in range(40)]
+        results, _ = await self.check(urls, per_host=3)
+        self.assertTrue(all(result.ok for result in results.values()))
+        self.assertEqual(set(self.stub.max_in_flight.values()), {3})
+
+
+if __name__ == "__main__":
+    unittest.main()
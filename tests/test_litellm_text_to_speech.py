@@ -0,0 +1,117 @@
+import asyncio
+import io
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "litellm"))
+
+import litellm_text_to_speech as tts
+
+
+class RecordingOut(io.BytesIO):
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.first_write = threading.Event()
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.first_write.set()
+        return super().write(data)
+
+
+class SplitSentencesTest(unittest.TestCase):
+    def test_keeps_leading_digits_and_underscores(self):
+        sentences = tts.split_sentences("2024년에 snake_case 이름을 씁니다.\n버전 1.5 를 쓰세요.")
+        self.assertEqual(sentences, ["2024년에 snake_case 이름을 씁니다.", "버전 1.5 를 쓰세요."])
+
+    def test_strips_block_and_inline_marks(self):
+        markdown = "# 제목\n- 항목\n1. 순서\n> 인용\n**굵게** _기울임_ `code`"
+        self.assertEqual(tts.split_sentences(markdown), ["제목", "항목", "순서", "인용", "굵게 기울임 code"])
+
+    def test_heading_is_its_own_sentence(self):
+        self.assertEqual(tts.split_sentences("## MCP 소개\nMCP는 프로토콜입니다"), ["MCP 소개", "MCP는 프로토콜입니다"])
+
+    def test_skips_code_blocks(self):
+        self.assertEqual(tts.split_sentences("앞.\n```python\nprint(1)\n```\n뒤."), ["앞.", "뒤."])
+
+
+class StreamSpeechTest(unittest.TestCase):
+    def test_stub_stream_is_written_in_chunks(self):
+        out = RecordingOut()
+        written = tts.stream_speech("안녕하세요", out, tts.stub_speech_stream, chunk_size=8)
+        self.assertEqual(written, len(tts.STUB_AUDIO))
+        self.assertEqual(out.getvalue(), tts.STUB_AUDIO)
+        self.assertEqual(len(out.chunks), 4)
+
+    def test_chunks_are_written_before_the_response_ends(self):
+        out = RecordingOut()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(200)
+                self.send_header("Content-Type", "audio/mpeg")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for index, part in enumerate((b"first-part", b"second-part")):
+                    if index:
+                        # The rest is only sent once the client has written the first part
+                        out.first_write.wait(5)
+                        self.server.first_written_early = out.first_write.is_set()
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        previous = os.environ.get("OPENAI_BASE_URL")
+        os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+        self.addCleanup(lambda: os.environ.pop("OPENAI_BASE_URL") if previous is None
+                        else os.environ.__setitem__("OPENAI_BASE_URL", previous))
+        api_key, tts.API_KEY = tts.API_KEY, "test-key"
+        self.addCleanup(setattr, tts, "API_KEY", api_key)
+
+        # iter_bytes collects chunk_size bytes before yielding, so use chunks smaller than a part
+        written = tts.stream_speech("안녕하세요", out, chunk_size=4)
+        self.assertEqual(out.getvalue(), b"first-partsecond-part")
+        self.assertEqual(written, len(out.getvalue()))
+        self.assertTrue(server.first_written_early)
+
+
+class StreamPageTest(unittest.TestCase):
+    def test_sentences_are_written_in_order_with_bounded_concurrency(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def synthesize(model, api_key, input, voice):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            # Later sentences finish first, so ordering has to come from the writer
+            threading.Event().wait(0.005 * (10 - int(input.split()[1].rstrip("."))))
+            with lock:
+                active -= 1
+            return input.encode("utf-8") + b"|"
+
+        markdown = "\n".join(f"문장 {index}." for index in range(10))
+        out = io.BytesIO()
+        written = asyncio.run(tts.stream_page(markdown, out, concurrency=3, synthesize=synthesize))
+        expected = "".join(f"문장 {index}.|" for index in range(10)).encode("utf-8")
+        self.assertEqual(out.getvalue(), expected)
+        self.assertEqual(written, len(expected))
+        self.assertLessEqual(peak, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+EXAMPLE_DIR = Path(__file__).resolve().parent.parent / "modelcontextprotocol"
+sys.path.insert(0, str(EXAMPLE_DIR))
+
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from pydantic import AnyUrl
+
+from modelcontext_resource_range import RangeFileResource
+
+
+class RangeFileResourceTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name, "log.txt")
+
+    def test_same_size_rewrite_within_mtime_granularity_changes_the_etag(self):
+        self.path.write_text("aaaa\n", encoding="utf-8")
+        resource = RangeFileResource(str(self.path))
+        first = resource.etag()
+        st = os.stat(self.path)
+        self.path.write_text("bbbb\n", encoding="utf-8")
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))  # same (mtime, size) signature
+        self.assertNotEqual(resource.etag(), first)
+        self.assertEqual(resource.read_lines(0, 1), "bbbb\n")
+
+    def test_byte_ranges_snap_to_character_boundaries(self):
+        self.path.write_text("가나다", encoding="utf-8")
+        resource = RangeFileResource(str(self.path))
+        self.assertEqual(resource.read_text(1, 4), (3, 6, "나"))
+
+
+class RangeResourceServerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_read_ranges_and_subscribe_over_stdio(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name, "app.log")
+        path.write_text("첫 줄\n둘째 줄\n셋째 줄\n", encoding="utf-8")
+        uri = path.as_uri()
+        params = StdioServerParameters(
+            command=sys.executable,
+            args=[str(EXAMPLE_DIR / "modelcontext_resource_range.py"), directory.name],
+            # The client only passes a default environment; the server needs the same packages
+            env={"PYTHONPATH": os.environ["PYTHONPATH"]} if "PYTHONPATH" in os.environ else None,
+        )
+        updated = asyncio.Queue()
+
+        async def on_message(message):
+            if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ResourceUpdatedNotification):
+                updated.put_nowait(str(message.root.params.uri))
+
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write, message_handler=on_message) as session:
+                initialized = await session.initialize()
+                self.assertTrue(initialized.capabilities.resources.subscribe)
+                listed = await session.list_resources()
+                self.assertEqual([str(resource.uri) for resource in listed.resources], [uri])
+
+                async def text(query):
+                    result = await session.read_resource(AnyUrl(f"{uri}?{query}"))
+                    return result.contents[0].text
+
+                header, content = (await text("lines=1-2")).split("\n", 1)
+                self.assertEqual(content, "둘째 줄\n")
+                etag = header.removeprefix("etag=")
+                self.assertTrue((await text("bytes=1-7")).endswith("bytes=3-7\n 줄"))
+                self.assertEqual(await text(f"if_none_match={etag}"), f"not modified (etag={etag})")
+                with self.assertRaises(McpError):
+                    await session.read_resource(AnyUrl(Path(directory.name).parent.joinpath("x").as_uri()))
+
+                await session.subscribe_resource(AnyUrl(uri))
+                path.write_text("바뀐 내용\n", encoding="utf-8")
+                self.assertEqual(await asyncio.wait_for(updated.get(), 10), uri)
+                self.assertTrue((await text(f"if_none_match={etag}")).startswith("etag="))
+
+
+if __name__ == "__main__":
+    unittest.main()
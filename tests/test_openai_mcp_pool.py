@@ -0,0 +1,129 @@
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "openai-agent-sdk"))
+
+from agents import Agent, Runner, set_tracing_disabled
+
+from openai_mcp_pool import ListDirectoryModel, MCPServerPool, local_params
+
+set_tracing_disabled(True)
+
+
+class MCPServerPoolTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        Path(self.root.name, "hello.txt").write_text("hi", encoding="utf-8")
+        self.params = local_params(self.root.name)
+
+    async def test_leases_reuse_the_started_server(self):
+        pool = MCPServerPool(self.params, min_size=1, max_size=2)
+        await pool.start()
+        try:
+            async with pool.lease() as first:
+                agent = Agent(name="MCPAgent", mcp_servers=[first], model=ListDirectoryModel())
+                result = await Runner.run(agent, "파일 목록")
+            async with pool.lease() as second:
+                pass
+            self.assertEqual(len(pool._owners), 1)
+        finally:
+            await pool.close()
+        self.assertIn("hello.txt", result.final_output)
+        self.assertIs(first, second)
+
+    async def test_unhealthy_server_is_replaced_and_waiters_are_woken(self):
+        pool = MCPServerPool(self.params, min_size=1, max_size=1)
+        await pool.start()
+        self.addAsyncCleanup(pool.close)
+        stale = pool._idle[0][0]
+        healthy = pool._healthy
+
+        async def first_check_fails(server):
+            if server is stale:
+                await asyncio.sleep(0.05)  # the second lease queues up while the pool is full
+                return False
+            return await healthy(server)
+
+        pool._healthy = first_check_fails
+        seen = []
+
+        async def use():
+            async with pool.lease() as server:
+                seen.append(server)
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(asyncio.gather(use(), use()), 30)
+        self.assertEqual(len(seen), 2)
+        self.assertNotIn(stale, seen)
+        self.assertNotIn(stale, pool._owners)
+        self.assertEqual(pool._size, 1)
+
+    async def test_failed_start_cleans_up_started_servers(self):
+        pool = MCPServerPool(self.params, min_size=2, max_size=2)
+        spawn = pool._spawn
+        calls = 0
+        owners = []
+
+        async def second_spawn_fails():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                server = await spawn()
+                owners.append(pool._owners[server][1])
+                return server
+            pool._size -= 1  # _spawn gives its slot back when it fails
+            raise RuntimeError("spawn failed")
+
+        pool._spawn = second_spawn_fails
+        with self.assertRaisesRegex(RuntimeError, "spawn failed"):
+            await pool.start()
+        self.assertEqual(pool._owners, {})
+        self.assertEqual(pool._size, 0)
+        self.assertEqual(len(pool._idle), 0)
+        self.assertTrue(owners[0].done())
+
+    async def test_cancelled_spawn_gives_the_slot_back(self):
+        pool = MCPServerPool(self.params, min_size=0, max_size=1)
+        self.addAsyncCleanup(pool.close)
+        with self.assertRaises(TimeoutError):
+            await asyncio.wait_for(pool._acquire(), 0.05)
+        self.assertEqual(pool._size, 0)
+        # The server that finishes starting after its caller is gone is shut down by its owner task
+        await asyncio.wait_for(asyncio.gather(*pool._tasks), 30)
+        async with pool.lease() as server:
+            self.assertIn(server, pool._owners)
+        self.assertEqual(pool._size, 1)
+
+    async def test_cancelled_health_check_returns_the_server(self):
+        pool = MCPServerPool(self.params, min_size=1, max_size=1)
+        await pool.start()
+        self.addAsyncCleanup(pool.close)
+        server = pool._idle[0][0]
+
+        async def hang(server):
+            await asyncio.sleep(30)
+
+        pool._healthy = hang
+        with self.assertRaises(TimeoutError):
+            await asyncio.wait_for(pool._acquire(), 0.05)
+        self.assertEqual([idle for idle, _ in pool._idle], [server])
+        self.assertEqual(pool._size, 1)
+
+    async def test_close_wakes_waiters(self):
+        pool = MCPServerPool(self.params, min_size=1, max_size=1)
+        await pool.start()
+        waiter = None
+        async with pool.lease():
+            waiter = asyncio.create_task(pool._acquire())
+            await asyncio.sleep(0.01)
+            await pool.close()
+        with self.assertRaisesRegex(RuntimeError, "닫혔"):
+            await asyncio.wait_for(waiter, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
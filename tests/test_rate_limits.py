@@ -0,0 +1,39 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# Appended rather than inserted: src/agents would otherwise shadow the Agents SDK for other test modules
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from rate_limits import AdaptiveRateLimiter, StubProvider, run_adaptive, run_fixed
+
+REQUESTS = 100
+
+
+def provider():
+    # The --simulate scenario on a shorter window: 20 requests per 0.25s instead of 50 per second
+    return StubProvider(requests_per_window=20, window=0.25, latency=0.02)
+
+
+class SimulateTest(unittest.TestCase):
+    def test_fixed_concurrency_hits_429s(self):
+        stub = provider()
+        results = asyncio.run(run_fixed(stub, REQUESTS))
+        self.assertEqual(len(results), REQUESTS)
+        self.assertGreater(stub.rejected, 0)
+        self.assertEqual(stub.calls, REQUESTS + stub.rejected)
+
+    def test_adaptive_limit_avoids_429s(self):
+        stub = provider()
+        limiter = AdaptiveRateLimiter(max_retries=100)
+        results = asyncio.run(run_adaptive(stub, REQUESTS, limiter))
+        self.assertEqual(len(results), REQUESTS)
+        self.assertEqual(stub.rejected, 0)
+        self.assertEqual(stub.calls, REQUESTS)
+        stats = limiter.stats()["stub/model"]
+        self.assertEqual((stats["successes"], stats["rate_limited"], stats["in_flight"]), (REQUESTS, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()